@@ -8,6 +8,7 @@ Constantes globales pour l'application
 # Modes d'application
 MODE_TRI = "tri"
 MODE_WORKSPACE = "workspace"
+MODE_GESTION = "gestion"
 
 # Types de fichiers
 FILE_TYPE_CPR = "cpr"
@@ -20,6 +21,39 @@ DEFAULT_PREFS_DIR = "~/.trie_morceaux"
 DEFAULT_PREFS_FILE = "preferences.json"
 DEFAULT_METADATA_FILE = "metadata.json"
 DEFAULT_NOTES_FILE = "notes.txt"
+DEFAULT_SCAN_INDEX_FILE = "scan_index.json"
+DEFAULT_DEDUP_CACHE_FILE = "dedup_cache.json"
+DEFAULT_VSTI_CACHE_FILE = "vsti_cache.json"
+DEFAULT_PLUGIN_CACHE_FILE = "plugin_discovery.json"
+DEFAULT_CPR_COMPARE_CACHE_FILE = "cpr_compare.json"
+
+# Dossiers de plugins VST3/VST2 explorés par défaut, par plateforme (sys.platform)
+DEFAULT_PLUGIN_FOLDERS = {
+    "win32": [
+        "C:/Program Files/Common Files/VST3",
+        "C:/Program Files/VSTPlugins",
+        "C:/Program Files/Steinberg/VSTPlugins",
+        "C:/Program Files/Common Files/Steinberg/VST2"
+    ],
+    "darwin": [
+        "/Library/Audio/Plug-Ins/VST3",
+        "/Library/Audio/Plug-Ins/VST",
+        "~/Library/Audio/Plug-Ins/VST3",
+        "~/Library/Audio/Plug-Ins/VST"
+    ],
+    "linux": [
+        "~/.vst3",
+        "/usr/lib/vst3",
+        "/usr/local/lib/vst3",
+        "~/.vst",
+        "/usr/lib/vst",
+        "/usr/local/lib/vst"
+    ]
+}
+
+# Sous-dossiers standards d'un projet Cubase (comparaison insensible à la casse) :
+# un dossier contenant un .cpr et au moins l'un d'eux est la racine d'un projet
+CUBASE_PROJECT_FOLDERS = ["Audio", "Auto Saves", "Edits", "Images", "Fades", "Freeze", "Presets"]
 
 # Configuration de l'interface
 UI_WINDOW_TITLE = "Tri Morceaux Cubase"
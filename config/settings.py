@@ -22,6 +22,13 @@ class Settings:
         self.cubase_path = ""
         self.last_workspace = ""
         self.last_mode = "workspace"  # Mode par défaut (workspace ou tri)
+        self.scan_workers_per_device = 1  # Racines scannées simultanément sur un même disque
+        self.detect_duplicates = False  # Recherche des fichiers en double après le scan (mode Tri)
+        # Règles de scan par racine ("*" : toutes les racines), voir services/scan_rules.py
+        # ex. {"*": {"exclude": [".git/", "Freeze/"], "max_depth": 6, "max_entries": 5000}}
+        self.scan_rules = {}
+        # Dossiers de plugins VST3/VST2 pour la découverte (vide : dossiers standards)
+        self.plugin_folders = []
         self.prefs_dir = Path(os.path.expanduser(DEFAULT_PREFS_DIR))
         self.prefs_file = self.prefs_dir / DEFAULT_PREFS_FILE
     
@@ -38,7 +45,11 @@ class Settings:
             'last_notes': self.last_notes,
             'cubase_path': self.cubase_path,
             'last_workspace': self.last_workspace,
-            'last_mode': self.last_mode
+            'last_mode': self.last_mode,
+            'scan_workers_per_device': self.scan_workers_per_device,
+            'detect_duplicates': self.detect_duplicates,
+            'scan_rules': self.scan_rules,
+            'plugin_folders': self.plugin_folders
         }
         
         # Sauvegarde dans le fichier JSON
@@ -62,6 +73,10 @@ class Settings:
             self.cubase_path = prefs.get('cubase_path', "")
             self.last_workspace = prefs.get('last_workspace', "")
             self.last_mode = prefs.get('last_mode', "workspace")
+            self.scan_workers_per_device = prefs.get('scan_workers_per_device', 1)
+            self.detect_duplicates = prefs.get('detect_duplicates', False)
+            self.scan_rules = prefs.get('scan_rules', {})
+            self.plugin_folders = prefs.get('plugin_folders', [])
         except Exception as e:
             print(f"Erreur lors du chargement des préférences: {e}")
     
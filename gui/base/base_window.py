@@ -95,6 +95,7 @@ class BaseWindow(QMainWindow):
         elif "GestionWindow" in current_mode:
             active_index = 2
         
+        self.mode_index = active_index
         self.mode_tabs.setCurrentIndex(active_index)
         
         # Connecter le changement d'onglet au changement de mode
@@ -217,54 +218,31 @@ class BaseWindow(QMainWindow):
             settings.last_mode = mode
             settings.save()
             
-            # Informer l'utilisateur du changement de mode
-            self.statusBar.showMessage(f"Basculement vers le mode {mode}...")
+            # Fenêtre du mode demandé : créée au premier basculement (module
+            # importé à la demande), puis réutilisée avec tout son état
+            from gui.window_factory import get_window
+            new_window = get_window(mode)
+            if new_window is self:
+                return
             
-            # Créer une nouvelle fenêtre du mode approprié
-            from gui.sort_mode.sort_window import SortWindow
-            from gui.workspace_mode.workspace_window import WorkspaceWindow
-            from gui.gestion_mode.gestion_window import GestionWindow
-            
-            print(f"Classes importées avec succès")
-            
-            # Obtenir la position et la taille actuelles de la fenêtre
-            pos = self.pos()
-            size = self.size()
-            
-            # Créer la nouvelle fenêtre selon le mode
-            print(f"Création de la nouvelle fenêtre pour le mode {mode}")
-            
-            # Créer une instance de la nouvelle fenêtre sans la fermer immédiatement
-            if mode == "tri":
-                new_window = SortWindow()
-                print("SortWindow créée avec succès")
-            elif mode == "workspace":
-                new_window = WorkspaceWindow()
-                print("WorkspaceWindow créée avec succès")
-            elif mode == "gestion":
-                new_window = GestionWindow()
-                print("GestionWindow créée avec succès")
+            print(f"{new_window.__class__.__name__} prête")
             
             # Conserver une référence globale à la nouvelle fenêtre
             import main
             main.active_window = new_window
-            print("Référence globale mise à jour")
-            
-            # Appliquer la position et la taille
-            new_window.move(pos)
-            new_window.resize(size)
             
-            # Afficher la nouvelle fenêtre
-            print("Affichage de la nouvelle fenêtre")
+            # Reprendre la position et la taille de la fenêtre actuelle
+            new_window.move(self.pos())
+            new_window.resize(self.size())
+            new_window.on_mode_activated()
             new_window.show()
+            new_window.raise_()
+            new_window.activateWindow()
             
-            # Attendre un peu avant de fermer l'ancienne fenêtre
-            import time
-            time.sleep(0.5)  # Attendre 500ms
-            
-            # Fermer la fenêtre actuelle
-            print("Fermeture de l'ancienne fenêtre")
-            self.close()
+            # Masquer la fenêtre actuelle sans la fermer : son état est conservé
+            # pour le prochain retour dans ce mode
+            self.hide()
+            self.reset_mode_tab()
             
             print("Basculement terminé avec succès")
         except Exception as e:
@@ -273,6 +251,22 @@ class BaseWindow(QMainWindow):
             print(traceback.format_exc())
             self.show_error("Erreur", f"Impossible de basculer vers le mode {mode}:\n{str(e)}")
     
+    def reset_mode_tab(self):
+        """Remise de l'onglet de mode sur celui de la fenêtre, sans basculer"""
+        self.mode_tabs.blockSignals(True)
+        self.mode_tabs.setCurrentIndex(self.mode_index)
+        self.mode_tabs.blockSignals(False)
+    
+    def on_mode_activated(self):
+        """Mise à jour d'une fenêtre réaffichée après un changement de mode"""
+        self.reset_mode_tab()
+        self.statusBar.clearMessage()
+        
+        # Le thème a pu changer pendant que la fenêtre était masquée
+        self.theme_button.setChecked(settings.dark_mode)
+        self.update_theme_button_icon()
+        self.update_toolbar_icons()
+    
     def show_error(self, title, message):
         """Afficher un message d'erreur"""
         QMessageBox.critical(self, title, message)
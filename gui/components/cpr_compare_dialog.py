@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dialogue de comparaison des versions d'un projet (fichiers .cpr et .bak)
+"""
+
+from pathlib import Path
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QProgressBar, QTableWidget, QTableWidgetItem, QTextEdit, QSplitter, QHeaderView
+)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from services.cancel_token import CancelToken
+from services.cpr_compare import compare_files
+
+# Couleurs des cellules qui diffèrent de la version précédente
+ADDED_COLOR = QColor(200, 240, 200)
+REMOVED_COLOR = QColor(245, 200, 200)
+CHANGED_COLOR = QColor(250, 235, 180)
+
+# Sections du tableau : (titre, clé du résultat, formatage d'une valeur)
+SECTIONS = [
+    ("Plugins", 'plugins', str),
+    ("Pistes", 'tracks', str),
+    ("Blocs (Ko)", 'chunks', lambda size: f"{size / 1024:.1f}")
+]
+
+
+class CompareThread(QThread):
+    """Thread d'extraction et de comparaison des versions"""
+    compare_progress = pyqtSignal(int)
+    compare_complete = pyqtSignal(object)
+
+    def __init__(self, paths):
+        """
+        Initialisation du thread
+
+        Args:
+            paths (list): Fichiers .cpr/.bak à comparer
+        """
+        super().__init__()
+        self.paths = list(paths)
+        self.cancel_token = CancelToken()
+
+    def run(self):
+        """Exécution du thread"""
+        result = compare_files(
+            self.paths,
+            progress_callback=self.compare_progress.emit,
+            cancel_token=self.cancel_token
+        )
+        self.compare_complete.emit(result)
+
+    def stop(self):
+        """Arrêt de la comparaison"""
+        self.cancel_token.cancel()
+
+
+class CprCompareDialog(QDialog):
+    """
+    Comparaison de plusieurs versions d'un projet : une colonne par version,
+    de la plus ancienne à la plus récente, et une ligne par plugin, classe de
+    piste et bloc du fichier
+    """
+
+    def __init__(self, paths, parent=None):
+        """
+        Initialisation du dialogue
+
+        Args:
+            paths (list): Fichiers .cpr/.bak à comparer
+            parent (QWidget): Widget parent
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Comparaison des versions")
+        self.resize(900, 600)
+        self.paths = list(paths)
+        self.result = None
+        self.thread = None
+
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.chk_differences = QCheckBox("Afficher uniquement les différences")
+        self.chk_differences.setChecked(True)
+        self.chk_differences.stateChanged.connect(self.refresh_table)
+        top_layout.addWidget(self.chk_differences, 1)
+        self.btn_cancel = QPushButton("Annuler")
+        self.btn_cancel.clicked.connect(self.stop_compare)
+        top_layout.addWidget(self.btn_cancel)
+        layout.addLayout(top_layout)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        layout.addWidget(self.progress)
+
+        # Tableau des versions (en haut) et résumé des changements (en bas)
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        splitter.addWidget(self.table)
+        self.summary = QTextEdit()
+        self.summary.setReadOnly(True)
+        splitter.addWidget(self.summary)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter, 1)
+
+        bottom_layout = QHBoxLayout()
+        self.status_label = QLabel(f"Lecture de {len(self.paths)} versions...")
+        bottom_layout.addWidget(self.status_label, 1)
+        btn_close = QPushButton("Fermer")
+        btn_close.clicked.connect(self.close)
+        bottom_layout.addWidget(btn_close)
+        layout.addLayout(bottom_layout)
+
+        self.start_compare()
+
+    def start_compare(self):
+        """Lancement de la lecture des versions"""
+        self.thread = CompareThread(self.paths)
+        self.thread.compare_progress.connect(self.progress.setValue)
+        self.thread.compare_complete.connect(self.on_compare_complete)
+        self.thread.start()
+
+    def stop_compare(self):
+        """Annulation de la lecture en cours"""
+        if self.thread is not None and self.thread.isRunning():
+            self.status_label.setText("Annulation...")
+            self.thread.stop()
+
+    def on_compare_complete(self, result):
+        """Réception du résultat de la comparaison"""
+        self.thread = None
+        self.result = result
+        self.btn_cancel.setEnabled(False)
+        self.progress.setVisible(False)
+
+        status = f"{len(result['versions'])} versions comparées"
+        if len(result['versions']) < len(self.paths):
+            status += f" sur {len(self.paths)}"
+        if result['errors']:
+            status += f", {len(result['errors'])} erreurs"
+        self.status_label.setText(status)
+        self.refresh_table()
+        self.refresh_summary()
+
+    def _version_label(self, version):
+        """En-tête de colonne d'une version : nom, date et taille"""
+        return (f"{Path(version['path']).name}\n{version['modified'].strftime('%d/%m/%Y %H:%M')}\n"
+                f"{version['size'] / (1024 * 1024):.2f} MB")
+
+    def refresh_table(self):
+        """Affichage des sections, avec ou sans les lignes identiques"""
+        self.table.clear()
+        if self.result is None:
+            return
+        versions = self.result['versions']
+        only_differences = self.chk_differences.isChecked()
+
+        rows = []
+        for title, key, formatter in SECTIONS:
+            section_rows = [(name, values) for name, values in self.result[key].items()
+                            if not only_differences or len(set(values)) > 1]
+            if section_rows:
+                rows.append((title, None, None))
+                rows.extend((name, values, formatter) for name, values in section_rows)
+
+        self.table.setColumnCount(len(versions) + 1)
+        self.table.setHorizontalHeaderLabels([""] + [self._version_label(version) for version in versions])
+        self.table.setRowCount(len(rows))
+        for row, (name, values, formatter) in enumerate(rows):
+            name_item = QTableWidgetItem(name)
+            if values is None:
+                # Titre de section
+                font = name_item.font()
+                font.setBold(True)
+                name_item.setFont(font)
+                self.table.setItem(row, 0, name_item)
+                continue
+            self.table.setItem(row, 0, name_item)
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(formatter(value) if value else "")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if column > 0 and value != values[column - 1]:
+                    if not values[column - 1]:
+                        item.setBackground(ADDED_COLOR)
+                    elif not value:
+                        item.setBackground(REMOVED_COLOR)
+                    else:
+                        item.setBackground(CHANGED_COLOR)
+                self.table.setItem(row, column + 1, item)
+
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(versions) + 1):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+
+    def refresh_summary(self):
+        """Résumé des plugins ajoutés, retirés ou modifiés d'une version à l'autre"""
+        versions = self.result['versions']
+        lines = []
+        for change in self.result['changes']:
+            before = Path(versions[change['from']]['path']).name
+            after = Path(versions[change['to']]['path']).name
+            lines.append(f"{before} → {after}")
+            if change['added']:
+                lines.append(f"  Ajoutés : {', '.join(change['added'])}")
+            if change['removed']:
+                lines.append(f"  Retirés : {', '.join(change['removed'])}")
+            for plugin, count_before, count_after in change['changed']:
+                lines.append(f"  {plugin} : {count_before} → {count_after} instances")
+            if not (change['added'] or change['removed'] or change['changed']):
+                lines.append("  Aucun changement de plugins")
+        for path, message in self.result['errors'].items():
+            lines.append(f"Erreur de lecture de {Path(path).name} : {message}")
+        self.summary.setPlainText("\n".join(lines))
+
+    def _wait_for_thread(self):
+        """Annulation et attente de la lecture en cours"""
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.stop()
+            self.thread.wait()
+
+    def reject(self):
+        """Fermeture par Échap : la lecture en cours est annulée"""
+        self._wait_for_thread()
+        super().reject()
+
+    def closeEvent(self, event):
+        """Arrêt de la lecture à la fermeture du dialogue"""
+        self._wait_for_thread()
+        event.accept()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Surveillance des dossiers d'un workspace pour la mise à jour des projets sans rescan
+"""
+
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# Délai de regroupement des événements (une copie génère une rafale de notifications)
+DEBOUNCE_MS = 500
+
+# Intervalle de scrutation des dossiers que le système ne sait pas surveiller
+POLL_INTERVAL_MS = 5000
+
+
+class DirectoryWatcher(QObject):
+    """
+    Surveillance d'un ensemble de dossiers
+
+    Les notifications du système (inotify, FSEvents, ReadDirectoryChangesW via
+    QFileSystemWatcher) sont regroupées puis transmises en un seul signal. Les
+    dossiers refusés par le système (limite de surveillances atteinte, certains
+    partages réseau) sont scrutés périodiquement en comparant leur date de
+    modification.
+    """
+
+    # Liste des dossiers modifiés depuis la dernière notification
+    directories_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        """
+        Initialisation de la surveillance
+
+        Args:
+            parent (QObject): Objet parent
+        """
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._pending = set()
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._flush)
+
+        # Dossiers scrutés : chemin -> date de modification (ns) connue
+        self._polled = {}
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def watch(self, directories):
+        """
+        Définition de l'ensemble des dossiers surveillés
+
+        Les dossiers qui ne sont plus dans la liste cessent d'être surveillés.
+
+        Args:
+            directories (list): Chemins des dossiers à surveiller
+        """
+        wanted = set(directories)
+
+        watched = set(self._watcher.directories())
+        obsolete = watched - wanted
+        if obsolete:
+            self._watcher.removePaths(list(obsolete))
+        for path in list(self._polled):
+            if path not in wanted:
+                del self._polled[path]
+
+        new_paths = [path for path in wanted - watched if path not in self._polled]
+        failed = self._watcher.addPaths(new_paths) if new_paths else []
+        for path in failed:
+            self._polled[path] = self._mtime(path)
+
+        if self._polled and not self._poll_timer.isActive():
+            self._poll_timer.start()
+        elif not self._polled:
+            self._poll_timer.stop()
+
+    def stop(self):
+        """Arrêt de la surveillance"""
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        self._pending.clear()
+        self._polled.clear()
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+
+    def _on_directory_changed(self, path):
+        """Notification du système pour un dossier"""
+        self._pending.add(path)
+        self._debounce_timer.start()
+
+    def _poll(self):
+        """Comparaison des dates de modification des dossiers scrutés"""
+        for path, mtime_ns in list(self._polled.items()):
+            current = self._mtime(path)
+            if current != mtime_ns:
+                self._polled[path] = current
+                self._pending.add(path)
+        if self._pending and not self._debounce_timer.isActive():
+            self._flush()
+
+    def _flush(self):
+        """Transmission des dossiers modifiés"""
+        if not self._pending:
+            return
+        directories = sorted(self._pending)
+        self._pending.clear()
+        self.directories_changed.emit(directories)
+
+    @staticmethod
+    def _mtime(path):
+        """Date de modification d'un dossier (None s'il a disparu)"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
@@ -56,6 +56,24 @@ class ProjectTable(QTableView):
         """
         self.project_model.update_data(projects, view_mode)
     
+    def upsert_projects(self, projects):
+        """
+        Ajout ou mise à jour incrémentale de projets (affichage au fil du scan)
+        
+        Args:
+            projects (list): Lignes de synthèse des projets
+        """
+        self.project_model.upsert_projects(projects)
+    
+    def remove_projects(self, project_names):
+        """
+        Suppression de projets de la table
+        
+        Args:
+            project_names (iterable): Noms des projets à retirer
+        """
+        self.project_model.remove_projects(project_names)
+    
     def set_filter(self, text):
         """
         Définition du filtre de recherche
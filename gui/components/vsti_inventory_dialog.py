@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dialogue d'inventaire des VSTi d'un workspace (plugin -> projets)
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QProgressBar, QTableWidget, QTableWidgetItem, QListWidget, QSplitter,
+    QFileDialog, QMessageBox, QHeaderView
+)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from services.cancel_token import CancelToken
+from services.vsti_inventory import VstiInventory
+
+
+class InventoryThread(QThread):
+    """Thread de construction de l'inventaire (les analyses tournent sur un pool de processus)"""
+    inventory_progress = pyqtSignal(int)
+    inventory_complete = pyqtSignal(object)
+
+    def __init__(self, projects):
+        """
+        Initialisation du thread
+
+        Args:
+            projects (list): Lignes de synthèse des projets à analyser
+        """
+        super().__init__()
+        self.projects = list(projects)
+        self.cancel_token = CancelToken()
+
+    def run(self):
+        """Exécution du thread"""
+        inventory = VstiInventory()
+        inventory.build(
+            self.projects,
+            progress_callback=self.inventory_progress.emit,
+            cancel_token=self.cancel_token
+        )
+        self.inventory_complete.emit(inventory)
+
+    def stop(self):
+        """Arrêt de l'inventaire"""
+        self.cancel_token.cancel()
+
+
+class VstiInventoryDialog(QDialog):
+    """
+    Inventaire des VSTi : liste des plugins utilisés, projets de chaque plugin
+    et export CSV/JSON
+    """
+
+    # Inventaire terminé (ou interrompu), pour être conservé par la fenêtre
+    inventory_ready = pyqtSignal(object)
+
+    def __init__(self, projects, inventory=None, parent=None):
+        """
+        Initialisation du dialogue
+
+        Args:
+            projects (list): Lignes de synthèse des projets du workspace
+            inventory (VstiInventory): Inventaire déjà construit (facultatif)
+            parent (QWidget): Widget parent
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Inventaire des VSTi")
+        self.resize(800, 500)
+        self.projects = projects
+        self.inventory = inventory
+        self.thread = None
+
+        layout = QVBoxLayout(self)
+
+        # Recherche et actions
+        top_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Rechercher un plugin...")
+        self.search_edit.textChanged.connect(self.refresh_plugins)
+        top_layout.addWidget(self.search_edit, 1)
+        self.btn_run = QPushButton("Analyser le workspace")
+        self.btn_run.clicked.connect(self.start_inventory)
+        top_layout.addWidget(self.btn_run)
+        self.btn_cancel = QPushButton("Annuler")
+        self.btn_cancel.clicked.connect(self.stop_inventory)
+        self.btn_cancel.setEnabled(False)
+        top_layout.addWidget(self.btn_cancel)
+        layout.addLayout(top_layout)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setVisible(False)
+        layout.addWidget(self.progress)
+
+        # Plugins (à gauche) et projets du plugin sélectionné (à droite)
+        splitter = QSplitter(Qt.Horizontal)
+        self.plugin_table = QTableWidget()
+        self.plugin_table.setColumnCount(2)
+        self.plugin_table.setHorizontalHeaderLabels(["Plugin", "Projets"])
+        self.plugin_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.plugin_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.plugin_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.plugin_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.plugin_table.itemSelectionChanged.connect(self.on_plugin_selected)
+        splitter.addWidget(self.plugin_table)
+        self.project_list = QListWidget()
+        splitter.addWidget(self.project_list)
+        splitter.setStretchFactor(0, 2)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter, 1)
+
+        # Statut et export
+        bottom_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom_layout.addWidget(self.status_label, 1)
+        self.btn_export_csv = QPushButton("Exporter CSV")
+        self.btn_export_csv.clicked.connect(lambda: self.export_inventory('csv'))
+        bottom_layout.addWidget(self.btn_export_csv)
+        self.btn_export_json = QPushButton("Exporter JSON")
+        self.btn_export_json.clicked.connect(lambda: self.export_inventory('json'))
+        bottom_layout.addWidget(self.btn_export_json)
+        btn_close = QPushButton("Fermer")
+        btn_close.clicked.connect(self.close)
+        bottom_layout.addWidget(btn_close)
+        layout.addLayout(bottom_layout)
+
+        if self.inventory is not None:
+            self.refresh_plugins()
+        else:
+            self.start_inventory()
+
+    def start_inventory(self):
+        """Lancement de l'analyse de tous les projets"""
+        if self.thread is not None and self.thread.isRunning():
+            return
+        self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress.setValue(0)
+        self.progress.setVisible(True)
+        self.status_label.setText(f"Analyse de {len(self.projects)} projets...")
+
+        self.thread = InventoryThread(self.projects)
+        self.thread.inventory_progress.connect(self.progress.setValue)
+        self.thread.inventory_complete.connect(self.on_inventory_complete)
+        self.thread.start()
+
+    def stop_inventory(self):
+        """Annulation de l'analyse en cours"""
+        if self.thread is not None and self.thread.isRunning():
+            self.status_label.setText("Annulation...")
+            self.thread.stop()
+
+    def on_inventory_complete(self, inventory):
+        """Réception de l'inventaire construit"""
+        self.thread = None
+        self.inventory = inventory
+        self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        self.progress.setVisible(False)
+        self.refresh_plugins()
+        self.inventory_ready.emit(inventory)
+
+    def refresh_plugins(self):
+        """Affichage des plugins correspondant à la recherche"""
+        self.plugin_table.setSortingEnabled(False)
+        self.plugin_table.setRowCount(0)
+        self.project_list.clear()
+        if self.inventory is None:
+            return
+
+        plugins = self.inventory.search(self.search_edit.text())
+        self.plugin_table.setRowCount(len(plugins))
+        for row, plugin in enumerate(plugins):
+            self.plugin_table.setItem(row, 0, QTableWidgetItem(plugin))
+            count_item = QTableWidgetItem()
+            count_item.setData(Qt.DisplayRole, len(self.inventory.plugins[plugin]))
+            self.plugin_table.setItem(row, 1, count_item)
+        self.plugin_table.setSortingEnabled(True)
+
+        status = (f"{len(self.inventory.plugins)} plugins dans {len(self.inventory.projects)} projets")
+        if not self.inventory.complete:
+            status += " (inventaire interrompu)"
+        if self.inventory.errors:
+            status += f", {len(self.inventory.errors)} erreurs"
+        self.status_label.setText(status)
+
+    def on_plugin_selected(self):
+        """Affichage des projets qui utilisent le plugin sélectionné"""
+        self.project_list.clear()
+        rows = self.plugin_table.selectionModel().selectedRows()
+        if not rows or self.inventory is None:
+            return
+        plugin = self.plugin_table.item(rows[0].row(), 0).text()
+        self.project_list.addItems(self.inventory.projects_using(plugin))
+
+    def export_inventory(self, export_format):
+        """
+        Export de l'inventaire
+
+        Args:
+            export_format (str): 'csv' ou 'json'
+        """
+        if self.inventory is None:
+            return
+        file_filter = "CSV (*.csv)" if export_format == 'csv' else "JSON (*.json)"
+        path, _ = QFileDialog.getSaveFileName(self, "Exporter l'inventaire", f"inventaire_vsti.{export_format}", file_filter)
+        if not path:
+            return
+        try:
+            if export_format == 'csv':
+                self.inventory.export_csv(path)
+            else:
+                self.inventory.export_json(path)
+            self.status_label.setText(f"Inventaire exporté vers {path}")
+        except OSError as e:
+            QMessageBox.warning(self, "Erreur", f"Impossible d'exporter l'inventaire :\n{e}")
+
+    def _wait_for_thread(self):
+        """Annulation et attente de l'analyse en cours"""
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.stop()
+            self.thread.wait()
+
+    def reject(self):
+        """Fermeture par Échap : l'analyse en cours est annulée"""
+        self._wait_for_thread()
+        super().reject()
+
+    def closeEvent(self, event):
+        """Arrêt de l'analyse à la fermeture du dialogue"""
+        self._wait_for_thread()
+        event.accept()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Panneau des statistiques d'utilisation des plugins du workspace
+"""
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QCompleter
+)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from services.vsti_stats import VstiStats, PERIOD_YEAR, PERIOD_MONTH
+
+# Requêtes proposées : (libellé, méthode d'affichage, saisie d'un plugin)
+QUERIES = [
+    ("Plugins les moins utilisés", 'show_least_used', False),
+    ("Plugins les plus utilisés", 'show_most_used', False),
+    ("Projets utilisant un plugin", 'show_projects_using', True),
+    ("Utilisation par éditeur et par année", 'show_editor_usage_year', False),
+    ("Utilisation par éditeur et par mois", 'show_editor_usage_month', False),
+    ("Projets impactés par la suppression de plugins", 'show_broken_by_plugins', True),
+    ("Projets impactés par la suppression d'un éditeur", 'show_broken_by_editor', True)
+]
+
+
+class StatsThread(QThread):
+    """Thread de construction des statistiques (chaque CPR est relu par os.stat pour valider le cache)"""
+    stats_complete = pyqtSignal(object, int)
+
+    def __init__(self, projects):
+        """
+        Initialisation du thread
+
+        Args:
+            projects (list): Lignes de synthèse des projets
+        """
+        super().__init__()
+        self.projects = list(projects)
+
+    def run(self):
+        """Exécution du thread"""
+        stats = VstiStats()
+        analysed = stats.build(self.projects)
+        self.stats_complete.emit(stats, analysed)
+
+
+class VstiStatsPanel(QWidget):
+    """
+    Statistiques d'utilisation des plugins, calculées à partir des analyses
+    VSTi en cache (voir services/vsti_stats.py)
+
+    Les statistiques sont reconstruites à l'affichage du panneau lorsque les
+    projets ont changé, ou par le bouton Actualiser, dans un thread : la
+    validation du cache relit l'état de chaque CPR.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialisation du panneau
+
+        Args:
+            parent (QWidget): Widget parent
+        """
+        super().__init__(parent)
+        self.stats = VstiStats()
+        self.projects = []
+        self._stale = False
+        self.stats_thread = None
+        # Projets modifiés pendant une reconstruction : nouvelle reconstruction à la fin
+        self._rebuild_pending = False
+
+        layout = QVBoxLayout(self)
+
+        query_layout = QHBoxLayout()
+        self.cmb_query = QComboBox()
+        for label, _, _ in QUERIES:
+            self.cmb_query.addItem(label)
+        self.cmb_query.currentIndexChanged.connect(self.on_query_changed)
+        query_layout.addWidget(self.cmb_query, 1)
+        self.txt_plugin = QLineEdit()
+        self.txt_plugin.setPlaceholderText("Plugin (plusieurs : séparés par des virgules)")
+        self.txt_plugin.returnPressed.connect(self.run_query)
+        self.completer = QCompleter([], self)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setFilterMode(Qt.MatchContains)
+        self.txt_plugin.setCompleter(self.completer)
+        query_layout.addWidget(self.txt_plugin, 1)
+        self.btn_refresh = QPushButton("Actualiser")
+        self.btn_refresh.setToolTip("Recalculer les statistiques à partir des analyses VSTi en cache")
+        self.btn_refresh.clicked.connect(self.rebuild)
+        query_layout.addWidget(self.btn_refresh)
+        layout.addLayout(query_layout)
+
+        self.result_table = QTableWidget()
+        self.result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QTableWidget.SelectRows)
+        layout.addWidget(self.result_table, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.on_query_changed()
+
+    def set_projects(self, projects):
+        """
+        Projets du workspace (statistiques recalculées au prochain affichage)
+
+        Args:
+            projects (list): Lignes de synthèse des projets (CubaseScanner.df_projects)
+        """
+        self.projects = projects
+        self._stale = True
+        if self.isVisible():
+            self.rebuild()
+
+    def showEvent(self, event):
+        """Reconstruction différée jusqu'au premier affichage"""
+        super().showEvent(event)
+        if self._stale:
+            self.rebuild()
+
+    def rebuild(self):
+        """Reconstruction des index à partir des analyses en cache"""
+        self._stale = False
+        if self.stats_thread is not None:
+            self._rebuild_pending = True
+            return
+        self.btn_refresh.setEnabled(False)
+        self.status_label.setText("Calcul des statistiques...")
+        self.stats_thread = StatsThread(self.projects)
+        self.stats_thread.stats_complete.connect(self.on_stats_complete)
+        self.stats_thread.start()
+
+    def on_stats_complete(self, stats, analysed):
+        """
+        Réception des statistiques reconstruites
+
+        Args:
+            stats (VstiStats): Statistiques
+            analysed (int): Nombre de projets indexés
+        """
+        self.stats_thread.wait()
+        self.stats_thread = None
+        self.btn_refresh.setEnabled(True)
+        if self._rebuild_pending:
+            self._rebuild_pending = False
+            self.rebuild()
+            return
+        self.stats = stats
+        status = f"{len(self.stats.plugins())} plugins dans {analysed} projets analysés"
+        if self.stats.unanalysed:
+            status += (f" ; {len(self.stats.unanalysed)} projets sans analyse VSTi "
+                       f"(lancer l'inventaire du workspace pour les inclure)")
+        self.status_label.setText(status)
+        self.on_query_changed()
+
+    def on_query_changed(self):
+        """Activation de la saisie selon la requête choisie"""
+        _, _, needs_plugin = QUERIES[self.cmb_query.currentIndex()]
+        self.txt_plugin.setEnabled(needs_plugin)
+        if self.cmb_query.currentIndex() == len(QUERIES) - 1:
+            self.completer.model().setStringList(self.stats.editors())
+            self.txt_plugin.setPlaceholderText("Éditeur")
+        else:
+            self.completer.model().setStringList(self.stats.plugins())
+            self.txt_plugin.setPlaceholderText("Plugin (plusieurs : séparés par des virgules)")
+        self.run_query()
+
+    def run_query(self):
+        """Exécution de la requête choisie"""
+        _, method, _ = QUERIES[self.cmb_query.currentIndex()]
+        getattr(self, method)()
+
+    def _fill(self, headers, rows):
+        """Affichage de lignes de résultat (les nombres sont triés comme des nombres)"""
+        self.result_table.setSortingEnabled(False)
+        self.result_table.clear()
+        self.result_table.setColumnCount(len(headers))
+        self.result_table.setHorizontalHeaderLabels(headers)
+        self.result_table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                self.result_table.setItem(row, column, item)
+        self.result_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.result_table.setSortingEnabled(True)
+
+    def _plugin_names(self):
+        """Plugins saisis (séparés par des virgules)"""
+        return [name.strip() for name in self.txt_plugin.text().split(',') if name.strip()]
+
+    def show_least_used(self):
+        self._fill(["Plugin", "Éditeur", "Projets"],
+                   [(plugin, self.stats.plugin_editors.get(plugin, ''), count)
+                    for plugin, count in self.stats.least_used(limit=None)])
+
+    def show_most_used(self):
+        self._fill(["Plugin", "Éditeur", "Projets"],
+                   [(plugin, self.stats.plugin_editors.get(plugin, ''), count)
+                    for plugin, count in self.stats.most_used(limit=None)])
+
+    def show_projects_using(self):
+        rows = []
+        for plugin in self._plugin_names():
+            for project_name in self.stats.projects_using(plugin):
+                key = self.stats.resolve_plugin(plugin)
+                rows.append((project_name, key, self.stats.projects[project_name]['plugins'][key]))
+        self._fill(["Projet", "Plugin", "Instances"], rows)
+
+    def _show_editor_usage(self, period):
+        periods = self.stats.periods(period)
+        usage = self.stats.usage_by_editor(period)
+        self._fill(["Éditeur"] + periods + ["Total"],
+                   [[editor] + [counter.get(key, 0) for key in periods] + [sum(counter.values())]
+                    for editor, counter in usage.items()])
+
+    def show_editor_usage_year(self):
+        self._show_editor_usage(PERIOD_YEAR)
+
+    def show_editor_usage_month(self):
+        self._show_editor_usage(PERIOD_MONTH)
+
+    def _show_broken(self, broken):
+        self._fill(["Projet", "Plugins manquants", "Instances"],
+                   [(project_name, ', '.join(plugin for plugin, _ in missing), sum(count for _, count in missing))
+                    for project_name, missing in broken.items()])
+
+    def show_broken_by_plugins(self):
+        self._show_broken(self.stats.projects_broken_by(self._plugin_names()))
+
+    def show_broken_by_editor(self):
+        editor = self.txt_plugin.text().strip()
+        self._show_broken(self.stats.projects_broken_by(editor=editor) if editor else {})
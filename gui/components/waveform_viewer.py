@@ -1,8 +1,6 @@
-import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QColor, QPen, QLinearGradient, QBrush
-from scipy.io import wavfile
 
 class ModernWaveformPlayer(QWidget):
     def __init__(self, parent=None):
@@ -62,6 +60,9 @@ class ModernWaveformPlayer(QWidget):
 
     def load_file(self, file_path):
         """Charge un fichier audio et prépare la visualisation"""
+        # numpy et scipy ne sont chargés qu'à la première forme d'onde affichée
+        import numpy as np
+        from scipy.io import wavfile
         try:
             # Charger les données audio
             sample_rate, data = wavfile.read(file_path)
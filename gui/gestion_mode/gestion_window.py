@@ -13,8 +13,6 @@ import glob
 import platform
 from pathlib import Path
 
-from lxml import etree as lxml_etree
-
 from gui.base.base_window import BaseWindow
 
 
@@ -167,6 +165,8 @@ class GestionWindow(BaseWindow):
     
     def load_xml_file(self, file_path):
         """Charge un fichier XML de raccourcis Cubase"""
+        # lxml n'est chargé qu'à l'ouverture du premier fichier de raccourcis
+        from lxml import etree as lxml_etree
         try:
             # Utiliser lxml qui est plus tolérant aux erreurs
             parser = lxml_etree.XMLParser(recover=True)
@@ -253,6 +253,7 @@ class GestionWindow(BaseWindow):
     
     def export_to_cubase(self):
         """Exporte le fichier de raccourcis vers les dossiers de Cubase"""
+        from lxml import etree as lxml_etree
         if not self.current_file or not self.xml_tree:
             QMessageBox.warning(self, "Erreur", "Aucun fichier n'est actuellement ouvert.")
             return
@@ -665,6 +666,7 @@ class GestionWindow(BaseWindow):
 
     def add_macro_to_xml(self, macro_name, commands):
         """Ajoute une nouvelle macro dans le fichier XML"""
+        from lxml import etree as lxml_etree
         try:
             # 1. Ajouter la macro à la liste des macros dans la catégorie Macro
             # Chercher la catégorie Macro
@@ -778,6 +780,7 @@ class GestionWindow(BaseWindow):
     
     def update_macro_in_xml(self, macro_name, commands):
         """Met à jour une macro dans le fichier XML"""
+        from lxml import etree as lxml_etree
         try:
             # Chercher la définition de la macro dans la liste des macros
             preset_elem = self.xml_root.xpath("./member[@name='Preset']")[0]
@@ -824,6 +827,7 @@ class GestionWindow(BaseWindow):
 
     def save_file(self):
         """Sauvegarde les modifications dans le fichier XML à la mode bucheron"""
+        from lxml import etree as lxml_etree
         if self.current_file and self.xml_tree is not None:
             try:
                 # Proposer d'enregistrer sous un nouveau nom
@@ -866,6 +870,7 @@ class GestionWindow(BaseWindow):
 
     def update_shortcut_in_xml(self, command_name, old_shortcut, new_shortcut):
         """Met à jour un raccourci dans le fichier XML"""
+        from lxml import etree as lxml_etree
         try:
             # Vérifier d'abord si le nouveau raccourci existe déjà dans tout le fichier XML
             shortcut_exists, category, cmd = self.is_shortcut_already_used(new_shortcut, exclude_command=command_name)
@@ -1001,6 +1006,7 @@ class GestionWindow(BaseWindow):
 
     def add_shortcut_to_xml(self, command_name, new_shortcut):
         """Ajoute un raccourci dans le fichier XML"""
+        from lxml import etree as lxml_etree
         try:
             # Vérifier d'abord si le raccourci existe déjà dans tout le fichier XML
             shortcut_exists, category, cmd = self.is_shortcut_already_used(new_shortcut, exclude_command=command_name)
@@ -25,8 +25,14 @@ from gui.components.audio_player import AudioPlayer
 from gui.components.file_tree import FileTree
 from gui.components.metadata_editor import MetadataEditor
 from gui.components.project_table import ProjectTable
+from gui.components.cpr_compare_dialog import CprCompareDialog
 
 from services.scanner import CubaseScanner
+from services.scan_index import scan_index
+from services.scan_rules import rules_from_settings
+from services.cancel_token import CancelToken
+from services.cpr_compare import project_version_paths
+from services.dedup_service import dedup_service
 from services.metadata_service import MetadataService
 from services.file_service import FileService
 from services.audio_service import AudioService
@@ -38,6 +44,7 @@ from config.settings import settings
 class ScanThread(QThread):
     """Thread pour le scan des dossiers"""
     scan_progress = pyqtSignal(int)
+    scan_batch = pyqtSignal(list)
     scan_complete = pyqtSignal(dict)
     
     def __init__(self, directories):
@@ -49,30 +56,60 @@ class ScanThread(QThread):
         """
         super().__init__()
         self.directories = directories
-        self.scanner = CubaseScanner()
+        self.scanner = CubaseScanner(index=scan_index, rules=rules_from_settings(settings.scan_rules))
+        self.cancel_token = CancelToken()
         self.running = True
     
     def run(self):
         """Exécution du thread"""
         print(f"Démarrage du scan de {len(self.directories)} dossiers")
-        total_dirs = len(self.directories)
-        for i, directory in enumerate(self.directories):
-            if not self.running:
-                break
-            print(f"Scan du dossier: {directory}")
-            self.scanner.scan_directory(directory)
-            self.scan_progress.emit(int((i + 1) / total_dirs * 100))
+        # Les racines situées sur des disques différents sont scannées en parallèle
+        self.scanner.scan_multiple_directories(
+            self.directories,
+            progress_callback=self.scan_progress.emit,
+            workers_per_device=settings.scan_workers_per_device,
+            projects_callback=self.scan_batch.emit,
+            cancel_token=self.cancel_token
+        )
         
         if self.running:
-            # Préparer les données pour le modèle
-            self.scanner._create_dataframe()
-            
             print(f"Scan terminé, {len(self.scanner.projects)} projets trouvés")
             self.scan_complete.emit(self.scanner.projects)
     
     def stop(self):
-        """Arrêt du thread"""
+        """Arrêt du thread : le scan en cours s'interrompt à la prochaine entrée de dossier"""
         self.running = False
+        self.cancel_token.cancel()
+
+class DedupThread(QThread):
+    """Thread pour la recherche des fichiers en double"""
+    dedup_progress = pyqtSignal(int)
+    dedup_complete = pyqtSignal(dict)
+    
+    def __init__(self, files):
+        """
+        Initialisation du thread
+        
+        Args:
+            files (list): Fichiers à comparer [(chemin, taille, mtime)]
+        """
+        super().__init__()
+        self.files = files
+        self.cancel_token = CancelToken()
+    
+    def run(self):
+        """Exécution du thread"""
+        duplicates = dedup_service.find_duplicates(
+            self.files,
+            progress_callback=self.dedup_progress.emit,
+            cancel_token=self.cancel_token
+        )
+        if not self.cancel_token.cancelled:
+            self.dedup_complete.emit(duplicates)
+    
+    def stop(self):
+        """Arrêt de la recherche"""
+        self.cancel_token.cancel()
 
 class SortWindow(BaseWindow):
     """Fenêtre principale du mode Tri (multi-sources)"""
@@ -93,6 +130,11 @@ class SortWindow(BaseWindow):
         
         # Thread de scan
         self.scan_thread = None
+        self._stopping_scan_threads = []
+        
+        # Fichiers en double : chemin du doublon -> chemin de l'original
+        self.duplicates = {}
+        self.dedup_thread = None
         
         # Configuration de l'interface utilisateur
         self.setup_ui()
@@ -122,9 +164,7 @@ class SortWindow(BaseWindow):
         else:
             print("Aucun thread de scan à arrêter")
         
-        # S'assurer que tous les threads sont arrêtés avant de fermer
-        print("Attente de la fin de tous les threads...")
-        QThread.msleep(500)  # Pause pour laisser le temps aux threads de se terminer
+        self.stop_duplicate_detection()
         
         # Accepter l'événement de fermeture
         print("closeEvent terminé - Fermeture de la fenêtre acceptée")
@@ -171,6 +211,11 @@ class SortWindow(BaseWindow):
         self.btn_scan.clicked.connect(self.scan_directories)
         self.btn_scan.setEnabled(False)
         
+        # Recherche des fichiers en double après le scan
+        self.chk_detect_duplicates = QCheckBox("Détecter les fichiers en double (contenu identique)")
+        self.chk_detect_duplicates.setChecked(settings.detect_duplicates)
+        self.chk_detect_duplicates.stateChanged.connect(self.on_detect_duplicates_changed)
+        
         # Barre de progression
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -178,6 +223,7 @@ class SortWindow(BaseWindow):
         # Ajout des widgets au groupe
         dir_layout.addLayout(btn_layout)
         dir_layout.addWidget(self.dir_list)
+        dir_layout.addWidget(self.chk_detect_duplicates)
         dir_layout.addWidget(self.btn_scan)
         dir_layout.addWidget(self.progress_bar)
         
@@ -234,6 +280,8 @@ class SortWindow(BaseWindow):
         self.file_tree.setHeaderLabels(["Nom", "Taille", "Date de modification", "Source"])
         self.file_tree.setColumnCount(4)
         self.file_tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        # Sélection multiple pour la comparaison des versions
+        self.file_tree.setSelectionMode(QTreeWidget.ExtendedSelection)
         # Ajuster la largeur des colonnes pour une meilleure lisibilité
         self.file_tree.header().setStretchLastSection(False)
         self.file_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
@@ -252,6 +300,17 @@ class SortWindow(BaseWindow):
         files_layout.addWidget(self.file_tree)
         files_layout.addWidget(self.audio_player)
         
+        # Comparaison des versions du projet
+        compare_layout = QHBoxLayout()
+        compare_layout.addStretch()
+        self.btn_compare_versions = QPushButton("Comparer les versions")
+        self.btn_compare_versions.setToolTip(
+            "Compare les plugins, les pistes et les blocs des fichiers .cpr/.bak sélectionnés\n"
+            "(toutes les versions du projet si moins de deux fichiers sont sélectionnés)")
+        self.btn_compare_versions.clicked.connect(self.compare_versions)
+        compare_layout.addWidget(self.btn_compare_versions)
+        files_layout.addLayout(compare_layout)
+        
         # Onglet des métadonnées
         metadata_tab = QWidget()
         metadata_layout = QVBoxLayout(metadata_tab)
@@ -442,25 +501,68 @@ class SortWindow(BaseWindow):
         
         print("Début du scan des dossiers")
         
-        # Arrêt du thread précédent s'il existe et est en cours d'exécution
-        if hasattr(self, 'scan_thread') and self.scan_thread is not None and self.scan_thread.isRunning():
-            print("Arrêt du thread de scan précédent...")
-            self.scan_thread.stop()
-            self.scan_thread.wait(2000)  # Attendre 2 secondes maximum
-            print("Thread de scan précédent arrêté")
+        # Arrêt du thread précédent : ses derniers lots ne doivent pas
+        # s'afficher dans la table du nouveau scan
+        self.stop_scan()
+        
+        # Les doublons de la session précédente ne sont plus valables
+        self.stop_duplicate_detection()
+        self.duplicates = {}
         
         # Affichage de la barre de progression
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
         
+        # Les projets s'affichent au fur et à mesure du scan
+        self.project_table.update_data([])
+        
         # Création et lancement du thread de scan
         print("Création d'un nouveau thread de scan")
         self.scan_thread = ScanThread(self.selected_directories)
         self.scan_thread.scan_progress.connect(self.update_scan_progress)
+        self.scan_thread.scan_batch.connect(self.on_scan_batch)
         self.scan_thread.scan_complete.connect(self.on_scan_complete)
         self.scan_thread.start()
         print(f"Thread de scan démarré: {self.scan_thread}, en cours d'exécution: {self.scan_thread.isRunning()}")
     
+    def stop_scan(self):
+        """
+        Interruption du scan en cours, s'il existe
+        
+        Les signaux du thread sont déconnectés pour que ses derniers résultats
+        ne soient pas affichés.
+        """
+        scan_thread = getattr(self, 'scan_thread', None)
+        if scan_thread is None:
+            return
+        scan_thread.stop()
+        try:
+            scan_thread.scan_progress.disconnect()
+            scan_thread.scan_batch.disconnect()
+            scan_thread.scan_complete.disconnect()
+        except (TypeError, RuntimeError):
+            pass  # Signaux déjà déconnectés
+        if scan_thread.isRunning():
+            print("Arrêt du thread de scan précédent...")
+            if not scan_thread.wait(2000):  # Attendre 2 secondes maximum
+                # Référence conservée jusqu'à la fin du thread (un QThread détruit
+                # pendant son exécution ferait planter l'application)
+                self._stopping_scan_threads.append(scan_thread)
+                scan_thread.finished.connect(lambda: self._stopping_scan_threads.remove(scan_thread))
+        self.scan_thread = None
+    
+    def on_scan_batch(self, projects):
+        """
+        Affichage d'un lot de projets trouvés pendant le scan
+        
+        Args:
+            projects (list): Lignes de synthèse des projets
+        """
+        # Lot déjà en file d'attente lors de l'arrêt d'un scan précédent
+        if self.sender() is not self.scan_thread:
+            return
+        self.project_table.upsert_projects(projects)
+    
     def update_scan_progress(self, value):
         """
         Mise à jour de la barre de progression
@@ -543,13 +645,18 @@ class SortWindow(BaseWindow):
         Args:
             projects (dict): Dictionnaire des projets trouvés
         """
+        # Fin d'un scan précédent, déjà en file d'attente lors de son arrêt
+        if self.sender() is not self.scan_thread:
+            return
         print("Scan terminé, traitement des résultats...")
         
         # Masquage de la barre de progression
         self.progress_bar.setVisible(False)
         
-        # Mettre à jour le scanner principal avec les projets trouvés
+        # Mettre à jour le scanner principal avec les projets trouvés et les
+        # racines de projet de chaque dossier (chemins relatifs à la copie)
         self.scanner.projects = projects
+        self.scanner.owners = self.scan_thread.scanner.owners
         
         # Préparer les données pour le modèle
         self.scanner._create_dataframe()
@@ -559,8 +666,8 @@ class SortWindow(BaseWindow):
         
         print(f"Nombre de projets à afficher: {len(self.all_projects_data)}")
         
-        # Mise à jour de la table des projets
-        self.project_table.update_data(self.all_projects_data)
+        # Mise à jour des lignes affichées pendant le scan, sans réinitialiser la table
+        self.project_table.upsert_projects(self.all_projects_data)
         # Connexion du signal pour sélectionner le projet depuis la table
         self.project_table.project_selected.connect(self.on_project_selected)
         
@@ -573,6 +680,7 @@ class SortWindow(BaseWindow):
             # Déconnecter les signaux pour éviter les fuites mémoire
             try:
                 self.scan_thread.scan_progress.disconnect()
+                self.scan_thread.scan_batch.disconnect()
                 self.scan_thread.scan_complete.disconnect()
             except TypeError:
                 # Ignorer les erreurs si les signaux sont déjà déconnectés
@@ -584,6 +692,96 @@ class SortWindow(BaseWindow):
                 self.scan_thread.wait(1000)  # Attendre 1 seconde maximum
             
             print("Thread de scan nettoyé")
+        
+        if self.chk_detect_duplicates.isChecked():
+            self.find_duplicates()
+    
+    def find_duplicates(self):
+        """Lancement de la recherche des fichiers en double entre les sources"""
+        self.stop_duplicate_detection()
+        
+        files = []
+        for project_data in self.scanner.projects.values():
+            for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']:
+                for file_info in project_data[key]:
+                    files.append((file_info.path, file_info.size, file_info.mtime, file_info.source))
+        
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.statusBar.showMessage("Recherche des fichiers en double...")
+        
+        self.dedup_thread = DedupThread(files)
+        self.dedup_thread.dedup_progress.connect(self.progress_bar.setValue)
+        self.dedup_thread.dedup_complete.connect(self.on_duplicates_found)
+        self.dedup_thread.start()
+    
+    def stop_duplicate_detection(self):
+        """Arrêt de la recherche des doublons en cours"""
+        if self.dedup_thread is None:
+            return
+        try:
+            self.dedup_thread.dedup_progress.disconnect()
+            self.dedup_thread.dedup_complete.disconnect()
+        except TypeError:
+            pass
+        if self.dedup_thread.isRunning():
+            self.dedup_thread.stop()
+            self.dedup_thread.wait()
+        self.dedup_thread = None
+    
+    def on_duplicates_found(self, duplicates):
+        """
+        Affichage des fichiers en double trouvés
+        
+        Args:
+            duplicates (dict): Chemin du doublon -> chemin de l'original
+        """
+        self.progress_bar.setVisible(False)
+        self.duplicates = duplicates
+        
+        # Nombre et taille des doublons par projet
+        updated_projects = []
+        total_size = 0
+        for project in getattr(self, 'all_projects_data', []):
+            project_data = self.scanner.projects.get(project['project_name'])
+            if project_data is None:
+                continue
+            count = 0
+            size = 0
+            for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']:
+                for file_info in project_data[key]:
+                    if file_info.path in duplicates:
+                        count += 1
+                        size += file_info.size
+            if count or project.get('duplicate_count'):
+                project['duplicate_count'] = count
+                project['duplicate_size'] = size
+                updated_projects.append(project)
+            total_size += size
+        self.project_table.upsert_projects(updated_projects)
+        
+        self.statusBar.showMessage(
+            f"{len(duplicates)} fichiers en double trouvés ({total_size / (1024 * 1024):.2f} MB)")
+        
+        # Rafraîchir l'arbre du projet affiché
+        project = self.project_table.get_selected_project()
+        if project:
+            self.update_file_tree(project.get('project_name', ''))
+    
+    def on_detect_duplicates_changed(self, state):
+        """
+        Gestion du changement de l'option de détection des doublons
+        
+        Args:
+            state (int): État de la case à cocher
+        """
+        settings.detect_duplicates = (state == Qt.Checked)
+        settings.save()
+        
+        # Lancer la recherche sur les résultats déjà affichés
+        if settings.detect_duplicates and self.scanner.projects and not self.duplicates:
+            if self.scan_thread is None or not self.scan_thread.isRunning():
+                self.find_duplicates()
     
     def filter_projects(self):
         """Filtrage des projets par nom"""
@@ -658,7 +856,7 @@ class SortWindow(BaseWindow):
         # Trouver le fichier CPR le plus récent
         latest_cpr = None
         if project_details['cpr_files']:
-            latest_cpr = max(project_details['cpr_files'], key=lambda x: x['modified'])
+            latest_cpr = max(project_details['cpr_files'], key=lambda x: x.mtime)
         
         # Création des éléments pour les fichiers CPR
         cpr_parent = QTreeWidgetItem(self.file_tree, ["Fichiers CPR"])
@@ -689,6 +887,7 @@ class SortWindow(BaseWindow):
             item.setToolTip(3, f"Chemin complet: {source}")
             
             item.setData(0, Qt.UserRole, file_info['path'])
+            self._mark_duplicate(item, file_info['path'])
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             # Cocher par défaut le fichier le plus récent, décocher les autres
             item.setCheckState(0, Qt.Checked if is_latest else Qt.Unchecked)
@@ -696,7 +895,7 @@ class SortWindow(BaseWindow):
         # Trouver le fichier BAK le plus récent
         latest_bak = None
         if project_details['bak_files']:
-            latest_bak = max(project_details['bak_files'], key=lambda x: x['modified'])
+            latest_bak = max(project_details['bak_files'], key=lambda x: x.mtime)
         
         # Création des éléments pour les fichiers BAK
         bak_parent = QTreeWidgetItem(self.file_tree, ["Fichiers BAK"])
@@ -727,6 +926,7 @@ class SortWindow(BaseWindow):
             item.setToolTip(3, f"Chemin complet: {source}")
             
             item.setData(0, Qt.UserRole, file_info['path'])
+            self._mark_duplicate(item, file_info['path'])
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             # Cocher par défaut le fichier le plus récent si l'option est activée, décocher les autres
             should_check = self.chk_keep_bak.isChecked() and is_latest
@@ -760,6 +960,7 @@ class SortWindow(BaseWindow):
             item.setToolTip(3, f"Chemin complet: {source}")
             
             item.setData(0, Qt.UserRole, file_info['path'])
+            self._mark_duplicate(item, file_info['path'])
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             # Par défaut, les fichiers WAV sont sélectionnés sauf s'ils commencent par ._ et que l'option est activée
             should_check = not (is_dotunderscore and self.chk_remove_dotunderscore.isChecked())
@@ -793,6 +994,7 @@ class SortWindow(BaseWindow):
             item.setToolTip(3, f"Chemin complet: {source}")
             
             item.setData(0, Qt.UserRole, file_info['path'])
+            self._mark_duplicate(item, file_info['path'])
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             # Par défaut, les autres fichiers sont sélectionnés sauf s'ils commencent par ._ et que l'option est activée
             should_check = not (is_dotunderscore and self.chk_remove_dotunderscore.isChecked())
@@ -821,6 +1023,20 @@ class SortWindow(BaseWindow):
         # Expansion des éléments parents
         self.file_tree.expandAll()
     
+    def _mark_duplicate(self, item, file_path):
+        """
+        Signalement d'un fichier dont le contenu existe déjà dans une autre source
+        
+        Args:
+            item (QTreeWidgetItem): Élément de l'arbre des fichiers
+            file_path (str): Chemin du fichier
+        """
+        original = self.duplicates.get(file_path)
+        if not original:
+            return
+        item.setText(0, f"{item.text(0)} (doublon)")
+        item.setToolTip(0, f"Contenu identique à : {original}")
+    
     def on_item_double_clicked(self, item, column):
         """
         Gestion du double-clic sur un élément de l'arbre des fichiers
@@ -845,6 +1061,28 @@ class SortWindow(BaseWindow):
             # Ouverture du fichier CPR dans Cubase
             self.open_in_cubase(file_path)
     
+    def compare_versions(self):
+        """Comparaison des versions sélectionnées (ou de toutes les versions du projet)"""
+        paths = []
+        for item in self.file_tree.selectedItems():
+            file_path = item.data(0, Qt.UserRole)
+            if file_path and Path(file_path).suffix.lower() in ('.cpr', '.bak'):
+                paths.append(file_path)
+        
+        if len(paths) < 2:
+            project = getattr(self, 'selected_project', None)
+            project_details = self.scanner.get_project_details(project.get('project_name', '')) if project else None
+            if project_details:
+                paths = project_version_paths(project_details)
+        
+        if len(paths) < 2:
+            QMessageBox.information(self, "Comparaison des versions",
+                                    "Sélectionnez au moins deux fichiers .cpr ou .bak à comparer.")
+            return
+        
+        dialog = CprCompareDialog(paths, self)
+        dialog.exec_()
+    
     def select_destination(self):
         """Sélection du dossier de destination"""
         # Déconnecter temporairement le signal pour éviter les appels multiples
@@ -970,19 +1208,36 @@ class SortWindow(BaseWindow):
             
             # Copie des fichiers sélectionnés
             files_copied = 0
+            duplicates_skipped = 0
+            # Contenus déjà copiés : (original, chemin relatif de destination)
+            copied_contents = set()
+            project_dir = (self.scanner.get_project_details(project_name) or {}).get('project_dir', '')
             
             # Fonction pour copier les fichiers d'une catégorie vers un dossier spécifique
             def copy_files(file_paths, category_name, target_dir=None):
-                nonlocal files_copied
+                nonlocal files_copied, duplicates_skipped
                 for file_path in file_paths:
                     src_path = Path(file_path)
                     
-                    # Déterminer le dossier de destination en fonction du type de fichier
-                    if target_dir:
+                    # Les fichiers des sous-dossiers du projet (Audio, Edits, Fades, Freeze...)
+                    # gardent leur sous-dossier ; ceux de la racine sont rangés par type
+                    relative_path = self.scanner.project_relative_path(file_path, project_dir)
+                    if len(relative_path.parts) > 1:
+                        dest_path = dest_project_dir / relative_path
+                    elif target_dir:
                         dest_path = target_dir / src_path.name
                     else:
                         dest_path = dest_project_dir / src_path.name
                     
+                    # Un doublon copié au même emplacement qu'un fichier déjà copié donnerait
+                    # le même fichier de destination : inutile de le recopier depuis une autre source
+                    content_key = (self.duplicates.get(file_path, file_path),
+                                   dest_path.relative_to(dest_project_dir).as_posix())
+                    if content_key in copied_contents:
+                        duplicates_skipped += 1
+                        print(f"Doublon ignoré: {src_path}")
+                        continue
+                    
                     try:
                         # Vérifier si le fichier source existe
                         if not os.path.exists(src_path):
@@ -990,8 +1245,10 @@ class SortWindow(BaseWindow):
                             continue
                         
                         # Copier le fichier
+                        dest_path.parent.mkdir(parents=True, exist_ok=True)
                         shutil.copy2(src_path, dest_path)
                         files_copied += 1
+                        copied_contents.add(content_key)
                         print(f"Copié: {src_path} -> {dest_path}")
                     except Exception as e:
                         print(f"Erreur lors de la copie du fichier {category_name}: {e}")
@@ -1073,7 +1330,10 @@ class SortWindow(BaseWindow):
                 print(f"Erreur lors de la sauvegarde des métadonnées dans le dossier de destination: {e}")
             
             # Message de succès
-            QMessageBox.information(self, "Succès", f"Projet '{project_name}' sauvegardé avec succès!\n{files_copied} fichiers copiés.")
+            message = f"Projet '{project_name}' sauvegardé avec succès!\n{files_copied} fichiers copiés."
+            if duplicates_skipped:
+                message += f"\n{duplicates_skipped} doublons ignorés."
+            QMessageBox.information(self, "Succès", message)
             self.statusBar.showMessage(f"Projet '{project_name}' sauvegardé dans {self.destination_directory} ({files_copied} fichiers)")
             
         except Exception as e:
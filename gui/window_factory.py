@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chargement différé et réutilisation des fenêtres de chaque mode
+
+Chaque mode tire ses propres dépendances (QtMultimedia pour le tri et le
+workspace, numpy/scipy pour la forme d'onde, lxml pour la gestion) : seul le
+module du mode affiché est importé, au moment où sa fenêtre est créée.
+"""
+
+import importlib
+
+from config.constants import MODE_TRI, MODE_WORKSPACE, MODE_GESTION
+
+# Mode -> (module, classe de la fenêtre)
+WINDOW_CLASSES = {
+    MODE_TRI: ("gui.sort_mode.sort_window", "SortWindow"),
+    MODE_WORKSPACE: ("gui.workspace_mode.workspace_window", "WorkspaceWindow"),
+    MODE_GESTION: ("gui.gestion_mode.gestion_window", "GestionWindow"),
+}
+
+
+def window_class(mode):
+    """
+    Classe de la fenêtre d'un mode, importée à la première demande
+
+    Args:
+        mode (str): Mode de l'application (tri, workspace ou gestion)
+
+    Returns:
+        type: Classe de la fenêtre (celle du mode tri si le mode est inconnu)
+    """
+    module_name, class_name = WINDOW_CLASSES.get(mode, WINDOW_CLASSES[MODE_TRI])
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+# Fenêtres déjà créées, par mode : elles sont masquées plutôt que fermées lors
+# d'un changement de mode afin de conserver leur état (résultats de scan,
+# fichier XML chargé, analyses VSTi...).
+_windows = {}
+
+
+def get_window(mode):
+    """
+    Fenêtre d'un mode, créée à la première demande puis réutilisée
+
+    Args:
+        mode (str): Mode de l'application (tri, workspace ou gestion)
+
+    Returns:
+        BaseWindow: Fenêtre du mode (celle du mode tri si le mode est inconnu)
+    """
+    if mode not in WINDOW_CLASSES:
+        mode = MODE_TRI
+    window = _windows.get(mode)
+    if window is None:
+        window = window_class(mode)()
+        _windows[mode] = window
+    return window
+
+
+def close_windows():
+    """
+    Fermeture de toutes les fenêtres créées, y compris celles masquées
+
+    À connecter à QApplication.aboutToQuit : chaque fenêtre arrête ses threads
+    et ses surveillances dans son closeEvent.
+    """
+    while _windows:
+        _, window = _windows.popitem()
+        window.close()
@@ -8,9 +8,10 @@ Fenêtre principale du mode Espace de Travail (unique)
 import os
 import re
 import shutil
+import time
 from pathlib import Path
 from datetime import datetime
-from services.vsti_manager import get_vsti_by_editor
+from services.vsti_manager import get_vsti_by_editor, vsti_catalogue, SAVE_DELAY
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit, QTabWidget, QTreeWidget, QTreeWidgetItem, QSplitter, QFileDialog, QDialog, QMessageBox, QToolButton, QAbstractItemView, QTableWidget, QTableWidgetItem, QHeaderView,
@@ -18,7 +19,7 @@ from PyQt5.QtWidgets import (
     QInputDialog, QToolBar, QShortcut, QFrame, QToolButton, QProgressBar,
     QGroupBox, QCheckBox, QSizePolicy
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QDir, QObject
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QDir, QObject, QTimer
 from PyQt5.QtGui import QIcon, QKeySequence
 
 from gui.base.base_window import BaseWindow
@@ -26,9 +27,14 @@ from gui.components.audio_player import AudioPlayer
 from gui.components.file_tree import FileTree
 from gui.components.metadata_editor import MetadataEditor
 from gui.components.project_table import ProjectTable
+from gui.components.directory_watcher import DirectoryWatcher
 from gui.components.waveform_viewer import ModernWaveformPlayer
+from gui.components.vsti_stats_panel import VstiStatsPanel
 
 from services.scanner import CubaseScanner
+from services.scan_index import scan_index
+from services.scan_rules import rules_from_settings
+from services.cancel_token import CancelToken
 from services.metadata_service import MetadataService
 from services.file_service import FileService
 from services.audio_service import AudioService
@@ -40,7 +46,8 @@ from config.settings import settings
 
 class VstiWorker(QObject):
     finished = pyqtSignal(set, str)
-    progressChanged = pyqtSignal(int)
+    # Octets balayés, octets à balayer (émis au plus 20 fois par seconde)
+    progressChanged = pyqtSignal('qint64', 'qint64')
 
     def __init__(self, cpr_path, parent=None):
         super().__init__(parent)
@@ -53,16 +60,17 @@ class VstiWorker(QObject):
 
     def run(self):
         try:
-            from services.lectureCPR import trouve_vsti
+            from services.vsti_cache import vsti_cache
             import os
             found = set()
             if self.cpr_path and os.path.exists(self.cpr_path) and self._running:
-                def progress_callback(percent):
+                def progress_callback(done, total):
                     if self._running:  # Vérifier si on doit continuer
-                        self.progressChanged.emit(percent)
+                        self.progressChanged.emit(done, total)
                     else:
                         return False  # Signaler à trouve_vsti qu'il doit s'arrêter
-                found = trouve_vsti(self.cpr_path, progress_callback=progress_callback)
+                # Le résultat est conservé dans le cache persistant des analyses
+                found, _ = vsti_cache.analyse(self.cpr_path, progress_callback=progress_callback)
                 if self._running:  # Vérifier si on a été arrêté pendant l'analyse
                     self.finished.emit(found, "")
                 else:
@@ -79,12 +87,15 @@ class VstiWorker(QObject):
 class WorkspaceWindow(BaseWindow):
     """Fenêtre principale du mode Espace de Travail (unique)"""
     
+    # Liste des VSTi modifiée (émis depuis le thread qui a constaté le changement)
+    vsti_list_changed = pyqtSignal()
+    
     def __init__(self):
         """Initialisation de la fenêtre du mode Espace de Travail"""
         super().__init__()
         
         # Services
-        self.scanner = CubaseScanner()
+        self.scanner = CubaseScanner(index=scan_index, rules=rules_from_settings(settings.scan_rules))
         self.metadata_service = MetadataService(mode='local')
         self.file_service = FileService()
         self.audio_service = AudioService()
@@ -97,6 +108,24 @@ class WorkspaceWindow(BaseWindow):
         # Thread de scan
         self.scan_thread = None
         
+        # Dernier inventaire VSTi du workspace (voir open_vsti_inventory_dialog)
+        self.vsti_inventory = None
+        
+        # Liste des VSTi modifiée : l'analyse du CPR affiché est relancée,
+        # une seule fois après une série de modifications
+        self._vsti_cpr_path = None
+        self._vsti_reanalyse_timer = QTimer(self)
+        self._vsti_reanalyse_timer.setSingleShot(True)
+        self._vsti_reanalyse_timer.setInterval(int(SAVE_DELAY * 1000))
+        self._vsti_reanalyse_timer.timeout.connect(self.reanalyze_vsti)
+        self.vsti_list_changed.connect(self._vsti_reanalyse_timer.start)
+        self._vsti_list_callback = self.vsti_list_changed.emit
+        vsti_catalogue.subscribe(self._vsti_list_callback)
+        
+        # Surveillance du workspace : mises à jour incrémentales sans rescan
+        self.workspace_watcher = DirectoryWatcher(self)
+        self.workspace_watcher.directories_changed.connect(self.on_workspace_changed)
+        
         # Configuration de l'interface
         self.setup_ui()
         
@@ -115,17 +144,11 @@ class WorkspaceWindow(BaseWindow):
         """
         print("closeEvent appelé - Début de la fermeture de la fenêtre")
         
-        # Arrêt du thread de scan s'il est en cours d'exécution
-        if hasattr(self, 'scan_thread') and self.scan_thread is not None:
-            print(f"Thread de scan existant: {self.scan_thread}, en cours d'exécution: {self.scan_thread.isRunning()}")
-            if self.scan_thread.isRunning():
-                print("Arrêt du thread de scan...")
-                if hasattr(self.scan_thread, 'stop'):
-                    self.scan_thread.stop()
-                self.scan_thread.wait(2000)  # Attendre 2 secondes maximum
-                print("Thread de scan arrêté")
-        else:
-            print("Aucun thread de scan à arrêter")
+        # Arrêt du scan en cours : le jeton d'annulation l'interrompt en quelques millisecondes
+        self.stop_workspace_scan()
+        self.workspace_watcher.stop()
+        vsti_catalogue.unsubscribe(self._vsti_list_callback)
+        self._vsti_reanalyse_timer.stop()
 
         # Arrêt du thread VSTi s'il est en cours d'exécution
         if hasattr(self, '_vsti_thread') and self._vsti_thread is not None:
@@ -147,10 +170,6 @@ class WorkspaceWindow(BaseWindow):
             self._vsti_thread = None
             self._vsti_worker = None
 
-        # S'assurer que tous les threads sont arrêtés avant de fermer
-        print("Attente de la fin de tous les threads...")
-        QThread.msleep(500)  # Pause pour laisser le temps aux threads de se terminer
-        
         # Accepter l'événement de fermeture
         print("closeEvent terminé - Fermeture de la fenêtre acceptée")
         event.accept()
@@ -238,13 +257,33 @@ class WorkspaceWindow(BaseWindow):
         self.action_new_folder.setIcon(QIcon(f"{icon_path}/create_new_folder{icon_suffix}.svg"))
         self.action_reset_workspace.setIcon(QIcon(f"{icon_path}/delete{icon_suffix}.svg"))
     
+    def open_vsti_inventory_dialog(self):
+        """Ouverture de l'inventaire VSTi (plugin -> projets) du workspace"""
+        if not self.all_projects_data:
+            QMessageBox.information(self, "Inventaire VSTi", "Aucun projet dans le workspace.")
+            return
+        from gui.components.vsti_inventory_dialog import VstiInventoryDialog
+        dlg = VstiInventoryDialog(self.all_projects_data, self.vsti_inventory, self)
+        dlg.inventory_ready.connect(self.on_vsti_inventory_ready)
+        dlg.exec_()
+    
+    def on_vsti_inventory_ready(self, inventory):
+        """Conservation du dernier inventaire pour les ouvertures suivantes"""
+        self.vsti_inventory = inventory
+        # Les analyses de l'inventaire sont en cache : les statistiques les incluent
+        self.vsti_stats_panel.set_projects(self.all_projects_data)
+    
     def open_vsti_manager_dialog(self):
         from PyQt5.QtWidgets import (
             QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QInputDialog, QMessageBox
         )
-        from services.vsti_manager import load_vsti_list, save_vsti_list
+        from PyQt5.QtCore import Qt
+        from services.vsti_manager import vsti_catalogue
 
         class VstiManagerDialog(QDialog):
+            # Liste modifiée (ici ou ailleurs) : le tableau est relu
+            vsti_list_changed = pyqtSignal()
+
             def __init__(self, parent=None):
                 super().__init__(parent)
                 self.setWindowTitle("Gestion des VSTi connus")
@@ -264,8 +303,18 @@ class WorkspaceWindow(BaseWindow):
                 btn_layout.addWidget(self.btn_add)
                 btn_layout.addWidget(self.btn_edit)
                 btn_layout.addWidget(self.btn_del)
+                # Ajout des plugins installés (dossiers VST3/VST2)
+                self.btn_discover = QPushButton("Découvrir les plugins")
+                btn_layout.addWidget(self.btn_discover)
                 layout.addLayout(btn_layout)
-                # Bouton sauvegarder
+                # Seuls les instruments sont ajoutés, sauf choix explicite
+                self.chk_discover_unknown = QCheckBox("Inclure les plugins de type inconnu (VST2...)")
+                self.chk_discover_unknown.setToolTip(
+                    "Le type (instrument ou effet) de ces plugins n'est pas déclaré :\n"
+                    "des effets peuvent être ajoutés à la liste des VSTi")
+                layout.addWidget(self.chk_discover_unknown)
+                # Les modifications sont enregistrées automatiquement ;
+                # le bouton force l'écriture immédiate
                 self.btn_save = QPushButton("Sauvegarder")
                 layout.addWidget(self.btn_save)
                 self.setLayout(layout)
@@ -273,13 +322,24 @@ class WorkspaceWindow(BaseWindow):
                 self.btn_add.clicked.connect(self.add_vsti)
                 self.btn_edit.clicked.connect(self.edit_vsti)
                 self.btn_del.clicked.connect(self.del_vsti)
+                self.btn_discover.clicked.connect(self.discover_plugins)
                 self.btn_save.clicked.connect(self.save_vsti_list)
                 self.table_widget.itemDoubleClicked.connect(self.edit_vsti)
 
+                # Connexion différée : le tableau n'est pas reconstruit
+                # pendant le traitement de l'une de ses cellules
+                self.vsti_list_changed.connect(self.load_data, Qt.QueuedConnection)
+                self._vsti_list_callback = self.vsti_list_changed.emit
+                vsti_catalogue.subscribe(self._vsti_list_callback)
+
                 self.load_data()
 
+            def done(self, result):
+                vsti_catalogue.unsubscribe(self._vsti_list_callback)
+                super().done(result)
+
             def load_data(self):
-                vsti_list = load_vsti_list()
+                vsti_list = vsti_catalogue.snapshot()
                 # Migration auto si simple liste
                 if vsti_list and isinstance(vsti_list[0], str):
                     vsti_list = [{"name": n} for n in vsti_list]
@@ -292,7 +352,6 @@ class WorkspaceWindow(BaseWindow):
                 for row, vst in enumerate(self.vsti_list):
                     name_item = QTableWidgetItem(vst.get("name", ""))
                     editor_item = QTableWidgetItem(vst.get("editor", ""))
-                    from PyQt5.QtCore import Qt
                     name_item.setFlags(name_item.flags() | Qt.ItemIsEditable)
                     editor_item.setFlags(editor_item.flags() | Qt.ItemIsEditable)
                     self.table_widget.setItem(row, 0, name_item)
@@ -308,16 +367,20 @@ class WorkspaceWindow(BaseWindow):
                 if row < 0 or row >= len(self.vsti_list):
                     return
                 value = item.text().strip()
+                vst = self.vsti_list[row]
+                new_vst = dict(vst)
                 if col == 0:
                     # Nom
-                    # Vérifier unicité
-                    if value and any(i != row and v["name"] == value for i, v in enumerate(self.vsti_list)):
-                        QMessageBox.warning(self, "Erreur", f"Le VSTi '{value}' existe déjà.")
+                    if not value:
                         self.refresh_table()
                         return
-                    self.vsti_list[row]["name"] = value
+                    new_vst["name"] = value
                 elif col == 1:
-                    self.vsti_list[row]["editor"] = value
+                    new_vst["editor"] = value
+                # Vérifier unicité
+                if not vsti_catalogue.update(vst.get("name", ""), new_vst):
+                    QMessageBox.warning(self, "Erreur", f"Le VSTi '{value}' existe déjà.")
+                    self.refresh_table()
 
             def add_vsti(self):
                 name, ok = QInputDialog.getText(self, "Ajouter un VSTi", "Nom du VSTi :")
@@ -328,11 +391,8 @@ class WorkspaceWindow(BaseWindow):
                 if ok2 and editor.strip():
                     vst["editor"] = editor.strip()
                 # Unicité sur le nom
-                if any(v["name"] == vst["name"] for v in self.vsti_list):
+                if not vsti_catalogue.add(vst):
                     QMessageBox.warning(self, "Erreur", f"Le VSTi '{name}' existe déjà.")
-                    return
-                self.vsti_list.append(vst)
-                self.refresh_table()
 
             def edit_vsti(self):
                 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
@@ -376,13 +436,11 @@ class WorkspaceWindow(BaseWindow):
                 dlg = EditVstiDialog(vst.get("name", ""), vst.get("editor", ""), self)
                 if dlg.exec_() == QDialog.Accepted:
                     name, editor = dlg.get_values()
+                    if not name:
+                        return
                     # Vérifier unicité si renommage
-                    if name != vst["name"] and any(v["name"] == name for i, v in enumerate(self.vsti_list) if i != row):
+                    if not vsti_catalogue.update(vst["name"], {**vst, "name": name, "editor": editor}):
                         QMessageBox.warning(self, "Erreur", f"Le VSTi '{name}' existe déjà.")
-                        return
-                    vst["name"] = name
-                    vst["editor"] = editor
-                    self.refresh_table()
 
 
             def del_vsti(self):
@@ -392,14 +450,33 @@ class WorkspaceWindow(BaseWindow):
                 name = self.vsti_list[row]["name"]
                 r = QMessageBox.question(self, "Supprimer", f"Supprimer {name} ?")
                 if r == QMessageBox.Yes:
-                    self.vsti_list.pop(row)
-                    self.refresh_table()
+                    vsti_catalogue.remove(name)
+
+            def discover_plugins(self):
+                from PyQt5.QtWidgets import QApplication
+                from services.plugin_discovery import plugin_folders, discover_into_catalogue
+                folders = plugin_folders(settings.plugin_folders)
+                if not folders:
+                    QMessageBox.information(self, "Découverte", "Aucun dossier de plugins VST3/VST2 trouvé.")
+                    return
+                # Seuls les plugins installés ou mis à jour depuis la dernière découverte sont relus
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                try:
+                    total, changed = discover_into_catalogue(
+                        folders, include_unknown=self.chk_discover_unknown.isChecked())
+                finally:
+                    QApplication.restoreOverrideCursor()
+                QMessageBox.information(
+                    self, "Découverte",
+                    f"{total} plugins trouvés dans {len(folders)} dossiers.\n"
+                    f"{changed} entrées ajoutées ou complétées."
+                )
 
             def save_vsti_list(self):
-                # Nettoyage : retirer les entrées sans nom
-                cleaned = [v for v in self.vsti_list if v.get("name")]
-                save_vsti_list(cleaned)
-                QMessageBox.information(self, "Sauvegarde", "La liste des VSTi a été sauvegardée.")
+                if vsti_catalogue.flush():
+                    QMessageBox.information(self, "Sauvegarde", "La liste des VSTi a été sauvegardée.")
+                else:
+                    QMessageBox.warning(self, "Erreur", "Impossible de sauvegarder la liste des VSTi.")
 
             def accept(self):
                 super().accept()
@@ -627,6 +704,11 @@ class WorkspaceWindow(BaseWindow):
         self.vsti_settings_btn.setToolTip("Gérer la liste des VSTi connus")
         self.vsti_settings_btn.clicked.connect(self.open_vsti_manager_dialog)
         vsti_label_layout.addWidget(self.vsti_settings_btn)
+        self.vsti_inventory_btn = QToolButton()
+        self.vsti_inventory_btn.setIcon(style.standardIcon(QStyle.SP_FileDialogContentsView))
+        self.vsti_inventory_btn.setToolTip("Inventaire des VSTi de tous les projets du workspace")
+        self.vsti_inventory_btn.clicked.connect(self.open_vsti_inventory_dialog)
+        vsti_label_layout.addWidget(self.vsti_inventory_btn)
         vsti_label_layout.addStretch(1)
         metadata_layout.addLayout(vsti_label_layout)
         metadata_layout.addWidget(self.vsti_table)
@@ -645,6 +727,10 @@ class WorkspaceWindow(BaseWindow):
         self.details_tabs.addTab(files_tab, "Lecteur Audio")
         self.details_tabs.addTab(metadata_tab, "Tags & Notes / VSTi")
         
+        # Statistiques d'utilisation des plugins de tous les projets
+        self.vsti_stats_panel = VstiStatsPanel()
+        self.details_tabs.addTab(self.vsti_stats_panel, "Statistiques VSTi")
+        
         # Ajout du splitter horizontal : à gauche les arborescences, à droite les tabs de détails
         self.details_splitter = QSplitter(Qt.Horizontal)
         self.details_splitter.addWidget(trees_container)
@@ -693,6 +779,9 @@ class WorkspaceWindow(BaseWindow):
         Args:
             directory (str): Chemin du dossier de travail
         """
+        # L'inventaire VSTi portait sur le workspace précédent
+        self.vsti_inventory = None
+        
         # Pour l'arborescence gauche, on affiche tout le système de fichiers
         self.file_tree_left.set_root_path("")
         self.file_tree_left.setCurrentIndex(self.file_tree_left.fs_model.index(directory))
@@ -711,38 +800,47 @@ class WorkspaceWindow(BaseWindow):
         from PyQt5.QtCore import QObject, pyqtSignal
         class WorkspaceScanWorker(QObject):
             progressChanged = pyqtSignal(int)
+            projectsFound = pyqtSignal(list)
             finished = pyqtSignal(object)
             def __init__(self, scanner, directory):
                 super().__init__()
                 self.scanner = scanner
                 self.directory = directory
+                self.cancel_token = CancelToken()
             def run(self):
-                import os
                 self.scanner.clear()
-                # Compter ET scanner dans le worker pour ne rien bloquer
-                total = 0
-                for _ in os.walk(self.directory):
-                    total += 1
-                current = 0
-                for root, dirs, files in os.walk(self.directory):
-                    self.scanner.scan_directory(root)
-                    current += 1
-                    percent = int((current / total) * 100) if total > 0 else 100
-                    self.progressChanged.emit(percent)
+                # Un seul parcours de l'arborescence, la progression est remontée par le scanner
+                # et les projets sont transmis par lots au fil du scan
+                self.scanner.scan_directory(self.directory,
+                                            progress_callback=self.progressChanged.emit,
+                                            projects_callback=self.projectsFound.emit,
+                                            cancel_token=self.cancel_token)
                 self.finished.emit(self.scanner)
 
-        # Arrêter un éventuel thread précédent
-        if hasattr(self, 'scan_thread') and self.scan_thread is not None:
-            if self.scan_thread.isRunning():
-                self.scan_thread.quit()
-                self.scan_thread.wait()
-        self.scan_thread = QThread()
-        self.scan_worker = WorkspaceScanWorker(self.scanner, directory)
-        self.scan_worker.moveToThread(self.scan_thread)
-        self.scan_thread.started.connect(self.scan_worker.run)
-        self.scan_worker.progressChanged.connect(self.vsti_progress.setValue)
+        # Arrêter un éventuel scan précédent (changement de workspace, actualisation)
+        self.stop_workspace_scan()
+        self.workspace_watcher.stop()
+        scan_thread = QThread()
+        scan_worker = WorkspaceScanWorker(self.scanner, directory)
+        scan_worker.moveToThread(scan_thread)
+        scan_thread.started.connect(scan_worker.run)
+        self.scan_thread = scan_thread
+        self.scan_worker = scan_worker
+
+        def on_scan_progress(percent):
+            self.vsti_progress.setMaximum(100)
+            self.vsti_progress.setValue(percent)
+            self.vsti_progress.setFormat(f"Scan des projets en cours... {percent}%")
+        self.scan_worker.progressChanged.connect(on_scan_progress)
+
+        # Les projets s'affichent au fur et à mesure du scan
+        self.project_table.update_data([])
+        self.scan_worker.projectsFound.connect(self.project_table.upsert_projects)
 
         def on_scan_finished(scanner):
+            scan_thread.quit()
+            if scan_worker.cancel_token.cancelled:
+                return
             for project_name, project_data in scanner.projects.items():
                 project_dir = project_data.get('project_dir', '')
                 if not project_dir or not os.path.exists(project_dir):
@@ -770,19 +868,75 @@ class WorkspaceWindow(BaseWindow):
                             project_data['project_dir'] = directory
             scanner._create_dataframe()
             self.all_projects_data = scanner.df_projects
-            self.project_table.update_data(self.all_projects_data)
+            # Mise à jour des lignes déjà affichées, sans réinitialiser la table
+            self.project_table.upsert_projects(self.all_projects_data)
+            self.vsti_stats_panel.set_projects(self.all_projects_data)
             self.vsti_progress.setMaximum(100)
             self.vsti_progress.setValue(100)
             self.vsti_progress.setVisible(False)
             self.statusBar.showMessage(f"{len(self.all_projects_data)} projets trouvés dans le dossier de travail")
-            self.scan_thread.quit()
-            self.scan_thread.wait()
+            scan_thread.wait()
+            if self.scan_thread is scan_thread:
+                self.scan_thread = None
+                self.scan_worker = None
+            # Les modifications ultérieures du workspace sont suivies sans rescan
+            self.workspace_watcher.watch(scanner.get_directories(directory))
         self.scan_worker.finished.connect(on_scan_finished)
         self.scan_thread.start()
 
+    def stop_workspace_scan(self):
+        """
+        Interruption du scan du workspace en cours, s'il existe
+        
+        Le worker est prévenu par son jeton d'annulation et ses signaux sont
+        déconnectés pour que ses derniers résultats ne soient pas affichés.
+        """
+        scan_thread = getattr(self, 'scan_thread', None)
+        scan_worker = getattr(self, 'scan_worker', None)
+        if scan_thread is None:
+            return
+        if scan_worker is not None:
+            scan_worker.cancel_token.cancel()
+            try:
+                scan_worker.progressChanged.disconnect()
+                scan_worker.projectsFound.disconnect()
+            except (TypeError, RuntimeError):
+                pass  # Signaux déjà déconnectés
+        if scan_thread.isRunning():
+            scan_thread.quit()
+            scan_thread.wait()
+        self.scan_thread = None
+        self.scan_worker = None
+
+    
+    def on_workspace_changed(self, directories):
+        """
+        Mise à jour des projets après des modifications dans le workspace
+        
+        Seuls les dossiers signalés sont relus, les lignes de la table
+        correspondantes sont mises à jour, ajoutées ou retirées.
+        
+        Args:
+            directories (list): Dossiers modifiés
+        """
+        if not self.workspace_dir or self.scan_thread is not None:
+            return
+        updated, removed = self.scanner.refresh_directories(self.workspace_dir, directories)
+        self.all_projects_data = self.scanner.df_projects
+        self.vsti_stats_panel.set_projects(self.all_projects_data)
+        
+        self.project_table.remove_projects(removed)
+        self.project_table.upsert_projects(
+            [project for project in self.all_projects_data if project['project_name'] in updated])
+        
+        # Nouveaux sous-dossiers à surveiller, dossiers supprimés à oublier
+        self.workspace_watcher.watch(self.scanner.get_directories(self.workspace_dir))
+        self.statusBar.showMessage(f"Workspace mis à jour : {len(self.all_projects_data)} projets")
     
     def reset_workspace(self):
         """Réinitialisation du workspace"""
+        self.stop_workspace_scan()
+        self.workspace_watcher.stop()
         self.workspace_dir = None
         self.lbl_workspace_path.setText("Dossier de travail : (aucun)")
         settings.last_workspace = ""
@@ -1080,17 +1234,26 @@ class WorkspaceWindow(BaseWindow):
             self.cubase_service.open_project(path)
             self.statusBar.showMessage(f"Ouverture du fichier {os.path.basename(path)} dans Cubase")
             
-    def update_vsti_progress(self, percent):
+    def update_vsti_progress(self, done, total):
         """
         Mise à jour de la barre de progression VSTi
         
         Args:
-            percent (int): Pourcentage de progression
+            done (int): Octets balayés
+            total (int): Octets à balayer
         """
-        if percent >= 0:
-            self.vsti_progress.setMaximum(100)
-            self.vsti_progress.setValue(percent)
-            self.vsti_progress.setFormat(f'Analyse du projet en cours... {percent}%')
+        if total <= 0:
+            return
+        percent = int(done * 100 / total)
+        self.vsti_progress.setMaximum(100)
+        self.vsti_progress.setValue(percent)
+        text = f'Analyse du projet en cours... {percent}% ({done / (1024 * 1024):.0f} / {total / (1024 * 1024):.0f} Mo)'
+        # Temps restant estimé d'après le débit observé depuis le début du balayage
+        elapsed = time.monotonic() - self._vsti_started
+        if 0 < done < total and elapsed >= 1:
+            remaining = (total - done) * elapsed / done
+            text += f' - {int(remaining) + 1} s restantes'
+        self.vsti_progress.setFormat(text)
     
     def on_vsti_analysis_finished(self, found_vsti, error_message):
         """
@@ -1132,10 +1295,22 @@ class WorkspaceWindow(BaseWindow):
         self._vsti_thread = None
         self._vsti_worker = None
         
+        self.show_vsti_results(found_vsti, error_message)
+    
+    def show_vsti_results(self, found_vsti, error_message="", from_cache=False):
+        """
+        Affichage du résultat d'une analyse VSTi
+        
+        Args:
+            found_vsti (set): Ensemble des VSTi trouvés
+            error_message (str): Message d'erreur éventuel
+            from_cache (bool): Résultat servi par le cache des analyses
+        """
         # Mise à jour de l'interface
         self.vsti_progress.setMaximum(100)
         self.vsti_progress.setValue(100)
-        self.vsti_progress.setFormat('Analyse terminée')
+        self.vsti_progress.setFormat('Analyse terminée (cache)' if from_cache else 'Analyse terminée')
+        self.vsti_progress.setVisible(True)
         
         # Affichage des résultats
         if error_message:
@@ -1307,10 +1482,17 @@ class WorkspaceWindow(BaseWindow):
                 # Déclencher l'analyse VSTi uniquement ici
                 self.analyze_vsti(str(file_path))
 
+    def reanalyze_vsti(self):
+        """Nouvelle analyse du dernier CPR analysé (liste des VSTi modifiée)"""
+        if self._vsti_cpr_path and os.path.exists(self._vsti_cpr_path):
+            self.analyze_vsti(self._vsti_cpr_path)
+    
     def analyze_vsti(self, cpr_path):
         """
         Lance l'analyse VSTi sur un fichier CPR donné (thread, barre de progression, signaux, etc.)
         """
+        self._vsti_cpr_path = cpr_path
+        
         # Arrêt propre du thread VSTi précédent s'il existe
         if hasattr(self, '_vsti_thread') and self._vsti_thread is not None:
             if hasattr(self, '_vsti_worker') and self._vsti_worker is not None:
@@ -1341,6 +1523,13 @@ class WorkspaceWindow(BaseWindow):
             self._vsti_thread = None
             self._vsti_worker = None
         
+        # Projet déjà analysé et inchangé : affichage immédiat, sans thread
+        from services.vsti_cache import vsti_cache
+        cached = vsti_cache.lookup(cpr_path)
+        if cached is not None:
+            self.show_vsti_results(cached, from_cache=True)
+            return
+        
         # Configurez la barre de progression
         self.vsti_progress.setMinimum(0)
         self.vsti_progress.setMaximum(0)  # Mode indéterminé
@@ -1361,6 +1550,7 @@ class WorkspaceWindow(BaseWindow):
         from PyQt5.QtCore import QThread
         self._vsti_thread = QThread()
         self._vsti_worker = VstiWorker(cpr_path)
+        self._vsti_started = time.monotonic()
         
         # Connexion des signaux avant de déplacer le worker dans le thread
         self._vsti_worker.finished.connect(self.on_vsti_analysis_finished)
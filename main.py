@@ -7,17 +7,14 @@ Application de tri et gestion des projets Cubase
 
 import sys
 import argparse
-from PyQt5.QtWidgets import QApplication
+import contextlib
 
-from gui.sort_mode.sort_window import SortWindow
-from gui.workspace_mode.workspace_window import WorkspaceWindow
-from gui.gestion_mode.gestion_window import GestionWindow
-from config.constants import MODE_TRI, MODE_WORKSPACE, UI_WINDOW_TITLE
-
-# Ajout du mode gestion
-MODE_GESTION = "gestion"
+from config.constants import MODE_TRI, MODE_WORKSPACE, MODE_GESTION, UI_WINDOW_TITLE
 from config.settings import settings
 
+# Commandes disponibles sans interface graphique
+HEADLESS_SCAN = "scan"
+
 # Référence globale à la fenêtre active pour éviter qu'elle ne soit collectée par le garbage collector
 active_window = None
 
@@ -25,49 +22,113 @@ def parse_arguments():
     """Analyse des arguments de la ligne de commande"""
     parser = argparse.ArgumentParser(description="Application de gestion de projets Cubase")
     parser.add_argument(
-        "--mode", 
-        choices=[MODE_TRI, MODE_WORKSPACE, MODE_GESTION], 
+        "--mode",
+        choices=[MODE_TRI, MODE_WORKSPACE, MODE_GESTION],
         default=None,
         help="Mode de fonctionnement de l'application (tri ou workspace)"
     )
-    return parser.parse_args()
+
+    # Mode sans interface : python main.py --headless scan DOSSIER [DOSSIER...]
+    headless = parser.add_argument_group("mode sans interface")
+    headless.add_argument(
+        "--headless",
+        choices=[HEADLESS_SCAN],
+        default=None,
+        help="Exécuter une commande sans interface graphique (scan : rapport des projets)"
+    )
+    headless.add_argument("directories", nargs="*", help="Dossiers à scanner (mode sans interface)")
+    headless.add_argument("--format", choices=["jsonl", "csv"], default="jsonl",
+                          help="Format du rapport (JSON Lines par défaut)")
+    headless.add_argument("--output", "-o", default=None,
+                          help="Fichier de sortie (sortie standard par défaut)")
+    headless.add_argument("--vsti", action="store_true",
+                          help="Analyser les VSTi du CPR le plus récent de chaque projet")
+    headless.add_argument("--metadata", action="store_true",
+                          help="Ajouter les métadonnées des projets (note, tags, notes)")
+
+    args = parser.parse_args()
+    if args.headless and not args.directories:
+        parser.error("--headless scan : au moins un dossier à scanner est requis")
+    if not args.headless and args.directories:
+        parser.error("les dossiers à scanner ne sont acceptés qu'avec --headless scan")
+    return args
+
+def run_headless(args):
+    """
+    Exécution d'une commande sans interface graphique
+
+    Les rapports sont écrits sur la sortie demandée ; les messages des services
+    (print) sont redirigés vers la sortie d'erreur pour ne pas s'y mêler.
+
+    Args:
+        args (Namespace): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de retour du processus
+    """
+    from services.report_service import iter_project_reports, write_reports
+    from services.scan_index import scan_index
+    from services.scan_rules import rules_from_settings
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            reports = iter_project_reports(
+                args.directories,
+                with_vsti=args.vsti,
+                with_metadata=args.metadata,
+                index=scan_index,
+                rules=rules_from_settings(settings.scan_rules),
+                workers_per_device=settings.scan_workers_per_device
+            )
+            summary = write_reports(reports, output, args.format)
+        print(f"{summary['project_count']} projets, {summary['total_size'] / (1024 * 1024):.2f} MB",
+              file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
 
 def main():
     """Point d'entrée de l'application"""
     # Analyse des arguments
     args = parse_arguments()
-    
+
+    # Chargement des préférences
+    settings.load()
+
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    # Imports de l'interface graphique, inutiles en mode sans interface.
+    # Seul le module du mode affiché est chargé (voir gui.window_factory).
+    from PyQt5.QtWidgets import QApplication
+    from gui.window_factory import get_window, close_windows
+
     # Création de l'application
     app = QApplication(sys.argv)
     app.setApplicationName(UI_WINDOW_TITLE)
-    
-    # Chargement des préférences
-    settings.load()
-    
+
+    # Les fenêtres des modes masquées lors d'un basculement sont fermées en quittant
+    app.aboutToQuit.connect(close_windows)
+
     # Déterminer le mode à utiliser (priorité aux arguments de ligne de commande)
     mode = args.mode if args.mode else settings.last_mode
-    
+
     # Sauvegarder le mode actuel
     settings.last_mode = mode
     settings.save()
-    
-    # Création de la fenêtre selon le mode
-    if mode == MODE_TRI:
-        window = SortWindow()
-    elif mode == MODE_WORKSPACE:
-        window = WorkspaceWindow()
-    elif mode == MODE_GESTION:
-        window = GestionWindow()
-    else:
-        window = SortWindow()  # fallback
-    
+
+    # Création de la fenêtre selon le mode (mode tri par défaut)
+    window = get_window(mode)
+
     # Conserver une référence globale à la fenêtre active
     global active_window
     active_window = window
-    
+
     # Affichage de la fenêtre
     window.show()
-    
+
     # Exécution de l'application
     sys.exit(app.exec_())
 
@@ -55,6 +55,9 @@ class ProjectTableModel(QAbstractTableModel):
         
         # Mode d'affichage (par projet ou par dossier)
         self._view_mode = "project"  # "project" ou "folder"
+        
+        # Index des lignes par nom de projet (mises à jour incrémentales)
+        self._row_by_name = {}
     
     def rowCount(self, parent=QModelIndex()):
         """Nombre de lignes dans le modèle"""
@@ -99,6 +102,13 @@ class ProjectTableModel(QAbstractTableModel):
             
             return str(value)
         
+        # Fichiers en double détectés dans le projet
+        elif role == Qt.ToolTipRole:
+            duplicate_count = self._data[row].get('duplicate_count', 0)
+            if duplicate_count:
+                duplicate_size_mb = self._data[row].get('duplicate_size', 0) / (1024 * 1024)
+                return f"{duplicate_count} fichier(s) en double ({duplicate_size_mb:.2f} MB)"
+        
         # Coloration des lignes en fonction de la source
         elif role == Qt.BackgroundRole:
             # Alternance de gris foncé en mode sombre
@@ -144,17 +154,8 @@ class ProjectTableModel(QAbstractTableModel):
         self._source_to_color = {}
         
         # Ajout des notes depuis le service de métadonnées
-        from services.metadata_service import MetadataService
-        metadata_service = MetadataService()
-        
-        for project in self._data:
-            project_name = project['project_name']
-            try:
-                metadata = metadata_service.get_project_metadata(project_name)
-                project['rating'] = metadata.get('rating', 0)
-            except Exception as e:
-                print(f"Erreur lors de la récupération des métadonnées pour {project_name}: {e}")
-                project['rating'] = 0
+        self._load_ratings(self._data)
+        self._row_by_name = {project['project_name']: row for row, project in enumerate(self._data)}
         
         # Marquer les projets les plus récents dans chaque dossier
         if self._view_mode == "folder" and self._data:
@@ -176,6 +177,78 @@ class ProjectTableModel(QAbstractTableModel):
         
         self.endResetModel()
     
+    def upsert_projects(self, projects):
+        """
+        Ajout ou mise à jour d'un lot de projets sans réinitialiser le modèle
+        
+        Les nouveaux projets sont insérés en fin de tableau en un seul bloc
+        (beginInsertRows), les projets déjà présents sont remplacés sur place
+        (dataChanged). Utilisé pour afficher les projets au fil du scan.
+        
+        Args:
+            projects (list): Lignes de synthèse des projets
+        """
+        new_projects = []
+        changed_rows = []
+        for project in projects:
+            row = self._row_by_name.get(project['project_name'])
+            if row is None:
+                new_projects.append(project)
+            else:
+                project.setdefault('rating', self._data[row].get('rating', 0))
+                self._data[row] = project
+                changed_rows.append(row)
+        
+        if changed_rows:
+            last_column = len(self._headers) - 1
+            self.dataChanged.emit(self.index(min(changed_rows), 0),
+                                  self.index(max(changed_rows), last_column))
+        
+        if new_projects:
+            self._load_ratings(new_projects)
+            first = len(self._data)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_projects) - 1)
+            for row, project in enumerate(new_projects, start=first):
+                self._row_by_name[project['project_name']] = row
+            self._data.extend(new_projects)
+            self.endInsertRows()
+    
+    def remove_projects(self, project_names):
+        """
+        Suppression des lignes de projets disparus
+        
+        Args:
+            project_names (iterable): Noms des projets à retirer
+        """
+        rows = sorted((self._row_by_name[name] for name in project_names if name in self._row_by_name),
+                      reverse=True)
+        if not rows:
+            return
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._data[row]
+            self.endRemoveRows()
+        self._row_by_name = {project['project_name']: row for row, project in enumerate(self._data)}
+    
+    def _load_ratings(self, projects):
+        """
+        Ajout des notes depuis le service de métadonnées
+        
+        Args:
+            projects (list): Projets à compléter (modifiés sur place)
+        """
+        from services.metadata_service import MetadataService
+        metadata_service = MetadataService()
+        
+        for project in projects:
+            project_name = project['project_name']
+            try:
+                metadata = metadata_service.get_project_metadata(project_name)
+                project['rating'] = metadata.get('rating', 0)
+            except Exception as e:
+                print(f"Erreur lors de la récupération des métadonnées pour {project_name}: {e}")
+                project['rating'] = 0
+    
     def get_project(self, row):
         """
         Récupération du projet à une ligne donnée
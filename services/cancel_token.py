@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Jeton d'annulation coopératif pour les traitements longs (scan, analyses)
+"""
+
+
+class CancelToken:
+    """
+    Jeton d'annulation partagé entre le thread de l'interface et un worker.
+    
+    Le worker consulte régulièrement l'attribut cancelled (une simple lecture,
+    sans verrou ni appel système) et s'interrompt dès qu'il passe à True.
+    """
+    
+    def __init__(self):
+        """Initialisation du jeton (non annulé)"""
+        self.cancelled = False
+    
+    def cancel(self):
+        """Demande d'interruption du traitement"""
+        self.cancelled = True
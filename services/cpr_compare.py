@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Comparaison des versions d'un projet Cubase (fichiers .cpr et .bak)
+
+Pour chaque version sont extraits les plugins (détection VSTi de trouve_vsti
+et attributs "Plugin Name" de l'archive), les classes de pistes et la taille
+des blocs du fichier. L'extraction structurelle est conservée par fichier
+dans ~/.trie_morceaux/cpr_compare.json ; la détection VSTi passe par le cache
+des analyses (services/vsti_cache.py).
+"""
+
+import os
+import itertools
+import mmap
+import time
+from datetime import datetime
+
+from config.constants import DEFAULT_CPR_COMPARE_CACHE_FILE
+from services.cpr_parser import read_structure
+from services.json_store import JsonStore
+from services.scan_index import RECENT_DELAY
+from services.vsti_cache import vsti_cache
+from services.vsti_inventory import plugin_key
+
+# Version du format du cache
+CACHE_VERSION = 1
+
+
+def _read_file_structure(path):
+    """
+    Structure d'un fichier, réduite à ce qui sert à la comparaison
+
+    Returns:
+        dict: {'plugin_records', 'track_classes', 'chunks'} ; valeurs None
+            si le format n'est pas reconnu
+    """
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = b""
+        try:
+            structure = read_structure(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    if structure is None:
+        return {'plugin_records': None, 'track_classes': None, 'chunks': None}
+    chunks = {}
+    for chunk_id, start, end in structure['chunks']:
+        chunks[chunk_id] = chunks.get(chunk_id, 0) + end - start
+    return {
+        'plugin_records': structure['plugin_records'],
+        'track_classes': structure['track_classes'],
+        'chunks': chunks
+    }
+
+
+class CprCompareCache(JsonStore):
+    """
+    Structures extraites des fichiers .cpr, stockées dans
+    ~/.trie_morceaux/cpr_compare.json
+
+    Une entrée est indexée par le chemin du fichier et reste valide tant que
+    sa taille et sa date de modification n'ont pas changé.
+    """
+
+    VERSION = CACHE_VERSION
+    PAYLOAD_KEY = 'files'
+    DEFAULT_FILE = DEFAULT_CPR_COMPARE_CACHE_FILE
+    LABEL = "du cache de comparaison"
+
+    def structure(self, path, stat=None):
+        """
+        Structure d'un fichier, depuis le cache s'il n'a pas changé
+
+        Args:
+            path (str): Chemin du fichier
+            stat (os.stat_result): État du fichier (relu si absent)
+
+        Returns:
+            dict: Voir _read_file_structure
+        """
+        self.load()
+        if stat is None:
+            stat = os.stat(path)
+        with self._lock:
+            entry = self.entries.get(str(path))
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            return entry['structure']
+
+        structure = _read_file_structure(path)
+        with self._lock:
+            # Fichier en cours d'enregistrement par Cubase : il sera relu
+            if time.time() - stat.st_mtime_ns / 1e9 >= RECENT_DELAY:
+                self.entries[str(path)] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'structure': structure}
+                self._dirty = True
+        return structure
+
+
+def extract_version(path, compare_cache=None, progress_callback=None):
+    """
+    Extraction des éléments comparables d'une version
+
+    Args:
+        path (str): Chemin du fichier .cpr ou .bak
+        compare_cache (CprCompareCache): Cache des structures (instance globale par défaut)
+        progress_callback (callable): Voir trouve_vsti
+
+    Returns:
+        dict: {'path', 'size', 'modified' (datetime), 'plugins' {plugin: instances},
+            'tracks' {classe: nombre} ou None, 'chunks' {bloc: taille} ou None,
+            'interrupted'}
+    """
+    if compare_cache is None:
+        compare_cache = cpr_compare_cache
+    stat = os.stat(path)
+    detected, interrupted = vsti_cache.analyse(path, progress_callback)
+    structure = compare_cache.structure(path, stat)
+
+    # Instances détectées ("Serum 01", "Serum 02") et attributs de l'archive
+    # (un par insert ou instrument, plugins inconnus de la liste compris)
+    plugins = {}
+    for name in detected:
+        key = plugin_key(name)
+        plugins[key] = plugins.get(key, 0) + 1
+    for name, count in (structure['plugin_records'] or {}).items():
+        key = plugin_key(name)
+        plugins[key] = max(plugins.get(key, 0), count)
+
+    return {
+        'path': str(path),
+        'size': stat.st_size,
+        'modified': datetime.fromtimestamp(stat.st_mtime),
+        'plugins': plugins,
+        'tracks': structure['track_classes'],
+        'chunks': structure['chunks'],
+        'interrupted': interrupted
+    }
+
+
+def _rows(versions, field):
+    """Élément -> valeurs par version (0 si absent), éléments triés"""
+    names = set()
+    for version in versions:
+        names.update(version[field] or {})
+    return {name: [(version[field] or {}).get(name, 0) for version in versions]
+            for name in sorted(names, key=str.lower)}
+
+
+def compare_versions(versions):
+    """
+    Comparaison de plusieurs versions, de la plus ancienne à la plus récente
+
+    Args:
+        versions (list): Versions extraites par extract_version
+
+    Returns:
+        dict: {
+            'versions': versions triées par date,
+            'plugins': {plugin: [instances par version]},
+            'tracks': {classe de piste: [nombre par version]},
+            'chunks': {bloc: [taille par version]},
+            'changes': [{'from': i, 'to': j, 'added': [...], 'removed': [...],
+                         'changed': [(plugin, avant, après)]}] entre versions successives
+        }
+    """
+    versions = sorted(versions, key=lambda version: version['modified'])
+    plugins = _rows(versions, 'plugins')
+    changes = []
+    for index in range(1, len(versions)):
+        added, removed, changed = [], [], []
+        for name, counts in plugins.items():
+            before, after = counts[index - 1], counts[index]
+            if before == after:
+                continue
+            if not before:
+                added.append(name)
+            elif not after:
+                removed.append(name)
+            else:
+                changed.append((name, before, after))
+        changes.append({'from': index - 1, 'to': index, 'added': added, 'removed': removed, 'changed': changed})
+    return {
+        'versions': versions,
+        'plugins': plugins,
+        'tracks': _rows(versions, 'tracks'),
+        'chunks': _rows(versions, 'chunks'),
+        'changes': changes
+    }
+
+
+def project_version_paths(project_details):
+    """
+    Versions d'un projet scanné : tous ses fichiers .cpr et .bak
+
+    Args:
+        project_details (dict): Détails du projet (CubaseScanner.get_project_details)
+
+    Returns:
+        list: Chemins des fichiers
+    """
+    return [file_info['path'] for file_info in itertools.chain(project_details['cpr_files'],
+                                                               project_details['bak_files'])]
+
+
+def compare_files(paths, progress_callback=None, cancel_token=None, compare_cache=None):
+    """
+    Extraction puis comparaison de plusieurs fichiers
+
+    Args:
+        paths (list): Fichiers .cpr/.bak à comparer
+        progress_callback (callable): Fonction appelée avec le pourcentage global,
+            pondéré par la taille des fichiers
+        cancel_token (CancelToken): Jeton d'annulation (facultatif)
+        compare_cache (CprCompareCache): Cache des structures (instance globale par défaut)
+
+    Returns:
+        dict: Résultat de compare_versions (versions lues avant l'annulation),
+            complété de 'errors' {chemin: message}
+    """
+    if compare_cache is None:
+        compare_cache = cpr_compare_cache
+    versions = []
+    errors = {}
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(0)
+    all_bytes = sum(sizes) or 1
+    bytes_before = 0
+    for path, size in zip(paths, sizes):
+        if cancel_token is not None and cancel_token.cancelled:
+            break
+
+        def file_progress(done, total):
+            if cancel_token is not None and cancel_token.cancelled:
+                return False
+            if progress_callback and total:
+                progress_callback(int((bytes_before + size * done / total) * 100 / all_bytes))
+            return None
+
+        try:
+            version = extract_version(path, compare_cache, file_progress)
+        except Exception as e:
+            print(f"Erreur lors de l'extraction de {path}: {e}")
+            errors[str(path)] = str(e)
+        else:
+            if not version['interrupted']:
+                versions.append(version)
+        bytes_before += size
+        if progress_callback:
+            progress_callback(int(bytes_before * 100 / all_bytes))
+    compare_cache.save()
+    result = compare_versions(versions)
+    result['errors'] = errors
+    return result
+
+
+# Instance globale du cache de comparaison
+cpr_compare_cache = CprCompareCache()
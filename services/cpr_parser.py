@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lecture structurelle des fichiers de projet Cubase (.cpr)
+
+Un .cpr est un conteneur de type RIFF (tailles en big-endian) :
+
+    "RIFF" <taille> "NUND"
+        "ROOT" <taille> <table des objets racine>
+        "ARCH" <taille> <archive sérialisée des objets du projet>
+        ...
+
+Les chaînes de l'archive sont précédées de leur longueur (uint32 big-endian,
+zéro final compris). Les plugins (inserts et instruments VST) y sont décrits
+par un attribut "Plugin Name" suivi de la chaîne du nom.
+
+Ce module ne lève pas d'exception sur un fichier inconnu : parse_cpr renvoie
+None et l'appelant se rabat sur la recherche brute dans les octets.
+"""
+
+import re
+import struct
+
+# En-tête du conteneur et de chaque bloc
+RIFF_MAGIC = b'RIFF'
+CUBASE_FORM = b'NUND'
+CHUNK_HEADER = struct.Struct('>4sI')
+UINT32 = struct.Struct('>I')
+
+# Blocs contenant les descriptions des plugins
+PLUGIN_CHUNKS = (b'ARCH',)
+
+# Identifiant de bloc valide : quatre caractères ASCII alphanumériques ou espaces
+CHUNK_ID_PATTERN = re.compile(rb'[A-Za-z0-9 ]{4}\Z')
+
+# Attribut portant le nom d'un plugin (chaîne terminée par un zéro)
+PLUGIN_NAME_KEY = b'Plugin Name\x00'
+PLUGIN_NAME_PATTERN = re.compile(re.escape(PLUGIN_NAME_KEY))
+
+# Longueurs admises pour le préfixe de l'attribut (avec ou sans le zéro final)
+PLUGIN_NAME_KEY_PREFIXES = (UINT32.pack(len(PLUGIN_NAME_KEY)), UINT32.pack(len(PLUGIN_NAME_KEY) - 1))
+
+# Distance maximale entre l'attribut et la longueur de sa valeur (marqueurs de type)
+VALUE_SEARCH_SPAN = 16
+
+# Longueur maximale d'un nom de plugin
+MAX_NAME_LENGTH = 256
+
+# Taille des fenêtres parcourues entre deux contrôles de la progression
+RECORD_WINDOW = 1024 * 1024
+
+# Classes sérialisées des pistes ("MAudioTrackEvent"...), précédées de leur
+# longueur comme les autres chaînes de l'archive
+TRACK_CLASS_PATTERN = re.compile(rb'M[A-Za-z]+TrackEvent\x00')
+
+
+def iter_chunks(data, start, end):
+    """
+    Parcours des blocs d'un conteneur
+
+    Le parcours s'arrête au premier en-tête invalide (identifiant non ASCII ou
+    taille dépassant le conteneur) ; un octet de bourrage après un bloc de
+    taille impaire est toléré, comme en RIFF.
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        start (int): Position du premier en-tête de bloc
+        end (int): Fin du conteneur
+
+    Yields:
+        tuple: (identifiant, début des données, fin des données)
+    """
+    offset = start
+    while offset + CHUNK_HEADER.size <= end:
+        chunk_id, size = CHUNK_HEADER.unpack_from(data, offset)
+        if not CHUNK_ID_PATTERN.match(chunk_id):
+            return
+        data_start = offset + CHUNK_HEADER.size
+        data_end = data_start + size
+        if data_end > end:
+            return
+        yield chunk_id, data_start, data_end
+
+        offset = data_end
+        if size % 2 and offset < end and not CHUNK_ID_PATTERN.match(bytes(data[offset:offset + 4])):
+            offset += 1
+
+
+def read_plugin_names(data, sections, progress=None):
+    """
+    Noms des plugins décrits dans les sections de l'archive
+
+    Seuls les attributs "Plugin Name" précédés de leur longueur sont retenus :
+    le texte libre (noms de pistes, notes) qui contiendrait ces mots est ignoré.
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        sections (list): Sections à parcourir [(début, fin)]
+        progress (callable): Voir iter_plugin_records
+
+    Returns:
+        list: Noms des plugins, dans l'ordre du fichier et sans doublon, ou
+            None si le parcours a été interrompu
+    """
+    interrupted = False
+
+    def check(done):
+        nonlocal interrupted
+        if progress(done) is False:
+            interrupted = True
+            return False
+        return True
+
+    names = list(dict.fromkeys(iter_plugin_records(data, sections, check if progress else None)))
+    return None if interrupted else names
+
+
+def iter_plugin_records(data, sections, progress=None):
+    """
+    Parcours des attributs "Plugin Name" de l'archive (un par insert ou
+    instrument, un même plugin pouvant apparaître plusieurs fois)
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        sections (list): Sections à parcourir [(début, fin)]
+        progress (callable): Fonction appelée avant chaque fenêtre de
+            RECORD_WINDOW octets avec le nombre d'octets parcourus ; un retour
+            False arrête le parcours
+
+    Yields:
+        str: Nom du plugin de chaque attribut
+    """
+    done = 0
+    for section_start, section_end in sections:
+        for window_start in range(section_start, section_end, RECORD_WINDOW):
+            if progress is not None and progress(done) is False:
+                return
+            window_end = min(section_end, window_start + RECORD_WINDOW)
+            done += window_end - window_start
+            # Marge pour un attribut commencé en fin de fenêtre
+            endpos = min(section_end, window_end + len(PLUGIN_NAME_KEY) - 1)
+            for match in PLUGIN_NAME_PATTERN.finditer(data, window_start, endpos):
+                key_start = match.start()
+                if key_start >= window_end:
+                    break
+                if key_start < 4 or bytes(data[key_start - 4:key_start]) not in PLUGIN_NAME_KEY_PREFIXES:
+                    continue
+                name = _read_string_after(data, match.end(), section_end)
+                if name:
+                    yield name
+
+
+def count_track_classes(data, sections):
+    """
+    Classes de pistes sérialisées dans l'archive
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        sections (list): Sections à parcourir [(début, fin)]
+
+    Returns:
+        dict: Classe ("MAudioTrackEvent") -> nombre d'occurrences
+    """
+    counts = {}
+    for section_start, section_end in sections:
+        for match in TRACK_CLASS_PATTERN.finditer(data, section_start, section_end):
+            start, end = match.span()
+            # Chaîne préfixée par sa longueur (zéro final compris)
+            if start < 4 or UINT32.unpack_from(data, start - 4)[0] != end - start:
+                continue
+            name = match.group()[:-1].decode('ascii')
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def _read_string_after(data, offset, end):
+    """
+    Lecture de la première chaîne préfixée par sa longueur après une position
+
+    Args:
+        data (bytes): Contenu du fichier
+        offset (int): Position de fin de l'attribut
+        end (int): Fin de la section
+
+    Returns:
+        str: Chaîne lue, ou None si aucune chaîne plausible n'est trouvée
+    """
+    for position in range(offset, min(offset + VALUE_SEARCH_SPAN, end - UINT32.size)):
+        length = UINT32.unpack_from(data, position)[0]
+        value_start = position + UINT32.size
+        value_end = value_start + length
+        if length < 2 or length > MAX_NAME_LENGTH or value_end > end:
+            continue
+        raw = bytes(data[value_start:value_end])
+        if raw[-1] != 0:
+            continue
+        try:
+            text = raw[:-1].decode('utf-8')
+        except UnicodeDecodeError:
+            continue
+        if text.strip() and text.isprintable():
+            return text.strip()
+    return None
+
+
+def read_structure(data):
+    """
+    Structure détaillée d'un fichier .cpr (comparaison de versions)
+
+    Plus coûteuse que parse_cpr : les sections des plugins sont relues pour
+    compter les attributs de plugins et les classes de pistes.
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+
+    Returns:
+        dict: Résultat de parse_cpr, complété de 'plugin_records'
+            {nom: nombre d'attributs} et 'track_classes' {classe: nombre},
+            ou None si le fichier n'a pas la structure attendue
+    """
+    structure = parse_cpr(data, read_names=False)
+    if structure is None:
+        return None
+    records = {}
+    for name in iter_plugin_records(data, structure['plugin_sections']):
+        records[name] = records.get(name, 0) + 1
+    structure['plugin_records'] = records
+    structure['track_classes'] = count_track_classes(data, structure['plugin_sections'])
+    return structure
+
+
+def parse_cpr(data, read_names=True):
+    """
+    Analyse de la structure d'un fichier .cpr
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        read_names (bool): Lecture des noms des plugins ; sans elle, seuls les
+            en-têtes des blocs sont lus (voir read_plugin_names pour une
+            lecture avec suivi de la progression)
+
+    Returns:
+        dict: {'form': str, 'chunks': [(identifiant, début, fin)],
+            'plugin_sections': [(début, fin)], 'plugin_names': [str] ou None},
+            ou None si le fichier n'a pas la structure attendue
+    """
+    if len(data) < 12 or bytes(data[0:4]) != RIFF_MAGIC:
+        return None
+    form = bytes(data[8:12])
+    if form != CUBASE_FORM:
+        return None
+
+    # Un fichier tronqué garde ses blocs complets
+    end = min(len(data), 8 + UINT32.unpack_from(data, 4)[0])
+    chunks = [(chunk_id.decode('ascii'), start, stop) for chunk_id, start, stop in iter_chunks(data, 12, end)]
+    plugin_sections = [(start, stop) for chunk_id, start, stop in chunks
+                       if chunk_id.encode('ascii') in PLUGIN_CHUNKS]
+    if not plugin_sections:
+        return None
+
+    return {
+        'form': form.decode('ascii'),
+        'chunks': chunks,
+        'plugin_sections': plugin_sections,
+        'plugin_names': read_plugin_names(data, plugin_sections) if read_names else None
+    }
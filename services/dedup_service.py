@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Détection des fichiers en double (contenu identique) entre les sources scannées
+"""
+
+import os
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from config.constants import DEFAULT_DEDUP_CACHE_FILE
+from services.json_store import JsonStore
+
+# Version du format du cache d'empreintes
+CACHE_VERSION = 1
+
+# Taille lue en début et en fin de fichier pour l'empreinte partielle
+PARTIAL_SIZE = 64 * 1024
+
+# Taille des blocs lus pour l'empreinte complète
+CHUNK_SIZE = 1024 * 1024
+
+
+def _several_sources(group):
+    """Un groupe de fichiers [(chemin, taille, mtime, source)] couvre-t-il plusieurs sources ?"""
+    return len({source for _, _, _, source in group}) > 1
+
+
+class DedupService(JsonStore):
+    """
+    Recherche des fichiers au contenu identique
+
+    Seuls les fichiers identiques à un fichier d'une autre source sont des
+    doublons : les copies à l'intérieur d'une même source sont conservées.
+
+    La recherche procède en trois étapes, chacune ne portant que sur les
+    candidats restants de la précédente :
+    1. regroupement par taille, limité aux groupes présents dans plusieurs
+       sources (aucune lecture) ;
+    2. empreinte partielle sur le début et la fin du fichier ;
+    3. empreinte complète, calculée sur un pool de threads.
+
+    Les empreintes sont conservées dans ~/.trie_morceaux/dedup_cache.json,
+    indexées par chemin et valides tant que la taille et la date de
+    modification du fichier n'ont pas changé. Les fichiers disparus en sont
+    retirés à l'enregistrement.
+    """
+
+    VERSION = CACHE_VERSION
+    PAYLOAD_KEY = 'files'
+    DEFAULT_FILE = DEFAULT_DEDUP_CACHE_FILE
+    LABEL = "du cache des doublons"
+
+    def save(self):
+        """Sauvegarde du cache s'il a été modifié, sans les fichiers disparus"""
+        with self._lock:
+            if self._dirty:
+                for path in [path for path in self.entries if not os.path.exists(path)]:
+                    del self.entries[path]
+            super().save()
+
+    def find_duplicates(self, files, progress_callback=None, cancel_token=None, max_workers=4):
+        """
+        Recherche des doublons parmi une liste de fichiers
+
+        Args:
+            files (list): Fichiers [(chemin, taille, mtime, source)] ; en cas de
+                doublon, le premier fichier de la liste est considéré comme
+                l'original
+            progress_callback (callable): Fonction appelée avec le pourcentage
+                d'avancement (0-100)
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+            max_workers (int): Nombre de threads pour les empreintes complètes
+
+        Returns:
+            dict: Pour chaque doublon, chemin du doublon -> chemin de l'original,
+                pris dans une autre source (vide si la recherche a été annulée)
+        """
+        self.load()
+
+        # Étape 1 : seuls les fichiers de même taille peuvent être identiques,
+        # et un groupe entièrement dans une source ne contient aucun doublon.
+        # Les fichiers vides sont ignorés, leur copie ne coûte rien.
+        by_size = defaultdict(list)
+        for path, size, mtime, source in files:
+            if size > 0:
+                by_size[size].append((path, size, mtime, source))
+        candidates = [group for group in by_size.values() if _several_sources(group)]
+
+        total = sum(len(group) for group in candidates)
+        done = 0
+
+        def report(count):
+            nonlocal done
+            done += count
+            if progress_callback and total:
+                progress_callback(int(done * 100 / total))
+
+        # Étape 2 : empreinte partielle (début et fin du fichier)
+        full_candidates = []
+        digest_of = {}
+        for group in candidates:
+            by_partial = defaultdict(list)
+            for path, size, mtime, source in group:
+                if cancel_token is not None and cancel_token.cancelled:
+                    self.save()
+                    return {}
+                digest = self._digest(path, size, mtime, 'partial')
+                if digest is not None:
+                    by_partial[digest].append((path, size, mtime, source))
+            for digest, same in by_partial.items():
+                if not _several_sources(same):
+                    report(len(same))
+                elif same[0][1] <= 2 * PARTIAL_SIZE:
+                    # Fichier entièrement lu par l'empreinte partielle
+                    for path, _, _, _ in same:
+                        digest_of[path] = digest
+                    report(len(same))
+                else:
+                    full_candidates.extend(same)
+
+        # Étape 3 : empreinte complète, en parallèle
+        if full_candidates:
+            def full_digest(entry):
+                path, size, mtime, _ = entry
+                if cancel_token is not None and cancel_token.cancelled:
+                    return path, None
+                return path, self._digest(path, size, mtime, 'full')
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for path, digest in executor.map(full_digest, full_candidates):
+                    if digest is not None:
+                        digest_of[path] = digest
+                    report(1)
+
+        self.save()
+        if cancel_token is not None and cancel_token.cancelled:
+            return {}
+
+        # Association de chaque doublon au premier fichier de même contenu,
+        # s'il appartient à une autre source
+        originals = {}
+        duplicates = {}
+        for path, size, _, source in files:
+            digest = digest_of.get(path)
+            if digest is None:
+                continue
+            original, original_source = originals.setdefault((size, digest), (path, source))
+            if original_source != source:
+                duplicates[path] = original
+
+        if progress_callback:
+            progress_callback(100)
+        return duplicates
+
+    def _digest(self, path, size, mtime, kind):
+        """
+        Empreinte d'un fichier, depuis le cache si le fichier n'a pas changé
+
+        Args:
+            path (str): Chemin du fichier
+            size (int): Taille du fichier
+            mtime (float): Date de modification du fichier
+            kind (str): 'partial' ou 'full'
+
+        Returns:
+            str: Empreinte hexadécimale, ou None si le fichier est illisible
+        """
+        with self._lock:
+            entry = self.entries.get(path)
+            if entry is None or entry['size'] != size or entry['mtime'] != mtime:
+                entry = {'size': size, 'mtime': mtime}
+                self.entries[path] = entry
+            elif kind in entry:
+                return entry[kind]
+
+        try:
+            if kind == 'partial':
+                digest = self._partial_digest(path, size)
+            else:
+                digest = self._full_digest(path)
+        except OSError as e:
+            print(f"Erreur lors de la lecture de {path}: {e}")
+            return None
+
+        with self._lock:
+            entry[kind] = digest
+            self._dirty = True
+        return digest
+
+    @staticmethod
+    def _partial_digest(path, size):
+        """Empreinte du début et de la fin d'un fichier"""
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            hasher.update(f.read(PARTIAL_SIZE))
+            if size > PARTIAL_SIZE:
+                f.seek(max(PARTIAL_SIZE, size - PARTIAL_SIZE))
+                hasher.update(f.read(PARTIAL_SIZE))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _full_digest(path):
+        """Empreinte du contenu complet d'un fichier"""
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+# Instance globale du service de détection des doublons
+dedup_service = DedupService()
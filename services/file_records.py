@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stockage compact des fichiers trouvés par le scanner
+"""
+
+import os
+from array import array
+from datetime import datetime
+
+
+class FileRecord:
+    """
+    Vue sur un fichier d'une FileList
+
+    Les dates sont conservées en timestamps et ne sont converties en datetime
+    qu'à la lecture des clés 'modified' et 'created'. L'accès par clé
+    (record['path'], record.get('source')) reste compatible avec les anciens
+    dictionnaires de fichiers.
+    """
+    __slots__ = ('directory', 'name', 'size', 'mtime', 'ctime', 'source')
+
+    KEYS = ('path', 'size', 'modified', 'created', 'source')
+
+    def __init__(self, directory, name, size, mtime, ctime, source):
+        self.directory = directory
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.ctime = ctime
+        self.source = source
+
+    @property
+    def path(self):
+        """Chemin complet du fichier"""
+        return os.path.join(self.directory, self.name)
+
+    @property
+    def modified(self):
+        """Date de modification (datetime)"""
+        return datetime.fromtimestamp(self.mtime)
+
+    @property
+    def created(self):
+        """Date de création (datetime)"""
+        return datetime.fromtimestamp(self.ctime)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        """Accès par clé, comme dict.get"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if not isinstance(other, FileRecord):
+            return NotImplemented
+        return (self.path, self.size, self.mtime, self.ctime, self.source) == \
+            (other.path, other.size, other.mtime, other.ctime, other.source)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"FileRecord({self.path!r}, size={self.size})"
+
+
+class FileList:
+    """
+    Liste de fichiers stockée par colonnes
+
+    Tailles et dates sont rangées dans des array (8 octets par valeur), les
+    chaînes de dossier et de source sont partagées entre les fichiers d'un
+    même dossier. Les FileRecord ne sont créés qu'à la lecture, la liste
+    s'utilise comme une liste de fichiers (len, index, itération).
+
+    La taille cumulée et le fichier le plus récent sont tenus à jour à chaque
+    ajout, leur lecture ne parcourt pas la liste.
+    """
+    __slots__ = ('directories', 'names', 'sizes', 'mtimes', 'ctimes', 'sources',
+                 '_total_size', '_latest_index')
+
+    def __init__(self):
+        self.directories = []
+        self.names = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.ctimes = array('d')
+        self.sources = []
+        self._total_size = 0
+        self._latest_index = -1
+
+    def append(self, directory, name, size, mtime, ctime, source):
+        """
+        Ajout d'un fichier
+
+        Args:
+            directory (str): Dossier du fichier (chaîne partagée)
+            name (str): Nom du fichier
+            size (int): Taille en octets
+            mtime (float): Date de modification (timestamp)
+            ctime (float): Date de création (timestamp)
+            source (str): Dossier racine du scan (chaîne partagée)
+        """
+        # Comme max(), le premier fichier rencontré l'emporte en cas d'égalité
+        if self._latest_index < 0 or mtime > self.mtimes[self._latest_index]:
+            self._latest_index = len(self.names)
+        self._total_size += size
+        self.directories.append(directory)
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.ctimes.append(ctime)
+        self.sources.append(source)
+
+    def extend(self, other):
+        """
+        Ajout des fichiers d'une autre FileList
+
+        Args:
+            other (FileList): Fichiers à ajouter
+        """
+        if other._latest_index >= 0 and (
+                self._latest_index < 0
+                or other.mtimes[other._latest_index] > self.mtimes[self._latest_index]):
+            self._latest_index = len(self.names) + other._latest_index
+        self._total_size += other._total_size
+        self.directories.extend(other.directories)
+        self.names.extend(other.names)
+        self.sizes.extend(other.sizes)
+        self.mtimes.extend(other.mtimes)
+        self.ctimes.extend(other.ctimes)
+        self.sources.extend(other.sources)
+
+    def remove_directory(self, directory):
+        """
+        Suppression des fichiers d'un dossier
+
+        Args:
+            directory (str): Dossier dont les fichiers sont retirés
+
+        Returns:
+            int: Nombre de fichiers retirés
+        """
+        kept = [i for i, d in enumerate(self.directories) if d != directory]
+        removed = len(self.names) - len(kept)
+        if not removed:
+            return 0
+        columns = (self.directories, self.names, self.sizes, self.mtimes, self.ctimes, self.sources)
+        self.__init__()
+        for i in kept:
+            self.append(*(column[i] for column in columns))
+        return removed
+
+    def latest(self):
+        """
+        Fichier le plus récemment modifié
+
+        Returns:
+            FileRecord: Le fichier, ou None si la liste est vide
+        """
+        if self._latest_index < 0:
+            return None
+        return self[self._latest_index]
+
+    def total_size(self):
+        """Taille cumulée des fichiers en octets"""
+        return self._total_size
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.names)))]
+        return FileRecord(self.directories[index], self.names[index], self.sizes[index],
+                          self.mtimes[index], self.ctimes[index], self.sources[index])
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"FileList({len(self.names)} fichiers)"
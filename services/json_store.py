@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fichiers JSON versionnés de ~/.trie_morceaux (caches et index persistants)
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+from config.constants import DEFAULT_PREFS_DIR
+
+
+class JsonStore:
+    """
+    Entrées persistantes dans un fichier JSON {'version': ..., <clé>: {...}}
+
+    Le fichier est chargé une seule fois, à la première utilisation, et
+    n'est réécrit que s'il a été modifié, par remplacement atomique (fichier
+    temporaire puis os.replace). Un fichier d'une autre version du format ou
+    illisible est ignoré : le cache repart vide.
+
+    Les sous-classes définissent VERSION, PAYLOAD_KEY, DEFAULT_FILE et LABEL,
+    et protègent leurs accès à entries par _lock.
+    """
+
+    # Version du format du fichier
+    VERSION = 1
+    # Clé des entrées dans le fichier
+    PAYLOAD_KEY = 'files'
+    # Nom du fichier dans DEFAULT_PREFS_DIR
+    DEFAULT_FILE = None
+    # Désignation du fichier dans les messages d'erreur ("du cache VSTi")
+    LABEL = "du cache"
+
+    def __init__(self, cache_file=None):
+        """
+        Initialisation (le fichier est lu par load)
+
+        Args:
+            cache_file (str): Chemin du fichier (DEFAULT_FILE dans
+                DEFAULT_PREFS_DIR par défaut)
+        """
+        if cache_file is None:
+            cache_file = Path(os.path.expanduser(DEFAULT_PREFS_DIR)) / self.DEFAULT_FILE
+        self.cache_file = Path(cache_file)
+        self.entries = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def load(self):
+        """Chargement des entrées depuis le disque (une seule fois)"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.cache_file.exists():
+                return
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self.entries = data.get(self.PAYLOAD_KEY, {})
+            except Exception as e:
+                print(f"Erreur lors du chargement {self.LABEL}: {e}")
+                self.entries = {}
+
+    def save(self):
+        """Sauvegarde des entrées si elles ont été modifiées"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix('.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({'version': self.VERSION, self.PAYLOAD_KEY: self.entries},
+                              f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_file, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde {self.LABEL}: {e}")
+
+    def clear(self):
+        """Vidage complet"""
+        with self._lock:
+            self.entries = {}
+            self._loaded = True
+            self._dirty = True
+            self.save()
@@ -1,85 +1,350 @@
 import re
 import os
-from services.vsti_manager import load_vsti_list
+import mmap
+import time
+from services.vsti_manager import vsti_catalogue
+from services.cpr_parser import parse_cpr, read_plugin_names
+
+# Taille des fenêtres balayées entre deux contrôles de la progression
+SCAN_WINDOW = 1024 * 1024
+
+# Intervalle minimal entre deux appels de progress_callback (20 Hz)
+PROGRESS_INTERVAL = 0.05
+
+# Suffixe des instances numérotées ("Serum 01", "Kick 2 01"...)
+NUMBERED_SUFFIX = re.compile(rb'\s+\d{2}')
+
+# Entrées de type "Plugin Name..."
+PLUGIN_NAME_PATTERN = re.compile(rb'Plugin\s+Nam[^\n\r]{2,40}')
+
+# Longueur maximale d'une entrée "Plugin Name..." (marge entre deux fenêtres)
+PLUGIN_NAME_SPAN = 128
+
+# Caractères de mot au sens de \w pour une expression régulière sur des octets
+WORD_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+
+
+class ProgressThrottle:
+    """
+    Progression en octets traités, transmise à progress_callback au plus une
+    fois par PROGRESS_INTERVAL
+
+    Le balayage peut signaler son avancement aussi souvent qu'il le veut : la
+    fonction de rappel (souvent l'émission d'un signal Qt vers un autre thread)
+    n'est appelée qu'à fréquence fixe, et toujours à la fin.
+    """
+
+    def __init__(self, progress_callback, total, interval=PROGRESS_INTERVAL):
+        """
+        Initialisation
+
+        Args:
+            progress_callback (callable): Fonction appelée avec (octets traités,
+                octets à traiter) ; un retour False interrompt le traitement
+            total (int): Nombre d'octets à traiter
+            interval (float): Intervalle minimal entre deux appels, en secondes
+        """
+        self.progress_callback = progress_callback
+        self.total = total
+        self.interval = interval
+        self._last = None
+
+    def update(self, done, force=False):
+        """
+        Avancement du traitement
+
+        Args:
+            done (int): Octets traités
+            force (bool): Appel de progress_callback quel que soit l'intervalle
+
+        Returns:
+            bool: False si progress_callback demande l'interruption
+        """
+        if not self.progress_callback:
+            return True
+        now = time.monotonic()
+        if not force and self._last is not None and now - self._last < self.interval:
+            return True
+        self._last = now
+        return self.progress_callback(done, self.total) is not False
+
+
+def _trie_regex(words):
+    """
+    Expression régulière reconnaissant une liste de mots, factorisée en arbre
+
+    À une position donnée, l'expression retient le mot le plus long : le moteur
+    ne teste qu'un seul caractère par niveau au lieu de chaque alternative.
+
+    Args:
+        words (list): Mots (bytes) non vides
+
+    Returns:
+        bytes: Expression régulière
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[None] = {}
+
+    def build(node):
+        branches = [re.escape(bytes([byte])) + build(child)
+                    for byte, child in sorted((k, v) for k, v in node.items() if k is not None)]
+        if not branches:
+            return b''
+        if len(branches) == 1 and None not in node:
+            return branches[0]
+        return b'(?:' + b'|'.join(branches) + b')' + (b'?' if None in node else b'')
+
+    return build(trie)
+
+
+class VstiMatcher:
+    """
+    Recherche simultanée de tous les VSTi connus dans le contenu d'un CPR
+
+    Un seul balayage des données remplace les deux recherches par VSTi : les
+    noms sont compilés une fois dans une expression en arbre, et chaque
+    occurrence est ensuite qualifiée (numérotée, isolée) sans relire le fichier.
+    Les occurrences qui se chevauchent ("FabFilter Pro-Q" et "Pro-Q") sont
+    toutes retrouvées, comme avec une recherche par nom.
+    """
+
+    def __init__(self, names):
+        """
+        Construction de l'automate
+
+        Args:
+            names (list): Noms des VSTi connus
+        """
+        self.names = tuple(dict.fromkeys(name for name in names if name))
+        encoded = {name.encode('utf-8'): name for name in self.names}
+        self._names_by_bytes = encoded
+        self._max_length = max((len(word) for word in encoded), default=0)
+
+        # Pour chaque nom, les noms qui en sont un préfixe (lui compris) :
+        # ce sont exactement les noms présents à la position d'une occurrence
+        self._prefixes = {
+            word: [other for other in encoded if word.startswith(other)]
+            for word in encoded
+        }
+
+        if encoded:
+            trie = _trie_regex(list(encoded))
+            self._pattern = re.compile(trie)
+            self._longest_at = re.compile(b'(?=(' + trie + b'))')
+        else:
+            self._pattern = self._longest_at = None
+
+    def occurrences(self, data, progress_callback=None, sections=None):
+        """
+        Positions de toutes les occurrences des noms connus
+
+        Args:
+            data (bytes): Contenu du fichier (tout objet compatible, mmap compris)
+            progress_callback (callable): Fonction appelée avec (octets balayés,
+                octets à balayer), au plus une fois par PROGRESS_INTERVAL ; un
+                retour False interrompt la recherche
+            sections (list): Sections à parcourir [(début, fin)] (tout le
+                fichier par défaut)
+
+        Returns:
+            dict: nom -> liste triée de (début, fin), ou None si interrompu
+        """
+        found = set()
+        if sections is None:
+            sections = [(0, len(data))]
+        total = sum(end - start for start, end in sections)
+        progress = ProgressThrottle(progress_callback, total)
+        done = 0
+        if self._pattern is not None:
+            for section_start, section_end in sections:
+                for window_start in range(section_start, section_end, SCAN_WINDOW):
+                    if not progress.update(done):
+                        return None
+                    window_end = min(section_end, window_start + SCAN_WINDOW)
+                    done += window_end - window_start
+                    # Marge pour les occurrences commencées en fin de fenêtre
+                    endpos = min(section_end, window_end + self._max_length - 1)
+                    for match in self._pattern.finditer(data, window_start, endpos):
+                        start, end = match.span()
+                        if start >= window_end:
+                            break
+                        self._add(found, start, match.group())
+                        # Occurrences masquées par celle-ci (commençant à l'intérieur)
+                        inner_end = min(section_end, end + self._max_length - 1)
+                        for inner in self._longest_at.finditer(data, start + 1, inner_end):
+                            if inner.start() >= end:
+                                break
+                            self._add(found, inner.start(), inner.group(1))
+        if not progress.update(total, force=True):
+            return None
+
+        occurrences = {}
+        for start, word in sorted(found):
+            occurrences.setdefault(self._names_by_bytes[word], []).append((start, start + len(word)))
+        return occurrences
+
+    def _add(self, found, start, word):
+        """Ajout d'une occurrence et de celles des noms qui en sont un préfixe"""
+        for prefix in self._prefixes[word]:
+            found.add((start, prefix))
+
+
+def _is_bounded(data, start, end):
+    """Occurrence qui n'est pas au milieu d'un mot"""
+    return ((start == 0 or data[start - 1] not in WORD_BYTES)
+            and (end >= len(data) or data[end] not in WORD_BYTES))
+
 
 def trouve_vsti(fichier, progress_callback=None):
     print(f"Analyse de : {os.path.basename(fichier)}")
-    
+
+    # Le fichier est projeté en mémoire plutôt que lu : les gabarits
+    # orchestraux de plusieurs centaines de Mo ne sont pas chargés d'un bloc
     with open(fichier, "rb") as f:
-        data = f.read()
-    
-    # Charger la liste des VSTi dynamiquement
-    vsti_connus = load_vsti_list()
-    
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Fichier vide (mmap refuse une projection de taille nulle)
+            data = b""
+        try:
+            trouvés = trouve_vsti_donnees(data, progress_callback)
+        finally:
+            if isinstance(data, mmap.mmap):
+                try:
+                    data.close()
+                except BufferError:
+                    # Une exception garde encore une référence aux données :
+                    # la projection sera libérée avec elle
+                    pass
+
+    print("\nListe des plugins :")
+    for vsti in sorted(trouvés):
+        print(f"→ {vsti}")
+
+    return trouvés
+
+
+def trouve_vsti_donnees(data, progress_callback=None):
+    """
+    Recherche des VSTi connus dans le contenu d'un CPR
+
+    Args:
+        data (bytes): Contenu du fichier (bytes ou mmap)
+        progress_callback (callable): Fonction appelée avec (octets balayés,
+            octets à balayer), au plus 20 fois par seconde ; un retour False
+            interrompt l'analyse
+
+    Returns:
+        set: VSTi trouvés (partiels si l'analyse a été interrompue)
+    """
+    # Liste des VSTi et automate partagés (revalidés si vsti_list.json a changé)
+    vsti_noms = vsti_catalogue.names()
+    matcher = vsti_catalogue.matcher()
+
     trouvés = set()  # On utilise un set pour éviter les doublons
-    
-    total = len(vsti_connus) * 2  # Boucles numérotés + sans numéro
-    progress = 0
-    # Cherchons les VSTi numérotés (comme "Serum 01", "Kick 2 01", etc.)
-    for idx, vsti in enumerate(vsti_connus):
-        # Vérifier si on doit arrêter l'analyse
-        if progress_callback and progress_callback(int(progress * 100 / total)) is False:
+
+    def étape(début, total):
+        """Progression d'une étape de l'analyse, rapportée à l'ensemble des octets à parcourir"""
+        if not progress_callback:
+            return None
+        return lambda fait, _: progress_callback(début + fait, total)
+
+    # Lecture de la structure du CPR : seules les sections décrivant les
+    # plugins sont balayées. Format inconnu : recherche dans tout le fichier.
+    structure = parse_cpr(data, read_names=False)
+    sections = None
+    noms_plugins = None
+    taille_sections = 0
+    if structure is not None:
+        taille_sections = sum(fin - début for début, fin in structure['plugin_sections'])
+        # Les sections sont lues deux fois : attributs "Plugin Name", puis noms connus
+        lecture = ProgressThrottle(étape(0, 2 * taille_sections), taille_sections)
+        noms_plugins = read_plugin_names(data, structure['plugin_sections'], lecture.update)
+        if noms_plugins is None:
             print("Analyse interrompue par l'utilisateur")
             return trouvés
-            
-        if isinstance(vsti, dict):
-            vsti_name = vsti.get("name", "")
+        if noms_plugins:
+            sections = structure['plugin_sections']
         else:
-            vsti_name = vsti
-        if not vsti_name:
-            continue
-        pattern = re.compile(f"{vsti_name}\s+\d{{2}}".encode('utf-8'))
-        matches = pattern.findall(data)
-        for match in matches:
-            trouvés.add(match.decode('utf-8', errors='ignore'))
-        progress += 1
-        
+            noms_plugins = None
+
+    # Octets à parcourir : lecture de la structure, balayage, puis recherche
+    # des entrées "Plugin Nam..." si le format n'est pas reconnu
+    balayage = taille_sections if sections is not None else len(data)
+    total = taille_sections + balayage + (0 if sections is not None else len(data))
+
+    # Un seul balayage du fichier pour tous les VSTi connus
+    occurrences = matcher.occurrences(data, étape(taille_sections, total), sections)
+    if occurrences is None:
+        print("Analyse interrompue par l'utilisateur")
+        return trouvés
+
+    # Cherchons les VSTi numérotés (comme "Serum 01", "Kick 2 01", etc.)
+    for vsti_name, positions in occurrences.items():
+        fin_précédente = 0
+        for start, end in positions:
+            if start < fin_précédente:
+                continue
+            match = NUMBERED_SUFFIX.match(data, end)
+            if match:
+                trouvés.add(data[start:match.end()].decode('utf-8', errors='ignore'))
+                fin_précédente = match.end()
+
     # Cherchons aussi les instances sans numéro
-    for idx, vsti in enumerate(vsti_connus):
-        # Vérifier si on doit arrêter l'analyse
-        if progress_callback and progress_callback(int(progress * 100 / total)) is False:
-            print("Analyse interrompue par l'utilisateur")
-            return trouvés
-            
-        if isinstance(vsti, dict):
-            vsti_name = vsti.get("name", "")
-        else:
-            vsti_name = vsti
-        if not vsti_name:
-            continue
-        # On évite les faux positifs en vérifiant que ce n'est pas au milieu d'un mot
-        pattern = re.compile(rb'(?<!\w)' + vsti_name.encode('utf-8') + rb'(?!\w)')
-        matches = pattern.findall(data)
-        if matches:
+    # On évite les faux positifs en vérifiant que ce n'est pas au milieu d'un mot
+    isolés = {vsti_name for vsti_name, positions in occurrences.items()
+              if any(_is_bounded(data, start, end) for start, end in positions)}
+    for vsti_name in vsti_noms:
+        if vsti_name in isolés:
             if not any(vsti_name in déjà_trouvé for déjà_trouvé in trouvés):
                 trouvés.add(vsti_name)
-        progress += 1
-        
-    # Cherchons aussi les entrées de type "Plugin Nam..."
-    plugin_pattern = re.compile(rb'Plugin\s+Nam[^\n\r]{2,40}')
-    plugin_matches = plugin_pattern.findall(data)
-    
-    for match in plugin_matches:
-        # Vérifier si on doit arrêter l'analyse
-        if progress_callback and progress_callback(100) is False:
+
+    # Noms lus dans les attributs "Plugin Name" de l'archive : comme dans la
+    # recherche brute, seuls les VSTi de la liste sont retenus (les effets et
+    # les plugins absents de la liste ne sont pas des VSTi connus)
+    if noms_plugins is not None:
+        for nom in noms_plugins:
+            _ajoute_noms_connus(nom, vsti_noms, trouvés)
+        return trouvés
+
+    # Format inconnu : cherchons les entrées de type "Plugin Nam...", par
+    # fenêtres pour suivre la progression et permettre l'interruption
+    recherche = ProgressThrottle(étape(taille_sections + balayage, total), len(data))
+    fin_précédente = 0
+    for début_fenêtre in range(0, len(data), SCAN_WINDOW):
+        if not recherche.update(début_fenêtre):
             print("Analyse interrompue par l'utilisateur")
             return trouvés
-            
-        texte = match.decode('utf-8', errors='ignore')
-        # On extrait le nom du plugin si on le trouve
-        for vsti in vsti_connus:
-            if isinstance(vsti, dict):
-                vsti_name = vsti.get("name", "")
-            else:
-                vsti_name = vsti
-            if vsti_name and vsti_name in texte and vsti_name not in trouvés and not any(vsti_name in déjà_trouvé for déjà_trouvé in trouvés):
-                trouvés.add(vsti_name)
-    
-    print("\nListe des plugins :")
-    for vsti in sorted(trouvés):
-        print(f"→ {vsti}")
-    
+        fin_fenêtre = min(len(data), début_fenêtre + SCAN_WINDOW)
+        for match in PLUGIN_NAME_PATTERN.finditer(data, début_fenêtre, min(len(data), fin_fenêtre + PLUGIN_NAME_SPAN)):
+            # Entrée commencée dans la fenêtre précédente, ou chevauchant une entrée déjà lue
+            if match.start() >= fin_fenêtre:
+                break
+            if match.start() < fin_précédente:
+                continue
+            fin_précédente = match.end()
+            _ajoute_noms_connus(match.group().decode('utf-8', errors='ignore'), vsti_noms, trouvés)
+    recherche.update(len(data), force=True)
+
     return trouvés
 
+
+def _ajoute_noms_connus(texte, vsti_noms, trouvés):
+    """
+    Ajout des VSTi de la liste contenus dans un texte (nom de plugin lu dans l'archive)
+
+    Args:
+        texte (str): Texte à examiner
+        vsti_noms (list): Noms des VSTi connus
+        trouvés (set): VSTi trouvés, complété sur place
+    """
+    for vsti_name in vsti_noms:
+        if vsti_name and vsti_name in texte and vsti_name not in trouvés and not any(vsti_name in déjà_trouvé for déjà_trouvé in trouvés):
+            trouvés.add(vsti_name)
+
 if __name__ == "__main__":
-    trouve_vsti("monprojet.cpr")
\ No newline at end of file
+    trouve_vsti("monprojet.cpr")
@@ -184,6 +184,27 @@ class MetadataService:
                 self._save_local_metadata(project_dir, metadata)
             return metadata
     
+    def read_project_metadata(self, project_name, project_dir=None):
+        """
+        Lecture des métadonnées d'un projet sans rien créer sur le disque
+        
+        Contrairement à get_project_metadata, aucun metadata.json n'est écrit
+        pour un projet qui n'en a pas encore (utilisé par les rapports en ligne
+        de commande sur des archives).
+        
+        Args:
+            project_name (str): Nom du projet
+            project_dir (str): Chemin du dossier projet (requis en mode local)
+            
+        Returns:
+            dict: Métadonnées du projet (vide si le projet n'en a pas)
+        """
+        if self.mode == 'centralized':
+            return self.metadata.get(project_name, {})
+        if not project_dir or not os.path.isdir(project_dir):
+            return {}
+        return self._load_local_metadata(project_dir)
+    
     def set_project_metadata(self, project_name, metadata, project_dir=None):
         """
         Sauvegarde des métadonnées d'un projet (tous les champs)
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Découverte des plugins VST3/VST2 installés
+
+Les dossiers de plugins sont parcourus et chaque plugin est décrit par ses
+métadonnées, sans charger la bibliothèque :
+
+- bundle VST3 : Contents/Resources/moduleinfo.json (SDK VST3 3.7.5+), sinon
+  Contents/Info.plist (macOS), sinon la ressource de version du binaire
+  Windows (Contents/x86_64-win/*.vst3) ;
+- bundle VST2 macOS (.vst) : Contents/Info.plist ;
+- VST2 Windows (.dll) et VST3 mono-fichier : ressource de version PE
+  (ProductName, CompanyName), uniquement si la DLL exporte un point
+  d'entrée VST ;
+- VST2 Linux (.so) : nom du fichier.
+
+Les résultats sont conservés par fichier (date de modification et taille)
+dans ~/.trie_morceaux/plugin_discovery.json : une nouvelle découverte ne
+relit que les plugins installés ou mis à jour depuis la précédente.
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+import plistlib
+
+from config.constants import DEFAULT_PLUGIN_CACHE_FILE, DEFAULT_PLUGIN_FOLDERS
+from services.json_store import JsonStore
+
+# Version du format du cache
+CACHE_VERSION = 1
+
+# Formats de plugin
+FORMAT_VST3 = "VST3"
+FORMAT_VST2 = "VST2"
+
+# Classe des processeurs audio dans moduleinfo.json
+AUDIO_MODULE_CLASS = "Audio Module Class"
+
+# Noms trop courts pour être recherchés dans un CPR sans faux positifs
+MIN_NAME_LENGTH = 3
+
+# Points d'entrée exportés par un plugin VST2 (ou VST3 mono-fichier)
+VST_ENTRY_POINTS = (b'VSTPluginMain', b'main', b'GetPluginFactory')
+
+# Binaires Windows d'un bundle VST3, par ordre de préférence
+VST3_WINDOWS_ARCHS = ('x86_64-win', 'x86-win', 'arm64x-win', 'arm64-win')
+
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+
+# Ressource de version (RT_VERSION) d'un binaire PE
+RT_VERSION = 16
+
+
+def plugin_folders(configured=None, platform=None):
+    """
+    Dossiers de plugins à explorer
+
+    Args:
+        configured (list): Dossiers choisis par l'utilisateur
+            (settings.plugin_folders) ; vide : dossiers standards
+        platform (str): Plateforme (sys.platform par défaut)
+
+    Returns:
+        list: Dossiers existants, chemins absolus
+    """
+    platform = platform or sys.platform
+    if not configured:
+        key = 'win32' if platform.startswith('win') else 'darwin' if platform == 'darwin' else 'linux'
+        configured = DEFAULT_PLUGIN_FOLDERS[key]
+    folders = []
+    for folder in configured:
+        path = os.path.abspath(os.path.expanduser(folder))
+        if os.path.isdir(path) and path not in folders:
+            folders.append(path)
+    return folders
+
+
+def iter_plugin_paths(folders, cancel_token=None):
+    """
+    Parcours des dossiers de plugins
+
+    Les bundles (.vst3, .vst) ne sont pas explorés : ce sont des plugins.
+
+    Args:
+        folders (list): Dossiers à parcourir
+        cancel_token (CancelToken): Jeton d'annulation (facultatif)
+
+    Yields:
+        str: Chemin d'un plugin (bundle ou fichier)
+    """
+    stack = list(reversed(folders))
+    while stack:
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name.lower())
+        except OSError as e:
+            print(f"Impossible de parcourir {directory}: {e}")
+            continue
+        subdirectories = []
+        for entry in entries:
+            extension = os.path.splitext(entry.name)[1].lower()
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if extension in ('.vst3', '.vst'):
+                yield entry.path
+            elif is_dir:
+                subdirectories.append(entry.path)
+            elif extension in ('.dll', '.so'):
+                yield entry.path
+        stack.extend(reversed(subdirectories))
+
+
+def _plugin_source(plugin_path):
+    """
+    Fichier décrivant un plugin
+
+    Args:
+        plugin_path (str): Chemin du plugin
+
+    Returns:
+        tuple: (format, type de source, fichier source) ; type de source parmi
+            'moduleinfo', 'plist', 'pe', 'file', ou None si rien n'est lisible
+    """
+    extension = os.path.splitext(plugin_path)[1].lower()
+    plugin_format = FORMAT_VST3 if extension == '.vst3' else FORMAT_VST2
+
+    if not os.path.isdir(plugin_path):
+        if extension == '.so':
+            return plugin_format, 'file', plugin_path
+        return plugin_format, 'pe', plugin_path
+
+    contents = os.path.join(plugin_path, 'Contents')
+    if plugin_format == FORMAT_VST3:
+        moduleinfo = os.path.join(contents, 'Resources', 'moduleinfo.json')
+        if os.path.isfile(moduleinfo):
+            return plugin_format, 'moduleinfo', moduleinfo
+    plist = os.path.join(contents, 'Info.plist')
+    if os.path.isfile(plist):
+        return plugin_format, 'plist', plist
+    stem = os.path.splitext(os.path.basename(plugin_path))[0]
+    for arch in VST3_WINDOWS_ARCHS:
+        binary = os.path.join(contents, arch, stem + '.vst3')
+        if os.path.isfile(binary):
+            return plugin_format, 'pe', binary
+    return plugin_format, None, None
+
+
+def read_plugin(plugin_path):
+    """
+    Description d'un plugin à partir de ses métadonnées
+
+    Args:
+        plugin_path (str): Chemin du plugin (bundle ou fichier)
+
+    Returns:
+        list: Plugins {'name', 'vendor', 'format', 'instrument'} ; un module
+            VST3 peut en déclarer plusieurs, une DLL qui n'est pas un plugin
+            n'en déclare aucun
+    """
+    plugin_format, source_type, source = _plugin_source(plugin_path)
+    stem = os.path.splitext(os.path.basename(plugin_path))[0]
+    name, vendor, instrument = stem, '', None
+
+    if source_type == 'moduleinfo':
+        plugins = read_moduleinfo(source)
+        if plugins:
+            return [dict(plugin, format=plugin_format) for plugin in plugins]
+    elif source_type == 'plist':
+        info = read_info_plist(source)
+        name = info.get('name') or name
+        vendor = info.get('vendor', '')
+    elif source_type == 'pe':
+        if not os.path.isdir(plugin_path) and not pe_exports_any(source, VST_ENTRY_POINTS):
+            # Bibliothèque de support rangée avec les plugins
+            return []
+        strings = read_pe_version_strings(source)
+        name = strings.get('ProductName') or strings.get('FileDescription') or name
+        vendor = strings.get('CompanyName', '')
+
+    return [{'name': name.strip(), 'vendor': vendor.strip(), 'format': plugin_format, 'instrument': instrument}]
+
+
+def _load_json_lenient(text):
+    """
+    Lecture d'un JSON tolérant (moduleinfo.json suit JSON5 : commentaires et
+    virgules finales admis)
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        text = re.sub(r'^\s*//.*$', '', text, flags=re.MULTILINE)
+        text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+        text = re.sub(r',(\s*[}\]])', r'\1', text)
+        return json.loads(text)
+
+
+def read_moduleinfo(path):
+    """
+    Plugins déclarés dans le moduleinfo.json d'un bundle VST3
+
+    Args:
+        path (str): Chemin de moduleinfo.json
+
+    Returns:
+        list: Plugins {'name', 'vendor', 'instrument'} (processeurs audio)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            info = _load_json_lenient(f.read())
+    except (OSError, ValueError) as e:
+        print(f"Erreur lors de la lecture de {path}: {e}")
+        return []
+
+    factory_vendor = (info.get('Factory Info') or {}).get('Vendor', '')
+    plugins = []
+    for plugin_class in info.get('Classes') or []:
+        if plugin_class.get('Category') != AUDIO_MODULE_CLASS or not plugin_class.get('Name'):
+            continue
+        sub_categories = plugin_class.get('Sub Categories') or []
+        if isinstance(sub_categories, str):
+            sub_categories = sub_categories.split('|')
+        plugins.append({
+            'name': plugin_class['Name'].strip(),
+            'vendor': (plugin_class.get('Vendor') or factory_vendor).strip(),
+            'instrument': 'Instrument' in sub_categories
+        })
+    if not plugins and info.get('Name'):
+        plugins.append({'name': info['Name'].strip(), 'vendor': factory_vendor.strip(), 'instrument': None})
+    return plugins
+
+
+def read_info_plist(path):
+    """
+    Nom et éditeur d'un bundle macOS
+
+    L'éditeur est déduit de l'identifiant du bundle ("com.u-he.Diva" : "u-he").
+
+    Args:
+        path (str): Chemin de Info.plist (XML ou binaire)
+
+    Returns:
+        dict: {'name', 'vendor'} (clés absentes si inconnues)
+    """
+    try:
+        with open(path, 'rb') as f:
+            info = plistlib.load(f)
+    except Exception as e:
+        print(f"Erreur lors de la lecture de {path}: {e}")
+        return {}
+
+    result = {}
+    name = info.get('CFBundleDisplayName') or info.get('CFBundleName')
+    if isinstance(name, str) and name.strip():
+        result['name'] = name
+    identifier = info.get('CFBundleIdentifier')
+    if isinstance(identifier, str):
+        parts = identifier.split('.')
+        if len(parts) >= 3 and parts[1]:
+            result['vendor'] = parts[1]
+    return result
+
+
+class _PeFile:
+    """Accès aux répertoires de données d'un binaire Windows (PE32/PE32+)"""
+
+    def __init__(self, data):
+        """
+        Lecture des en-têtes
+
+        Args:
+            data (bytes): Contenu du fichier (bytes ou mmap)
+
+        Raises:
+            ValueError: Le fichier n'est pas un binaire PE
+        """
+        self.data = data
+        if len(data) < 64 or bytes(data[0:2]) != b'MZ':
+            raise ValueError("pas un binaire PE")
+        pe_offset = self.u32(0x3C)
+        if bytes(data[pe_offset:pe_offset + 4]) != b'PE\x00\x00':
+            raise ValueError("signature PE absente")
+        coff = pe_offset + 4
+        section_count = self.u16(coff + 2)
+        optional_size = self.u16(coff + 16)
+        optional = coff + 20
+        magic = self.u16(optional)
+        if magic == 0x10b:
+            directories = optional + 96
+        elif magic == 0x20b:
+            directories = optional + 112
+        else:
+            raise ValueError("en-tête optionnel inconnu")
+        self._directory_count = self.u32(directories - 4)
+        self._directories = directories
+        self._sections = []
+        for index in range(section_count):
+            header = optional + optional_size + 40 * index
+            virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from('<4I', data, header + 8)
+            self._sections.append((virtual_address, max(virtual_size, raw_size), raw_offset))
+
+    def u16(self, offset):
+        return UINT16.unpack_from(self.data, offset)[0]
+
+    def u32(self, offset):
+        return UINT32.unpack_from(self.data, offset)[0]
+
+    def offset(self, rva):
+        """Position dans le fichier d'une adresse virtuelle relative"""
+        for virtual_address, size, raw_offset in self._sections:
+            if virtual_address <= rva < virtual_address + size:
+                return raw_offset + rva - virtual_address
+        raise ValueError(f"adresse hors des sections : {rva:#x}")
+
+    def directory(self, index):
+        """(position, taille) d'un répertoire de données, ou None s'il est absent"""
+        if index >= self._directory_count:
+            return None
+        rva, size = struct.unpack_from('<2I', self.data, self._directories + 8 * index)
+        if not rva or not size:
+            return None
+        return self.offset(rva), size
+
+    def c_string(self, offset, limit=256):
+        """Chaîne terminée par un zéro"""
+        raw = bytes(self.data[offset:offset + limit])
+        return raw.split(b'\x00', 1)[0]
+
+    def exports(self):
+        """Noms exportés"""
+        directory = self.directory(0)
+        if directory is None:
+            return []
+        export_offset = directory[0]
+        name_count = self.u32(export_offset + 24)
+        names_offset = self.offset(self.u32(export_offset + 32))
+        return [self.c_string(self.offset(self.u32(names_offset + 4 * index)))
+                for index in range(min(name_count, 65536))]
+
+    def version_resource(self):
+        """Contenu de la ressource VS_VERSIONINFO, ou None"""
+        directory = self.directory(2)
+        if directory is None:
+            return None
+        root = directory[0]
+        # Type -> nom -> langue : on suit RT_VERSION puis la première entrée
+        entry = self._resource_entry(root, root, RT_VERSION)
+        for _ in range(2):
+            if entry is None or not entry & 0x80000000:
+                return None
+            entry = self._resource_entry(root, root + (entry & 0x7FFFFFFF), None)
+        if entry is None or entry & 0x80000000:
+            return None
+        data_rva, size = struct.unpack_from('<2I', self.data, root + entry)
+        start = self.offset(data_rva)
+        return bytes(self.data[start:start + size])
+
+    def _resource_entry(self, root, table, wanted_id):
+        """Entrée d'une table de ressources (la première si wanted_id est None)"""
+        named_count = self.u16(table + 12)
+        id_count = self.u16(table + 14)
+        for index in range(named_count + id_count):
+            entry_id, target = struct.unpack_from('<2I', self.data, table + 16 + 8 * index)
+            if wanted_id is None or (index >= named_count and entry_id == wanted_id):
+                return target
+        return None
+
+
+def _with_file_data(path, reader, default):
+    """Application d'un lecteur au contenu projeté en mémoire d'un fichier"""
+    try:
+        with open(path, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return default
+            try:
+                return reader(data)
+            finally:
+                data.close()
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Erreur lors de la lecture de {path}: {e}")
+        return default
+
+
+def pe_exports_any(path, names):
+    """
+    Le binaire exporte-t-il l'un des noms ?
+
+    Args:
+        path (str): Chemin du binaire
+        names (tuple): Noms recherchés (bytes)
+
+    Returns:
+        bool: True si l'un des noms est exporté
+    """
+    def reader(data):
+        try:
+            exports = _PeFile(data).exports()
+        except (ValueError, struct.error):
+            return False
+        return any(name in exports for name in names)
+    return _with_file_data(path, reader, False)
+
+
+def read_pe_version_strings(path):
+    """
+    Chaînes de la ressource de version d'un binaire Windows
+
+    Args:
+        path (str): Chemin du binaire (.dll, .vst3)
+
+    Returns:
+        dict: {'ProductName', 'CompanyName', 'FileDescription'} (clés
+            présentes dans la ressource)
+    """
+    def reader(data):
+        try:
+            resource = _PeFile(data).version_resource()
+        except (ValueError, struct.error):
+            return {}
+        return parse_version_strings(resource) if resource else {}
+    return _with_file_data(path, reader, {})
+
+
+def parse_version_strings(resource, keys=('ProductName', 'CompanyName', 'FileDescription')):
+    """
+    Lecture de chaînes d'une ressource VS_VERSIONINFO
+
+    Chaque chaîne est une structure String : wLength, wValueLength (en
+    caractères), wType, clé UTF-16 terminée par un zéro, alignement sur 32
+    bits, valeur UTF-16.
+
+    Args:
+        resource (bytes): Contenu de la ressource
+        keys (tuple): Clés recherchées
+
+    Returns:
+        dict: Clé -> valeur
+    """
+    strings = {}
+    for key in keys:
+        pattern = key.encode('utf-16-le') + b'\x00\x00'
+        position = resource.find(pattern)
+        while position >= 6 and position % 2:
+            position = resource.find(pattern, position + 1)
+        if position < 6:
+            continue
+        value_length = UINT16.unpack_from(resource, position - 4)[0]
+        value_start = (position + len(pattern) + 3) & ~3
+        raw = resource[value_start:value_start + 2 * value_length]
+        value = raw.decode('utf-16-le', errors='ignore').split('\x00', 1)[0].strip()
+        if value:
+            strings[key] = value
+    return strings
+
+
+class PluginDiscovery(JsonStore):
+    """
+    Découverte des plugins avec cache par fichier
+
+    Une entrée du cache est indexée par le chemin du plugin et reste valide
+    tant que la date de modification et la taille du fichier qui le décrit
+    n'ont pas changé.
+    """
+
+    VERSION = CACHE_VERSION
+    PAYLOAD_KEY = 'plugins'
+    DEFAULT_FILE = DEFAULT_PLUGIN_CACHE_FILE
+    LABEL = "du cache des plugins"
+
+    def discover(self, folders, progress_callback=None, cancel_token=None):
+        """
+        Découverte des plugins de plusieurs dossiers
+
+        Args:
+            folders (list): Dossiers de plugins (voir plugin_folders)
+            progress_callback (callable): Fonction appelée avec le nombre de
+                plugins examinés
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+
+        Returns:
+            tuple: (tous les plugins, plugins lus lors de cet appel) ; chaque
+                plugin est un dict {'name', 'vendor', 'format', 'instrument', 'path'}
+        """
+        self.load()
+        plugins = []
+        new_plugins = []
+        seen = set()
+        for count, plugin_path in enumerate(iter_plugin_paths(folders, cancel_token), 1):
+            seen.add(plugin_path)
+            found, cached = self._plugin(plugin_path)
+            plugins.extend(found)
+            if not cached:
+                new_plugins.extend(found)
+            if progress_callback:
+                progress_callback(count)
+
+        # Plugins désinstallés : leurs entrées sont retirées (dossiers parcourus
+        # jusqu'au bout uniquement)
+        if cancel_token is None or not cancel_token.cancelled:
+            roots = tuple(os.path.join(folder, '') for folder in folders)
+            with self._lock:
+                for plugin_path in [path for path in self.entries
+                                    if path.startswith(roots) and path not in seen]:
+                    del self.entries[plugin_path]
+                    self._dirty = True
+        self.save()
+        return plugins, new_plugins
+
+    def _plugin(self, plugin_path):
+        """
+        Description d'un plugin, depuis le cache si son fichier source n'a pas changé
+
+        Returns:
+            tuple: (plugins, servi par le cache)
+        """
+        plugin_format, source_type, source = _plugin_source(plugin_path)
+        try:
+            stat = os.stat(source or plugin_path)
+        except OSError:
+            return [], True
+        with self._lock:
+            entry = self.entries.get(plugin_path)
+        if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size \
+                and entry['source'] == source:
+            return entry['plugins'], True
+
+        found = [dict(plugin, path=plugin_path) for plugin in read_plugin(plugin_path)]
+        with self._lock:
+            self.entries[plugin_path] = {
+                'source': source,
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'plugins': found,
+                'merged': []
+            }
+            self._dirty = True
+        return found, False
+
+    def unmerged(self, plugins):
+        """
+        Plugins pas encore fusionnés dans la liste des VSTi
+
+        Un plugin écarté lors d'une fusion (type inconnu non retenu) reste à
+        fusionner ; un plugin fusionné puis retiré de la liste par l'utilisateur
+        n'y revient que si son fichier change.
+
+        Args:
+            plugins (list): Plugins (voir discover)
+
+        Returns:
+            list: Plugins à fusionner
+        """
+        with self._lock:
+            pending = []
+            for plugin in plugins:
+                entry = self.entries.get(plugin.get('path'))
+                # Entrée d'un cache antérieur au suivi des fusions : déjà fusionnée
+                merged = entry.get('merged') if entry is not None else []
+                if merged is not None and plugin['name'] not in merged:
+                    pending.append(plugin)
+            return pending
+
+    def mark_merged(self, plugins):
+        """
+        Enregistrement des plugins fusionnés dans la liste des VSTi
+
+        Args:
+            plugins (list): Plugins fusionnés (voir discover)
+        """
+        with self._lock:
+            for plugin in plugins:
+                entry = self.entries.get(plugin.get('path'))
+                if entry is None or entry.get('merged') is None or plugin['name'] in entry['merged']:
+                    continue
+                entry['merged'].append(plugin['name'])
+                self._dirty = True
+
+
+def catalogue_entries(plugins, include_unknown=False):
+    """
+    Entrées de la liste des VSTi correspondant à des plugins découverts
+
+    Seuls les instruments sont retenus : les effets (inserts, égaliseurs,
+    compresseurs...) seraient sinon signalés comme VSTi par l'analyse.
+
+    Args:
+        plugins (list): Plugins (voir PluginDiscovery.discover)
+        include_unknown (bool): Retenir aussi les plugins dont le type n'a pas
+            pu être déterminé (VST2, bundles sans moduleinfo.json)
+
+    Returns:
+        list: Entrées {'name', 'editor'} sans doublon (noms trop courts écartés)
+    """
+    entries = {}
+    for plugin in plugins:
+        instrument = plugin.get('instrument')
+        if instrument is False or (instrument is None and not include_unknown):
+            continue
+        name = plugin['name']
+        if len(name) < MIN_NAME_LENGTH or name.lower() in entries:
+            continue
+        entry = {'name': name}
+        if plugin.get('vendor'):
+            entry['editor'] = plugin['vendor']
+        entries[name.lower()] = entry
+    return list(entries.values())
+
+
+def discover_into_catalogue(folders, discovery=None, catalogue=None, progress_callback=None, cancel_token=None,
+                            include_unknown=False):
+    """
+    Découverte des plugins et ajout des nouveaux au catalogue des VSTi
+
+    Seuls les plugins pas encore fusionnés sont proposés (installés ou mis à
+    jour depuis, ou écartés par une fusion précédente) : un plugin retiré de la
+    liste par l'utilisateur n'y revient pas à chaque découverte, et un plugin
+    de type inconnu est ajouté dès que include_unknown est demandé.
+
+    Args:
+        folders (list): Dossiers de plugins
+        discovery (PluginDiscovery): Service de découverte (instance globale par défaut)
+        catalogue (VstiCatalogue): Catalogue des VSTi (instance globale par défaut)
+        progress_callback (callable): Voir PluginDiscovery.discover
+        cancel_token (CancelToken): Jeton d'annulation (facultatif)
+        include_unknown (bool): Voir catalogue_entries
+
+    Returns:
+        tuple: (nombre de plugins trouvés, nombre d'entrées ajoutées ou complétées)
+    """
+    if discovery is None:
+        discovery = plugin_discovery
+    if catalogue is None:
+        from services.vsti_manager import vsti_catalogue
+        catalogue = vsti_catalogue
+    plugins, _ = discovery.discover(folders, progress_callback, cancel_token)
+    pending = discovery.unmerged(plugins)
+    entries = catalogue_entries(pending, include_unknown)
+    changed = catalogue.merge(entries) if entries else 0
+    merged_names = {entry['name'].lower() for entry in entries}
+    discovery.mark_merged([plugin for plugin in pending if plugin['name'].lower() in merged_names])
+    discovery.save()
+    return len(plugins), changed
+
+
+# Instance globale du service de découverte
+plugin_discovery = PluginDiscovery()
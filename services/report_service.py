@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Rapports de scan sans interface graphique (JSON Lines ou CSV)
+
+Ce module n'importe ni PyQt5, ni scipy, ni lxml : il est utilisé par
+`main.py --headless scan`, par exemple depuis cron sur un serveur d'archives.
+"""
+
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+
+from services.scanner import CubaseScanner
+
+# Colonnes du rapport CSV (les listes sont jointes par "; ")
+REPORT_FIELDS = [
+    'project_name',
+    'source',
+    'project_dir',
+    'latest_cpr',
+    'latest_cpr_date',
+    'cpr_count',
+    'bak_count',
+    'wav_count',
+    'other_count',
+    'total_size',
+    'vsti',
+    'editors',
+    'rating',
+    'tags',
+    'styles',
+    'bpm',
+    'notes'
+]
+
+
+def iter_project_reports(directories, with_vsti=False, with_metadata=False, index=None, rules=None,
+                         workers_per_device=1):
+    """
+    Scan des dossiers puis production d'un rapport par projet
+
+    Le scan est fait en une fois ; l'analyse VSTi, la plus coûteuse, est faite
+    projet par projet et chaque rapport est produit dès qu'il est prêt.
+
+    Args:
+        directories (list): Dossiers racines à scanner
+        with_vsti (bool): Analyser les VSTi du CPR le plus récent de chaque projet
+        with_metadata (bool): Ajouter les métadonnées (note, tags, notes...)
+        index (ScanIndex): Index de scan persistant (facultatif)
+        rules (dict): Règles de parcours par racine (facultatif)
+        workers_per_device (int): Racines scannées simultanément par disque
+
+    Yields:
+        dict: Rapport d'un projet
+    """
+    scanner = CubaseScanner(index=index, rules=rules)
+    scanner.scan_multiple_directories(directories, workers_per_device=workers_per_device)
+
+    metadata_service = None
+    if with_metadata:
+        from services.metadata_service import MetadataService
+        metadata_service = MetadataService(mode='local')
+
+    for summary in sorted(scanner.df_projects, key=lambda p: p['project_name'].lower()):
+        # Dossiers parcourus sans aucun fichier de projet
+        if not any(summary.get(key) for key in ['cpr_count', 'bak_count', 'wav_count', 'other_count']):
+            continue
+        yield project_report(summary, with_vsti, metadata_service)
+
+
+def project_report(summary, with_vsti=False, metadata_service=None):
+    """
+    Rapport d'un projet à partir de sa ligne de synthèse
+
+    Args:
+        summary (dict): Ligne de synthèse (voir CubaseScanner._project_summary)
+        with_vsti (bool): Analyser les VSTi du CPR le plus récent
+        metadata_service (MetadataService): Service de métadonnées (facultatif)
+
+    Returns:
+        dict: Rapport sérialisable en JSON
+    """
+    latest_cpr_date = summary.get('latest_cpr_date')
+    report = {
+        'project_name': summary['project_name'],
+        'source': summary.get('source', ''),
+        'project_dir': summary.get('project_dir', ''),
+        'latest_cpr': summary.get('latest_cpr'),
+        'latest_cpr_date': latest_cpr_date.isoformat() if isinstance(latest_cpr_date, datetime) else None,
+        'cpr_count': summary.get('cpr_count', 0),
+        'bak_count': summary.get('bak_count', 0),
+        'wav_count': summary.get('wav_count', 0),
+        'other_count': summary.get('other_count', 0),
+        'total_size': summary.get('total_size', 0)
+    }
+
+    if with_vsti:
+        from services.vsti_cache import vsti_cache
+        from services.vsti_manager import get_vsti_by_editor
+        vsti = []
+        if report['latest_cpr']:
+            try:
+                vsti = sorted(vsti_cache.analyse(report['latest_cpr'])[0])
+            except OSError as e:
+                print(f"Erreur lors de l'analyse de {report['latest_cpr']}: {e}")
+        report['vsti'] = vsti
+        report['editors'] = dict(get_vsti_by_editor(vsti)) if vsti else {}
+
+    if metadata_service is not None:
+        metadata = metadata_service.read_project_metadata(report['project_name'], report['project_dir'])
+        report['rating'] = metadata.get('rating', 0)
+        report['tags'] = metadata.get('tags', [])
+        report['styles'] = metadata.get('styles', [])
+        report['bpm'] = metadata.get('bpm', 0)
+        report['notes'] = metadata.get('notes', '')
+
+    return report
+
+
+def write_reports(reports, stream, output_format='jsonl'):
+    """
+    Écriture des rapports au fil de l'eau
+
+    En JSON Lines, une dernière ligne {"type": "summary", ...} récapitule le
+    scan (nombre de projets, taille totale, tags et VSTi les plus fréquents).
+
+    Args:
+        reports (iterable): Rapports de projets
+        stream (file): Flux de sortie texte
+        output_format (str): 'jsonl' ou 'csv'
+
+    Returns:
+        dict: Récapitulatif du scan
+    """
+    summary = {'type': 'summary', 'project_count': 0, 'total_size': 0}
+    tags = Counter()
+    vsti = Counter()
+
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+
+    for report in reports:
+        summary['project_count'] += 1
+        summary['total_size'] += report['total_size']
+        tags.update(report.get('tags', []))
+        vsti.update(report.get('vsti', []))
+
+        if writer is not None:
+            writer.writerow(_csv_row(report))
+        else:
+            stream.write(json.dumps(dict(report, type='project'), ensure_ascii=False) + '\n')
+        stream.flush()
+
+    if tags:
+        summary['tags'] = dict(tags.most_common())
+    if vsti:
+        summary['vsti'] = dict(vsti.most_common())
+    if writer is None:
+        stream.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        stream.flush()
+    return summary
+
+
+def _csv_row(report):
+    """Aplatissement d'un rapport pour une ligne CSV"""
+    row = dict(report)
+    for key in ['vsti', 'tags', 'styles']:
+        if key in row:
+            row[key] = '; '.join(str(value) for value in row[key])
+    if 'editors' in row:
+        row['editors'] = '; '.join(f"{editor}: {', '.join(names)}" for editor, names in row['editors'].items())
+    return row
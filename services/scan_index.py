@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Index persistant des dossiers scannés, utilisé pour les rescans incrémentaux
+"""
+
+import os
+import time
+
+from config.constants import DEFAULT_SCAN_INDEX_FILE
+from services.json_store import JsonStore
+
+# Version du format du fichier d'index
+INDEX_VERSION = 1
+
+# Un dossier modifié il y a moins de RECENT_DELAY secondes n'est pas indexé :
+# certains systèmes de fichiers (FAT, exFAT, partages réseau) ont une
+# résolution de 2 secondes sur les dates et une modification ultérieure
+# dans la même fenêtre passerait inaperçue
+RECENT_DELAY = 2.0
+
+
+class ScanIndex(JsonStore):
+    """
+    Index des dossiers scannés, stocké dans ~/.trie_morceaux/scan_index.json.
+    
+    Pour chaque dossier, l'index conserve sa date de modification (mtime) ainsi
+    que la liste de ses sous-dossiers et de ses fichiers (nom, taille, dates).
+    Lors d'un rescan, seuls les dossiers dont la mtime a changé sont relus ;
+    les autres sont servis depuis l'index sans aucun stat sur leurs fichiers.
+    
+    La mtime d'un dossier change lorsqu'une entrée y est créée, supprimée ou
+    renommée, mais pas lorsqu'un fichier existant est réécrit sur place.
+    
+    Les racines peuvent être scannées en parallèle (un thread par périphérique) :
+    les modifications passent par le verrou de JsonStore.
+    """
+    
+    VERSION = INDEX_VERSION
+    PAYLOAD_KEY = 'directories'
+    DEFAULT_FILE = DEFAULT_SCAN_INDEX_FILE
+    LABEL = "de l'index de scan"
+    
+    def lookup(self, dirpath, mtime_ns, rules_key=''):
+        """
+        Recherche du contenu d'un dossier dans l'index
+        
+        Args:
+            dirpath (str): Chemin du dossier
+            mtime_ns (int): Date de modification actuelle du dossier
+            rules_key (str): Signature des règles d'exclusion du scan en cours
+            
+        Returns:
+            tuple: (sous-dossiers, fichiers) si le dossier n'a pas changé et a été
+                lu avec les mêmes règles, sinon None
+        """
+        entry = self.entries.get(dirpath)
+        if entry is None or entry['mtime'] != mtime_ns or entry.get('rules', '') != rules_key:
+            return None
+        return entry['dirs'], entry['files']
+    
+    def store(self, dirpath, mtime_ns, subdirs, files, rules_key=''):
+        """
+        Enregistrement du contenu d'un dossier
+        
+        Args:
+            dirpath (str): Chemin du dossier
+            mtime_ns (int): Date de modification du dossier lors de la lecture
+            subdirs (list): Sous-dossiers [(nom, est_un_lien)]
+            files (list): Fichiers [(nom, taille, mtime, ctime)]
+            rules_key (str): Signature des règles d'exclusion appliquées à la lecture
+        """
+        with self._lock:
+            if time.time() - mtime_ns / 1e9 < RECENT_DELAY:
+                # Dossier trop récent : on le relira au prochain scan
+                if self.entries.pop(dirpath, None) is not None:
+                    self._dirty = True
+                return
+            entry = {'mtime': mtime_ns, 'dirs': subdirs, 'files': files}
+            if rules_key:
+                entry['rules'] = rules_key
+            self.entries[dirpath] = entry
+            self._dirty = True
+    
+    def prune(self, root_dir, visited):
+        """
+        Suppression des dossiers disparus sous une racine
+        
+        Args:
+            root_dir (str): Dossier racine scanné
+            visited (set): Dossiers rencontrés pendant le scan
+        """
+        with self._lock:
+            prefix = os.path.join(root_dir, '')
+            stale = [path for path in self.entries
+                     if (path == root_dir or path.startswith(prefix)) and path not in visited]
+            for path in stale:
+                del self.entries[path]
+            if stale:
+                self._dirty = True
+    
+# Instance globale de l'index de scan
+scan_index = ScanIndex()
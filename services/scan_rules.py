@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Règles d'exclusion et limites de profondeur appliquées pendant le scan
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+# Clé des règles par défaut, appliquées aux racines sans règles propres
+DEFAULT_RULES_KEY = "*"
+
+
+def _translate(pattern):
+    """
+    Conversion d'un motif de type .gitignore en expression régulière
+
+    Args:
+        pattern (str): Motif sans '!' initial ni '/' final
+
+    Returns:
+        str: Expression régulière (chemin relatif avec des '/')
+    """
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape('[')
+                i += 1
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                regex += '[' + content.replace('\\', '\\\\') + ']'
+                i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+class ScanRules:
+    """
+    Règles de parcours d'une racine de scan
+
+    Les motifs d'exclusion suivent la syntaxe des fichiers .gitignore :
+    - un motif sans '/' s'applique au nom à n'importe quel niveau (ex. "Freeze") ;
+    - un motif contenant '/' est relatif à la racine (ex. "/Edits", "Audio/Fades") ;
+    - un '/' final ne vise que les dossiers (ex. "node_modules/") ;
+    - '*', '?', '[abc]' et '**' ont leur sens habituel ;
+    - un motif commençant par '!' réintègre ce qu'un motif précédent excluait.
+
+    Un dossier exclu n'est jamais lu ; un fichier exclu n'est jamais stat'é.
+    """
+
+    def __init__(self, exclude=None, max_depth=None, max_entries=None):
+        """
+        Initialisation des règles
+
+        Args:
+            exclude (list): Motifs d'exclusion
+            max_depth (int): Profondeur maximale parcourue sous la racine
+                (0 : la racine seule, None : pas de limite)
+            max_entries (int): Les dossiers de plus de max_entries entrées sont
+                ignorés (None : pas de limite)
+        """
+        self.exclude = [line.strip() for line in (exclude or [])
+                        if line.strip() and not line.strip().startswith('#')]
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self._rules = []
+        for line in self.exclude:
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            regex = _translate(line.lstrip('/'))
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+            self._rules.append((re.compile(regex + r'\Z'), negate, dir_only))
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Création des règles depuis leur forme enregistrée dans les paramètres
+
+        Args:
+            data (dict): {'exclude': [...], 'max_depth': int, 'max_entries': int}
+
+        Returns:
+            ScanRules: Règles correspondantes
+        """
+        return cls(data.get('exclude'), data.get('max_depth'), data.get('max_entries'))
+
+    def to_dict(self):
+        """Forme enregistrable des règles"""
+        return {'exclude': self.exclude, 'max_depth': self.max_depth, 'max_entries': self.max_entries}
+
+    def key(self):
+        """
+        Signature des règles qui influent sur le contenu lu d'un dossier
+
+        Sert à invalider les entrées de l'index de scan lues avec d'autres règles.
+
+        Returns:
+            str: Signature ('' si aucune règle ne filtre les entrées)
+        """
+        if not self._rules and self.max_entries is None:
+            return ''
+        return json.dumps([self.exclude, self.max_entries], ensure_ascii=False)
+
+    def excludes(self, rel_path, is_dir):
+        """
+        Test d'exclusion d'une entrée
+
+        Args:
+            rel_path (str): Chemin relatif à la racine du scan
+            is_dir (bool): L'entrée est un dossier
+
+        Returns:
+            bool: L'entrée doit être ignorée
+        """
+        if not self._rules:
+            return False
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        excluded = False
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if excluded == negate and regex.match(rel_path):
+                excluded = not negate
+        return excluded
+
+    def allows_depth(self, depth):
+        """
+        Test de la profondeur d'un dossier
+
+        Args:
+            depth (int): Profondeur sous la racine (1 pour un sous-dossier direct)
+
+        Returns:
+            bool: Le dossier peut être parcouru
+        """
+        return self.max_depth is None or depth <= self.max_depth
+
+
+def rules_from_settings(scan_rules):
+    """
+    Règles par racine à partir des paramètres utilisateur
+
+    Args:
+        scan_rules (dict): settings.scan_rules, {racine ou "*": règles}
+
+    Returns:
+        dict: {racine ou "*": ScanRules}
+    """
+    rules = {}
+    for root, data in (scan_rules or {}).items():
+        try:
+            rules[root if root == DEFAULT_RULES_KEY else str(Path(root))] = ScanRules.from_dict(data)
+        except (AttributeError, TypeError, re.error) as e:
+            print(f"Règles de scan invalides pour {root}: {e}")
+    return rules
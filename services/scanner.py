@@ -7,172 +7,656 @@ Service de scan et d'analyse des projets Cubase
 
 import os
 from pathlib import Path
-from datetime import datetime
 import shutil
+import sys
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.file_records import FileList
+from services.scan_rules import DEFAULT_RULES_KEY
+from config.constants import CUBASE_PROJECT_FOLDERS
+
+# Intervalle minimal (secondes) entre deux lots de projets transmis pendant un scan
+BATCH_INTERVAL = 0.2
+
+_PROJECT_FOLDERS = {name.lower() for name in CUBASE_PROJECT_FOLDERS}
 
 class CubaseScanner:
     """Service pour scanner et analyser les projets Cubase"""
     
-    def __init__(self):
-        """Initialisation du scanner"""
+    def __init__(self, index=None, rules=None):
+        """
+        Initialisation du scanner
+        
+        Args:
+            index (ScanIndex): Index persistant des dossiers pour les rescans
+                incrémentaux (facultatif)
+            rules (dict): Règles de parcours par racine {racine ou "*": ScanRules},
+                voir services.scan_rules (facultatif)
+        """
+        self.index = index
+        self.rules = rules or {}
+        # Dossiers situés dans un projet Cubase détecté -> dossier racine du projet
+        self.owners = {}
         self.projects = defaultdict(lambda: {
-            'cpr_files': [],
-            'bak_files': [],
-            'wav_files': [],
-            'other_files': [],
+            'cpr_files': FileList(),
+            'bak_files': FileList(),
+            'wav_files': FileList(),
+            'other_files': FileList(),
             'directories': [],
             'source': '',
             'project_dir': ''  # Ajout du chemin complet du dossier du projet
         })
         self.df_projects = []
     
-    def scan_directory(self, root_dir):
+    def scan_directory(self, root_dir, progress_callback=None, projects_callback=None,
+                       cancel_token=None):
         """
         Parcours récursif d'un dossier pour trouver les projets Cubase
         
+        L'arborescence est parcourue en une seule passe : chaque fichier n'est
+        visité qu'une fois, quelle que soit sa profondeur.
+        
         Args:
             root_dir (str): Chemin du dossier racine à scanner
+            progress_callback (callable): Fonction appelée avec le pourcentage
+                d'avancement (0-100), calculé sur les sous-dossiers de premier niveau
+            projects_callback (callable): Fonction appelée pendant le scan avec des
+                lots de lignes de synthèse (voir _project_summary) des projets
+                trouvés ou complétés depuis le lot précédent
+            cancel_token (CancelToken): Jeton d'annulation, consulté entre chaque
+                entrée de dossier ; en cas d'annulation le scan s'arrête et les
+                projets déjà trouvés sont renvoyés
         
         Returns:
             dict: Dictionnaire des projets trouvés
         """
-        root_path = Path(root_dir)
-        
-        if not root_path.exists():
-            print(f"Le dossier {root_path} n'existe pas!")
+        if not Path(root_dir).exists():
+            print(f"Le dossier {root_dir} n'existe pas!")
             return self.projects
         
-        # Parcours récursif du dossier
-        file_count = 0
-        for path in root_path.rglob('*'):
-            if path.is_file():
-                file_count += 1
-                # Récupération de l'extension et du nom du dossier parent
-                ext = path.suffix.lower()
-                parent_dir = path.parent.name
-                project_dir = path.parent
-                
-                # Détermination du nom du projet (nom du dossier parent)
-                project_name = project_dir.name
-                
-                # Initialisation du chemin du dossier du projet s'il n'existe pas encore
-                if 'project_dir' not in self.projects[project_name] or not self.projects[project_name]['project_dir']:
-                    self.projects[project_name]['project_dir'] = str(project_dir)
-                
-                # Si le projet n'a pas encore de source, on l'initialise
-                if 'source' not in self.projects[project_name]:
-                    self.projects[project_name]['source'] = str(root_path)
-                # Si le projet existe déjà mais vient d'une autre source, on le marque comme multi-source
-                elif self.projects[project_name]['source'] != str(root_path):
-                    self.projects[project_name]['source'] = "Plusieurs sources"
-                
-                # Ajout du fichier à la catégorie correspondante
-                if ext == '.cpr':
-                    self.projects[project_name]['cpr_files'].append({
-                        'path': str(path),
-                        'size': path.stat().st_size,
-                        'modified': datetime.fromtimestamp(path.stat().st_mtime),
-                        'created': datetime.fromtimestamp(path.stat().st_ctime),
-                        'source': str(root_path)
-                    })
-                elif ext == '.bak':
-                    self.projects[project_name]['bak_files'].append({
-                        'path': str(path),
-                        'size': path.stat().st_size,
-                        'modified': datetime.fromtimestamp(path.stat().st_mtime),
-                        'created': datetime.fromtimestamp(path.stat().st_ctime),
-                        'source': str(root_path)
-                    })
-                elif ext == '.wav':
-                    self.projects[project_name]['wav_files'].append({
-                        'path': str(path),
-                        'size': path.stat().st_size,
-                        'modified': datetime.fromtimestamp(path.stat().st_mtime),
-                        'created': datetime.fromtimestamp(path.stat().st_ctime),
-                        'source': str(root_path)
-                    })
-                else:
-                    self.projects[project_name]['other_files'].append({
-                        'path': str(path),
-                        'size': path.stat().st_size,
-                        'modified': datetime.fromtimestamp(path.stat().st_mtime),
-                        'created': datetime.fromtimestamp(path.stat().st_ctime),
-                        'source': str(root_path)
-                    })
-            elif path.is_dir() and path.name not in ['.', '..']:
-                project_name = path.parent.name
-                self.projects[project_name]['directories'].append({
-                    'path': str(path),
-                    'name': path.name,
-                    'source': str(root_path)
-                })
+        self._scan_root(root_dir, progress_callback, projects_callback, cancel_token)
+        
+        if self.index is not None:
+            self.index.save()
         
         # Conversion en DataFrame pour faciliter l'analyse
         self._create_dataframe()
         
         return self.projects
     
-    def scan_multiple_directories(self, dir_list):
+    def _scan_root(self, root_dir, progress_callback=None, projects_callback=None, cancel_token=None):
+        """
+        Parcours d'un dossier racine et ajout de son contenu à self.projects
+        
+        Args:
+            root_dir (str): Chemin du dossier racine à scanner
+            progress_callback (callable): Fonction appelée avec le pourcentage d'avancement
+            projects_callback (callable): Fonction appelée avec des lots de projets
+                au fil du scan (au plus tous les BATCH_INTERVAL secondes)
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+        """
+        # Chaîne internée : une seule copie par source, même entre plusieurs scanners
+        source = sys.intern(str(Path(root_dir)))
+        
+        # Progression : nombre de sous-dossiers de premier niveau traités
+        top_level_total = 0
+        top_level_done = 0
+        current_top_level = None
+        last_percent = -1
+        
+        if self.index is not None:
+            self.index.load()
+        visited = set()
+        
+        # Projets modifiés depuis le dernier lot transmis
+        pending = set()
+        last_batch = 0.0
+        
+        rules = self._rules_for(source)
+        
+        # Parcours en profondeur, chaque dossier est lu une seule fois.
+        # owner : racine du projet Cubase englobant le dossier, s'il y en a une
+        stack = [(source, None, 0, None)]
+        while stack:
+            if cancel_token is not None and cancel_token.cancelled:
+                break
+            dirpath, top_level, depth, owner = stack.pop()
+            
+            if top_level is not None and top_level != current_top_level:
+                current_top_level = top_level
+                top_level_done += 1
+            
+            visit = self._visit_directory(dirpath, source, cancel_token, rules=rules, depth=depth,
+                                          owner=owner)
+            if visit is None:
+                continue
+            visited.add(dirpath)
+            project_name, subdirs, has_files = visit
+            owner = self.owners.get(dirpath)
+            
+            if projects_callback and has_files:
+                pending.add(project_name)
+                now = time.monotonic()
+                if now - last_batch >= BATCH_INTERVAL:
+                    last_batch = now
+                    self._emit_batch(pending, projects_callback)
+            
+            if top_level is None:
+                # Le dossier racine compte comme une unité de travail
+                top_level_total = len(subdirs) + 1
+                top_level_done = 1
+                stack.extend((path, path, 1, owner) for path in reversed(subdirs))
+            else:
+                stack.extend((path, top_level, depth + 1, owner) for path in reversed(subdirs))
+            
+            if progress_callback and top_level_total:
+                percent = int(top_level_done * 100 / top_level_total)
+                if percent != last_percent:
+                    last_percent = percent
+                    progress_callback(percent)
+        
+        if cancel_token is not None and cancel_token.cancelled:
+            # Scan interrompu : l'index n'est pas élagué, la liste des dossiers visités est partielle
+            return
+        
+        if self.index is not None:
+            self.index.prune(source, visited)
+        
+        if projects_callback and pending:
+            self._emit_batch(pending, projects_callback)
+        
+        if progress_callback and last_percent != 100:
+            progress_callback(100)
+    
+    def _emit_batch(self, project_names, projects_callback):
         """
-        Scan de plusieurs dossiers racines
+        Transmission d'un lot de projets en cours de scan
+        
+        Args:
+            project_names (set): Noms des projets modifiés (vidé après l'envoi)
+            projects_callback (callable): Destinataire du lot
+        """
+        batch = [self._project_summary(name, self.projects[name]) for name in project_names]
+        project_names.clear()
+        projects_callback(batch)
+    
+    def _rules_for(self, source):
+        """
+        Règles de parcours d'une racine
+        
+        Args:
+            source (str): Dossier racine du scan
+            
+        Returns:
+            ScanRules: Règles propres à la racine, règles par défaut ou None
+        """
+        return self.rules.get(source) or self.rules.get(DEFAULT_RULES_KEY)
+    
+    def _visit_directory(self, dirpath, source, cancel_token=None, force=False, rules=None, depth=0,
+                         owner=None):
+        """
+        Lecture d'un dossier et ajout de son contenu au projet correspondant
+        
+        Un dossier contenant un fichier .cpr et un sous-dossier standard de
+        Cubase (Audio, Auto Saves, Edits...) est la racine d'un projet : tout ce
+        qui se trouve en dessous lui est rattaché, au lieu de former des
+        pseudo-projets "Audio" ou "Edits". Ailleurs, le projet est le nom du
+        dossier parent des fichiers.
+        
+        Args:
+            dirpath (str): Chemin du dossier
+            source (str): Dossier racine du scan
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+            force (bool): Relire le dossier sur le disque même s'il est dans l'index
+            rules (ScanRules): Règles de parcours de la racine (facultatif)
+            depth (int): Profondeur du dossier sous la racine
+            owner (str): Racine du projet englobant le dossier (facultatif)
+            
+        Returns:
+            tuple: (nom du projet, sous-dossiers à parcourir, le dossier contient des fichiers)
+                ou None si le dossier est illisible ou si le scan a été annulé
+        """
+        listing = self._read_directory(dirpath, cancel_token, force, rules,
+                                       dirpath[len(os.path.join(source, '')):] if depth else '')
+        if listing is None:
+            return None
+        dir_entries, file_entries = listing
+        
+        if self._is_project_root(dir_entries, file_entries):
+            owner = dirpath
+        if owner is not None:
+            self.owners[dirpath] = owner
+            project_dir = owner
+        else:
+            project_dir = dirpath
+        project_name = os.path.basename(project_dir)
+        subdirs = []
+        
+        for name, is_symlink in dir_entries:
+            path = os.path.join(dirpath, name)
+            # Sous-dossier : rattaché au projet du dossier courant
+            self.projects[project_name]['directories'].append({
+                'path': path,
+                'name': name,
+                'source': source
+            })
+            # Comme os.walk, on ne suit pas les liens symboliques vers des dossiers
+            if not is_symlink and (rules is None or rules.allows_depth(depth + 1)):
+                subdirs.append(path)
+        
+        for name, size, mtime, ctime in file_entries:
+            self._add_file(project_name, project_dir, source, name, size, mtime, ctime, dirpath)
+        
+        return project_name, subdirs, bool(file_entries)
+    
+    @staticmethod
+    def _is_project_root(dir_entries, file_entries):
+        """
+        Détection de la racine d'un projet Cubase
+        
+        Args:
+            dir_entries (list): Sous-dossiers [(nom, est_un_lien)]
+            file_entries (list): Fichiers [(nom, taille, mtime, ctime)]
+            
+        Returns:
+            bool: Le dossier contient un .cpr et un sous-dossier standard de Cubase
+        """
+        if not any(name.lower().endswith('.cpr') for name, _, _, _ in file_entries):
+            return False
+        return any(name.lower() in _PROJECT_FOLDERS for name, _ in dir_entries)
+    
+    def _read_directory(self, dirpath, cancel_token=None, force=False, rules=None, rel_dir=''):
+        """
+        Lecture du contenu d'un dossier, depuis l'index si le dossier n'a pas changé
+        
+        Les DirEntry de os.scandir donnent le type de l'entrée sans appel système
+        et un seul stat est fait par fichier.
+        
+        Args:
+            dirpath (str): Chemin du dossier
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+            force (bool): Ignorer l'entrée de l'index (un fichier réécrit sur place
+                ne change pas la date du dossier)
+            rules (ScanRules): Règles d'exclusion, appliquées avant tout stat (facultatif)
+            rel_dir (str): Chemin du dossier relatif à la racine du scan
+            
+        Returns:
+            tuple: (sous-dossiers [(nom, est_un_lien)], fichiers [(nom, taille, mtime, ctime)])
+                ou None si le dossier est illisible ou si le scan a été annulé
+        """
+        rules_key = rules.key() if rules is not None else ''
+        mtime_ns = None
+        if self.index is not None:
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                return None
+            cached = None if force else self.index.lookup(dirpath, mtime_ns, rules_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            return None
+        
+        dir_entries = []
+        file_entries = []
+        if rules is not None and rules.max_entries is not None and len(entries) > rules.max_entries:
+            # Dossier trop volumineux (cache, bibliothèque d'échantillons...) : ignoré
+            print(f"Dossier ignoré ({len(entries)} entrées): {dirpath}")
+            entries = []
+        
+        for entry in entries:
+            if cancel_token is not None and cancel_token.cancelled:
+                return None
+            # Les liens cassés et fichiers inaccessibles sont ignorés
+            try:
+                is_dir = entry.is_dir()
+                if rules is not None and rules.excludes(os.path.join(rel_dir, entry.name), is_dir):
+                    continue
+                if is_dir:
+                    dir_entries.append((entry.name, entry.is_symlink()))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    file_entries.append((entry.name, stat.st_size, stat.st_mtime, stat.st_ctime))
+            except OSError:
+                continue
+        
+        if self.index is not None:
+            self.index.store(dirpath, mtime_ns, dir_entries, file_entries, rules_key)
+        
+        return dir_entries, file_entries
+    
+    def _add_file(self, project_name, project_dir, source, name, size, mtime, ctime, directory=None):
+        """
+        Ajout d'un fichier au projet correspondant
+        
+        Args:
+            project_name (str): Nom du projet
+            project_dir (str): Chemin du dossier du projet
+            source (str): Dossier racine du scan
+            name (str): Nom du fichier
+            size (int): Taille du fichier
+            mtime (float): Date de modification (timestamp)
+            ctime (float): Date de création (timestamp)
+            directory (str): Dossier contenant le fichier, s'il diffère de project_dir
+        """
+        project = self.projects[project_name]
+        
+        # Initialisation du chemin du dossier du projet s'il n'existe pas encore
+        if not project.get('project_dir'):
+            project['project_dir'] = project_dir
+        
+        # Si le projet n'a pas encore de source, on l'initialise
+        if not project.get('source'):
+            project['source'] = source
+        # Si le projet existe déjà mais vient d'une autre source, on le marque comme multi-source
+        elif project['source'] != source:
+            project['source'] = "Plusieurs sources"
+        
+        # Ajout du fichier à la catégorie correspondante
+        ext = os.path.splitext(name)[1].lower()
+        if ext == '.cpr':
+            files = project['cpr_files']
+        elif ext == '.bak':
+            files = project['bak_files']
+        elif ext == '.wav':
+            files = project['wav_files']
+        else:
+            files = project['other_files']
+        files.append(directory or project_dir, name, size, mtime, ctime, source)
+    
+    def refresh_directories(self, root_dir, dirpaths):
+        """
+        Mise à jour incrémentale des projets après des modifications sur le disque
+        
+        Le contenu de chaque dossier modifié (et de ses sous-dossiers) est retiré
+        des projets puis relu ; les dossiers disparus sont simplement retirés.
+        Les sous-dossiers inchangés sont servis par l'index, sans relecture.
+        
+        Args:
+            root_dir (str): Dossier racine du scan initial
+            dirpaths (iterable): Dossiers modifiés
+            
+        Returns:
+            tuple: (noms des projets modifiés, noms des projets disparus)
+        """
+        source = sys.intern(str(Path(root_dir)))
+        rules = self._rules_for(source)
+        if self.index is not None:
+            self.index.load()
+        
+        # Un dossier dont un parent est aussi modifié est traité avec ce parent
+        roots = []
+        for dirpath in sorted(str(Path(d)) for d in dirpaths):
+            if not any(dirpath == r or dirpath.startswith(os.path.join(r, '')) for r in roots):
+                roots.append(dirpath)
+        
+        affected = set()
+        for dirpath in roots:
+            affected |= self._remove_subtree(dirpath)
+            if not os.path.isdir(dirpath):
+                continue
+            root_depth = 0 if dirpath == source else len(Path(dirpath).relative_to(source).parts)
+            stack = [(dirpath, root_depth, self.owners.get(os.path.dirname(dirpath)))]
+            while stack:
+                current, depth, owner = stack.pop()
+                # Le dossier signalé est relu sur le disque, ses sous-dossiers via l'index
+                visit = self._visit_directory(current, source, force=(current == dirpath),
+                                              rules=rules, depth=depth, owner=owner)
+                if visit is None:
+                    continue
+                project_name, subdirs, _ = visit
+                affected.add(project_name)
+                owner = self.owners.get(current)
+                stack.extend((path, depth + 1, owner) for path in reversed(subdirs))
+        
+        if self.index is not None:
+            self.index.save()
+        
+        updated = set()
+        removed = set()
+        for project_name in affected:
+            project = self.projects.get(project_name)
+            if project is None:
+                continue
+            file_lists = [project[key] for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']]
+            if not project['directories'] and not any(file_lists):
+                del self.projects[project_name]
+                removed.add(project_name)
+                continue
+            # Le dossier du projet a pu disparaître : on le déduit des fichiers restants
+            if not os.path.isdir(project.get('project_dir', '')) and any(file_lists):
+                project['project_dir'] = next(files.directories[0] for files in file_lists if files)
+            updated.add(project_name)
+        
+        self._create_dataframe()
+        return updated, removed
+    
+    def _remove_subtree(self, dirpath):
+        """
+        Retrait des fichiers et sous-dossiers d'un dossier et de sa descendance
+        
+        Les fichiers d'un dossier appartiennent au projet qui le contient (voir
+        self.owners) ou à défaut au projet portant le nom du dossier : la
+        descendance est donc retrouvée sans accès disque.
+        
+        Args:
+            dirpath (str): Chemin du dossier
+            
+        Returns:
+            set: Noms des projets modifiés
+        """
+        affected = set()
+        stack = [dirpath]
+        while stack:
+            current = stack.pop()
+            project_name = os.path.basename(self.owners.pop(current, current))
+            project = self.projects.get(project_name)
+            if project is None:
+                continue
+            kept = []
+            for entry in project['directories']:
+                if os.path.dirname(entry['path']) == current:
+                    stack.append(entry['path'])
+                else:
+                    kept.append(entry)
+            project['directories'] = kept
+            for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']:
+                project[key].remove_directory(current)
+            affected.add(project_name)
+        return affected
+    
+    def scan_multiple_directories(self, dir_list, progress_callback=None, workers_per_device=1,
+                                  projects_callback=None, cancel_token=None):
+        """
+        Scan de plusieurs dossiers racines en parallèle
+        
+        Les racines sont regroupées par périphérique (st_dev) : chaque disque ou
+        partage réseau est parcouru par au plus workers_per_device threads, et les
+        périphériques distincts sont parcourus simultanément. Les résultats de
+        chaque racine sont ensuite fusionnés dans l'ordre de dir_list.
         
         Args:
             dir_list (list): Liste des chemins des dossiers à scanner
+            progress_callback (callable): Fonction appelée avec le pourcentage
+                d'avancement global (0-100)
+            workers_per_device (int): Nombre de racines scannées simultanément
+                sur un même périphérique
+            projects_callback (callable): Fonction appelée avec des lots de projets
+                au fil du scan ; les lots sont propres à chaque racine, un projet
+                présent sur plusieurs racines n'est complet que dans le résultat final
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
             
         Returns:
             dict: Dictionnaire des projets trouvés
         """
-        for directory in dir_list:
-            self.scan_directory(directory)
+        workers_per_device = max(1, workers_per_device or 1)
+        
+        # Regroupement des racines par périphérique
+        roots_by_device = defaultdict(list)
+        for position, directory in enumerate(dir_list):
+            if not Path(directory).exists():
+                print(f"Le dossier {directory} n'existe pas!")
+                continue
+            roots_by_device[os.stat(directory).st_dev].append((position, directory))
+        
+        if not roots_by_device:
+            self._create_dataframe()
+            return self.projects
+        
+        device_slots = {device: threading.Semaphore(workers_per_device) for device in roots_by_device}
+        max_workers = sum(min(len(roots), workers_per_device) for roots in roots_by_device.values())
+        
+        # Progression globale : moyenne des progressions de chaque racine
+        root_progress = {position: 0 for roots in roots_by_device.values() for position, _ in roots}
+        progress_lock = threading.Lock()
+        last_percent = [-1]
+        
+        def report_progress(position, percent):
+            with progress_lock:
+                root_progress[position] = percent
+                total = sum(root_progress.values()) // len(root_progress)
+                if total == last_percent[0]:
+                    return
+                last_percent[0] = total
+            if progress_callback:
+                progress_callback(total)
+        
+        def scan_root(position, directory, device):
+            with device_slots[device]:
+                scanner = CubaseScanner(index=self.index, rules=self.rules)
+                if cancel_token is None or not cancel_token.cancelled:
+                    scanner._scan_root(directory, lambda percent: report_progress(position, percent),
+                                       projects_callback, cancel_token)
+                return scanner
+        
+        # Alternance des périphériques dans la file pour ne pas bloquer un
+        # thread sur un disque déjà occupé alors qu'un autre est libre
+        queue = []
+        device_queues = [list(roots) for roots in roots_by_device.values()]
+        while any(device_queues):
+            for device, roots in zip(roots_by_device, device_queues):
+                if roots:
+                    position, directory = roots.pop(0)
+                    queue.append((position, directory, device))
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(scan_root, *task): task[0] for task in queue}
+            for future, position in futures.items():
+                results[position] = future.result()
+        
+        # Fusion dans l'ordre des racines pour un résultat déterministe
+        for position in sorted(results):
+            self._merge_projects(results[position].projects)
+            self.owners.update(results[position].owners)
+        
+        if self.index is not None:
+            self.index.save()
+        
+        self._create_dataframe()
         
         return self.projects
     
+    def _merge_projects(self, projects):
+        """
+        Fusion des projets d'un autre scan dans self.projects
+        
+        Args:
+            projects (dict): Projets à fusionner
+        """
+        for project_name, project_data in projects.items():
+            project = self.projects[project_name]
+            for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files', 'directories']:
+                project[key].extend(project_data[key])
+            
+            if not project.get('project_dir'):
+                project['project_dir'] = project_data.get('project_dir', '')
+            
+            source = project_data.get('source', '')
+            if not source:
+                continue
+            if not project.get('source'):
+                project['source'] = source
+            elif project['source'] != source:
+                project['source'] = "Plusieurs sources"
+    
     def _create_dataframe(self):
         """
         Création d'une liste de dictionnaires à partir des projets trouvés
         """
-        data = []
+        self.df_projects = [
+            self._project_summary(project_name, project_data)
+            for project_name, project_data in self.projects.items()
+        ]
+        return self.df_projects
+    
+    def _project_summary(self, project_name, project_data):
+        """
+        Création de la ligne de synthèse d'un projet
         
-        for project_name, project_data in self.projects.items():
-            # Trouver le fichier CPR le plus récent
-            latest_cpr = None
-            if project_data['cpr_files']:
-                latest_cpr = max(project_data['cpr_files'], 
-                                key=lambda x: x['modified'])
-            
-            # Calculer les statistiques
-            total_size = sum(f['size'] for files in [
-                project_data['cpr_files'], 
-                project_data['bak_files'],
-                project_data['wav_files'],
-                project_data['other_files']
-            ] for f in files)
+        Les agrégats (taille cumulée, CPR le plus récent) sont tenus à jour par
+        les FileList pendant le scan : le coût ne dépend pas du nombre de fichiers.
+        
+        Args:
+            project_name (str): Nom du projet
+            project_data (dict): Données du projet
             
-            # Correction : si project_dir est vide, on le déduit du chemin du dernier fichier trouvé
-            project_dir = project_data.get('project_dir', '')
-            if not project_dir:
-                # Cherche le chemin du dossier du dernier fichier CPR/Bak/Wav/Other trouvé
-                for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']:
-                    if project_data[key]:
-                        project_dir = str(Path(project_data[key][-1]['path']).parent)
-                        break
-            data.append({
-                'project_name': project_name,
-                'source': project_data.get('source', ''),
-                'project_dir': project_dir,
-                'latest_cpr': latest_cpr['path'] if latest_cpr else None,
-                'latest_cpr_date': latest_cpr['modified'] if latest_cpr else None,
-                'cpr_count': len(project_data['cpr_files']),
-                'bak_count': len(project_data['bak_files']),
-                'wav_count': len(project_data['wav_files']),
-                'other_count': len(project_data['other_files']),
-                'total_size': total_size,
-                'total_size_mb': round(total_size / (1024 * 1024), 2)
-            })
+        Returns:
+            dict: Synthèse du projet (une ligne du tableau des projets)
+        """
+        # Trouver le fichier CPR le plus récent
+        latest_cpr = project_data['cpr_files'].latest()
         
-        self.df_projects = data
-        return self.df_projects
+        # Calculer les statistiques
+        total_size = sum(project_data[key].total_size() for key in [
+            'cpr_files', 'bak_files', 'wav_files', 'other_files'
+        ])
+        
+        # Correction : si project_dir est vide, on le déduit du chemin du dernier fichier trouvé
+        project_dir = project_data.get('project_dir', '')
+        if not project_dir:
+            # Cherche le chemin du dossier du dernier fichier CPR/Bak/Wav/Other trouvé
+            for key in ['cpr_files', 'bak_files', 'wav_files', 'other_files']:
+                if project_data[key]:
+                    project_dir = project_data[key].directories[-1]
+                    break
+        return {
+            'project_name': project_name,
+            'source': project_data.get('source', ''),
+            'project_dir': project_dir,
+            'latest_cpr': latest_cpr.path if latest_cpr else None,
+            'latest_cpr_date': latest_cpr.modified if latest_cpr else None,
+            'cpr_count': len(project_data['cpr_files']),
+            'bak_count': len(project_data['bak_files']),
+            'wav_count': len(project_data['wav_files']),
+            'other_count': len(project_data['other_files']),
+            'total_size': total_size,
+            'total_size_mb': round(total_size / (1024 * 1024), 2)
+        }
+    
+    def get_directories(self, root_dir):
+        """
+        Liste des dossiers rencontrés lors du scan d'une racine
+        
+        Args:
+            root_dir (str): Dossier racine du scan
+            
+        Returns:
+            list: Chemins de la racine et de tous ses sous-dossiers
+        """
+        source = str(Path(root_dir))
+        directories = [source]
+        for project_data in self.projects.values():
+            directories.extend(entry['path'] for entry in project_data['directories']
+                               if entry['source'] == source)
+        return directories
     
     def get_project_details(self, project_name):
         """
@@ -186,6 +670,31 @@ class CubaseScanner:
         """
         return self.projects.get(project_name, None)
     
+    def project_relative_path(self, file_path, project_dir=''):
+        """
+        Chemin d'un fichier relatif à la racine de son projet
+        
+        Les fichiers des sous-dossiers d'un projet (Audio, Edits, Fades,
+        Freeze...) gardent leur sous-dossier : deux fichiers de même nom dans
+        des sous-dossiers différents ne se confondent pas à la copie.
+        
+        Args:
+            file_path (str): Chemin du fichier
+            project_dir (str): Dossier du projet, utilisé si le dossier du
+                fichier n'est rattaché à aucune racine de projet (facultatif)
+            
+        Returns:
+            Path: Chemin relatif (le nom seul pour un fichier hors d'un projet)
+        """
+        directory = os.path.dirname(file_path)
+        root = self.owners.get(directory) or project_dir
+        if root:
+            try:
+                return Path(file_path).relative_to(root)
+            except ValueError:
+                pass
+        return Path(os.path.basename(file_path))
+    
     def copy_project(self, project_name, destination, keep_bak=False, remove_dotunderscore=False, new_project_name="", project_notes=""):
         """
         Copie d'un projet vers un dossier de destination selon la structure Cubase
@@ -208,6 +717,7 @@ class CubaseScanner:
         # Détermination du nom du dossier de destination
         dest_project_name = new_project_name if new_project_name else project_name
         dest_project_dir = Path(destination) / dest_project_name
+        project_dir = project.get('project_dir', '')
         
         # Création du dossier de destination
         try:
@@ -219,9 +729,10 @@ class CubaseScanner:
         # Copie des fichiers CPR
         for file_info in project['cpr_files']:
             src_path = Path(file_info['path'])
-            dest_path = dest_project_dir / src_path.name
+            dest_path = dest_project_dir / self.project_relative_path(file_info['path'], project_dir)
             
             try:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(src_path, dest_path)
                 print(f"Copié: {src_path} -> {dest_path}")
             except Exception as e:
@@ -231,9 +742,10 @@ class CubaseScanner:
         if keep_bak:
             for file_info in project['bak_files']:
                 src_path = Path(file_info['path'])
-                dest_path = dest_project_dir / src_path.name
+                dest_path = dest_project_dir / self.project_relative_path(file_info['path'], project_dir)
                 
                 try:
+                    dest_path.parent.mkdir(parents=True, exist_ok=True)
                     shutil.copy2(src_path, dest_path)
                     print(f"Copié: {src_path} -> {dest_path}")
                 except Exception as e:
@@ -248,9 +760,10 @@ class CubaseScanner:
                 print(f"Ignoré (._): {src_path}")
                 continue
             
-            dest_path = dest_project_dir / src_path.name
+            dest_path = dest_project_dir / self.project_relative_path(file_info['path'], project_dir)
             
             try:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(src_path, dest_path)
                 print(f"Copié: {src_path} -> {dest_path}")
             except Exception as e:
@@ -265,9 +778,10 @@ class CubaseScanner:
                 print(f"Ignoré (._): {src_path}")
                 continue
             
-            dest_path = dest_project_dir / src_path.name
+            dest_path = dest_project_dir / self.project_relative_path(file_info['path'], project_dir)
             
             try:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(src_path, dest_path)
                 print(f"Copié: {src_path} -> {dest_path}")
             except Exception as e:
@@ -290,11 +804,12 @@ class CubaseScanner:
         Réinitialisation du scanner
         """
         self.projects = defaultdict(lambda: {
-            'cpr_files': [],
-            'bak_files': [],
-            'wav_files': [],
-            'other_files': [],
+            'cpr_files': FileList(),
+            'bak_files': FileList(),
+            'wav_files': FileList(),
+            'other_files': FileList(),
             'directories': [],
             'source': ''
         })
+        self.owners = {}
         self.df_projects = []
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache persistant des analyses VSTi des fichiers CPR
+"""
+
+import os
+import time
+
+from config.constants import DEFAULT_VSTI_CACHE_FILE
+from services.json_store import JsonStore
+from services.scan_index import RECENT_DELAY
+from services.vsti_manager import vsti_catalogue
+
+# Version du format du cache
+CACHE_VERSION = 1
+
+
+def vsti_list_hash():
+    """
+    Empreinte de la liste des VSTi connus
+
+    Calculée sur le contenu du catalogue plutôt que sur le fichier, dont
+    l'écriture est différée après une modification.
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    return vsti_catalogue.content_hash()
+
+
+class VstiCache(JsonStore):
+    """
+    Résultats de trouve_vsti, stockés dans ~/.trie_morceaux/vsti_cache.json
+
+    Une entrée est indexée par le chemin du CPR et reste valide tant que la
+    taille et la date de modification du fichier, ainsi que l'empreinte de la
+    liste des VSTi connus, n'ont pas changé.
+    """
+
+    VERSION = CACHE_VERSION
+    PAYLOAD_KEY = 'files'
+    DEFAULT_FILE = DEFAULT_VSTI_CACHE_FILE
+    LABEL = "du cache VSTi"
+
+    def lookup(self, cpr_path, list_hash=None):
+        """
+        Recherche du résultat d'analyse d'un CPR
+
+        Args:
+            cpr_path (str): Chemin du fichier CPR
+            list_hash (str): Empreinte de la liste des VSTi (calculée si absente)
+
+        Returns:
+            set: VSTi trouvés si le fichier n'a pas changé depuis l'analyse,
+                sinon None
+        """
+        self.load()
+        try:
+            stat = os.stat(cpr_path)
+        except OSError:
+            return None
+        if list_hash is None:
+            list_hash = vsti_list_hash()
+        with self._lock:
+            entry = self.entries.get(str(cpr_path))
+        if (entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns
+                or entry['list'] != list_hash):
+            return None
+        return set(entry['vsti'])
+
+    def store(self, cpr_path, vsti, stat=None, list_hash=None):
+        """
+        Enregistrement du résultat d'analyse d'un CPR
+
+        Args:
+            cpr_path (str): Chemin du fichier CPR
+            vsti (set): VSTi trouvés
+            stat (os.stat_result): État du fichier avant l'analyse (relu si absent)
+            list_hash (str): Empreinte de la liste des VSTi utilisée pour l'analyse
+        """
+        self.load()
+        try:
+            if stat is None:
+                stat = os.stat(cpr_path)
+        except OSError:
+            return
+        if list_hash is None:
+            list_hash = vsti_list_hash()
+        with self._lock:
+            if time.time() - stat.st_mtime_ns / 1e9 < RECENT_DELAY:
+                # Fichier en cours d'enregistrement par Cubase : on le réanalysera
+                self.entries.pop(str(cpr_path), None)
+                return
+            self.entries[str(cpr_path)] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'list': list_hash,
+                'vsti': sorted(vsti)
+            }
+            self._dirty = True
+
+    def analyse(self, cpr_path, progress_callback=None):
+        """
+        Analyse VSTi d'un CPR, depuis le cache si le fichier n'a pas changé
+
+        Le résultat d'une analyse interrompue n'est pas enregistré.
+
+        Args:
+            cpr_path (str): Chemin du fichier CPR
+            progress_callback (callable): Voir trouve_vsti
+
+        Returns:
+            tuple: (VSTi trouvés, analyse interrompue)
+        """
+        from services.lectureCPR import trouve_vsti
+
+        list_hash = vsti_list_hash()
+        cached = self.lookup(cpr_path, list_hash)
+        if cached is not None:
+            return cached, False
+
+        interrupted = False
+
+        def callback(done, total):
+            nonlocal interrupted
+            if progress_callback and progress_callback(done, total) is False:
+                interrupted = True
+                return False
+            return None
+
+        stat = os.stat(cpr_path)
+        found = trouve_vsti(cpr_path, progress_callback=callback)
+        if not interrupted:
+            self.store(cpr_path, found, stat, list_hash)
+            self.save()
+        return found, interrupted
+
+# Instance globale du cache des analyses VSTi
+vsti_cache = VstiCache()
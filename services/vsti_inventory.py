@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Inventaire des VSTi utilisés par l'ensemble des projets d'un workspace
+"""
+
+import os
+import io
+import re
+import csv
+import json
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from services.vsti_cache import vsti_cache, vsti_list_hash
+
+# Intervalle de consultation du jeton d'annulation pendant les analyses (secondes)
+CANCEL_POLL_INTERVAL = 0.1
+
+# Numéro d'instance ajouté par Cubase ("Serum 01", "Kick 2 01")
+INSTANCE_SUFFIX = re.compile(r'\s+\d{2}$')
+
+
+def plugin_key(vsti_name):
+    """
+    Nom du plugin d'une instance trouvée dans un CPR
+
+    Args:
+        vsti_name (str): Nom trouvé par trouve_vsti ("Serum 01", "Kontakt")
+
+    Returns:
+        str: Nom sans numéro d'instance ("Serum", "Kontakt")
+    """
+    return INSTANCE_SUFFIX.sub('', vsti_name.strip())
+
+
+# Événement d'annulation partagé avec le pool (dans chaque processus du pool)
+_cancel_event = None
+
+
+def _init_worker(cancel_event):
+    """
+    Initialisation d'un processus du pool
+
+    Args:
+        cancel_event (multiprocessing.Event): Levé quand l'inventaire est annulé
+    """
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def _analyse_cpr(cpr_path):
+    """
+    Analyse d'un CPR dans un processus du pool
+
+    Les messages de trouve_vsti sont ignorés : des milliers d'analyses en
+    parallèle rendraient la sortie illisible. L'analyse s'interrompt dès que
+    l'événement d'annulation est levé.
+
+    Args:
+        cpr_path (str): Chemin du fichier CPR
+
+    Returns:
+        tuple: (chemin, VSTi trouvés, état du fichier avant l'analyse, erreur)
+    """
+    from services.lectureCPR import trouve_vsti
+    cancel_event = _cancel_event
+    progress_callback = None
+    if cancel_event is not None:
+        progress_callback = lambda done, total: not cancel_event.is_set()
+    try:
+        stat = os.stat(cpr_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            found = trouve_vsti(cpr_path, progress_callback)
+        if cancel_event is not None and cancel_event.is_set():
+            return cpr_path, [], None, "Analyse interrompue"
+        return cpr_path, sorted(found), stat, None
+    except Exception as e:
+        return cpr_path, [], None, str(e)
+
+
+class VstiInventory:
+    """
+    Inventaire VSTi d'un ensemble de projets
+
+    Le CPR le plus récent de chaque projet est analysé (sur un pool de
+    processus pour les fichiers absents du cache des analyses), puis un index
+    inversé plugin -> projets est construit pour les recherches et l'export.
+    """
+
+    def __init__(self):
+        """Initialisation d'un inventaire vide"""
+        # Projet -> {'project_dir', 'latest_cpr', 'vsti': [instances trouvées]}
+        self.projects = {}
+        # Plugin -> [projets qui l'utilisent] (index inversé)
+        self.plugins = {}
+        # CPR -> message d'erreur
+        self.errors = {}
+        self.complete = False
+
+    def build(self, projects, progress_callback=None, cancel_token=None, max_workers=None, cache=vsti_cache):
+        """
+        Analyse des projets et construction de l'index
+
+        Args:
+            projects (list): Lignes de synthèse des projets (CubaseScanner.df_projects)
+            progress_callback (callable): Fonction appelée avec le pourcentage
+                d'avancement (0-100)
+            cancel_token (CancelToken): Jeton d'annulation (facultatif)
+            max_workers (int): Nombre de processus (nombre de cœurs par défaut)
+            cache (VstiCache): Cache des analyses VSTi
+
+        Returns:
+            bool: True si tous les projets ont été analysés, False si annulé
+        """
+        self.projects = {}
+        self.errors = {}
+        self.complete = False
+
+        targets = {}
+        for project in projects:
+            cpr_path = project.get('latest_cpr')
+            if cpr_path:
+                targets[cpr_path] = project
+        total = len(targets)
+        done = 0
+
+        def report():
+            if progress_callback and total:
+                progress_callback(int(done * 100 / total))
+
+        # Projets déjà analysés et inchangés : servis par le cache
+        list_hash = vsti_list_hash()
+        pending = []
+        for cpr_path, project in targets.items():
+            cached = cache.lookup(cpr_path, list_hash)
+            if cached is None:
+                pending.append(cpr_path)
+            else:
+                self._add_project(project, sorted(cached))
+                done += 1
+        report()
+
+        cancelled = False
+        if pending:
+            # Les processus relisent vsti_list.json : les modifications du
+            # catalogue encore en attente d'enregistrement y sont écrites, sinon
+            # leurs résultats seraient rangés sous l'empreinte de la nouvelle liste
+            from services.vsti_manager import vsti_catalogue
+            store_results = vsti_catalogue.flush()
+            if store_results:
+                list_hash = vsti_list_hash()
+            else:
+                print("Liste des VSTi non enregistrée : les analyses ne seront pas mises en cache")
+
+            # Les analyses en cours dans le pool consultent cet événement : à
+            # l'annulation, aucun processus ne continue une analyse abandonnée
+            cancel_event = multiprocessing.Event()
+            executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                           initializer=_init_worker, initargs=(cancel_event,))
+            try:
+                futures = {executor.submit(_analyse_cpr, cpr_path) for cpr_path in pending}
+                while futures and not cancelled:
+                    # Attente par intervalles courts : l'annulation est prise en
+                    # compte sans attendre la fin d'une longue analyse
+                    finished, futures = wait(futures, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        cpr_path, found, stat, error = future.result()
+                        if error is None:
+                            if store_results:
+                                cache.store(cpr_path, found, stat, list_hash)
+                            self._add_project(targets[cpr_path], found)
+                        else:
+                            print(f"Erreur lors de l'analyse de {cpr_path}: {error}")
+                            self.errors[cpr_path] = error
+                        done += 1
+                    if finished:
+                        report()
+                    if cancel_token is not None and cancel_token.cancelled:
+                        cancelled = True
+            finally:
+                # Annulation ou erreur : les analyses en attente sont abandonnées
+                # et celles en cours interrompues. L'arrêt du pool n'attend que
+                # leur prochain point de contrôle, et aucun processus ne reste actif
+                cancel_event.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                cache.save()
+
+        self._build_index()
+        self.complete = not cancelled
+        return self.complete
+
+    def _add_project(self, project, vsti):
+        """Enregistrement du résultat d'un projet"""
+        self.projects[project['project_name']] = {
+            'project_dir': project.get('project_dir', ''),
+            'latest_cpr': project.get('latest_cpr'),
+            'vsti': list(vsti)
+        }
+
+    def _build_index(self):
+        """Construction de l'index inversé plugin -> projets"""
+        plugins = {}
+        for project_name, data in self.projects.items():
+            for vsti_name in data['vsti']:
+                plugins.setdefault(plugin_key(vsti_name), set()).add(project_name)
+        self.plugins = {plugin: sorted(names, key=str.lower)
+                        for plugin, names in sorted(plugins.items(), key=lambda item: item[0].lower())}
+
+    def projects_using(self, plugin):
+        """
+        Projets utilisant un plugin
+
+        Args:
+            plugin (str): Nom du plugin (avec ou sans numéro d'instance)
+
+        Returns:
+            list: Noms des projets
+        """
+        return self.plugins.get(plugin_key(plugin), [])
+
+    def search(self, text):
+        """
+        Plugins dont le nom contient un texte (insensible à la casse)
+
+        Args:
+            text (str): Texte recherché ('' : tous les plugins)
+
+        Returns:
+            list: Noms des plugins, triés
+        """
+        text = text.strip().lower()
+        return [plugin for plugin in self.plugins if text in plugin.lower()]
+
+    def export_csv(self, path):
+        """
+        Export de l'index au format CSV (un plugin par ligne)
+
+        Args:
+            path (str): Fichier de destination
+        """
+        from services.vsti_manager import get_vsti_editor
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['plugin', 'editor', 'project_count', 'projects'])
+            for plugin, project_names in self.plugins.items():
+                writer.writerow([plugin, get_vsti_editor(plugin), len(project_names), '; '.join(project_names)])
+
+    def export_json(self, path):
+        """
+        Export de l'inventaire complet au format JSON
+
+        Args:
+            path (str): Fichier de destination
+        """
+        from services.vsti_manager import get_vsti_editor
+        data = {
+            'complete': self.complete,
+            'plugins': {
+                plugin: {'editor': get_vsti_editor(plugin), 'projects': project_names}
+                for plugin, project_names in self.plugins.items()
+            },
+            'projects': self.projects,
+            'errors': self.errors
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
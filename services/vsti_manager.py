@@ -1,73 +1,539 @@
 import json
 import os
-import re
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
 
 VSTI_LIST_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'vsti_list.json')
 VSTI_LIST_PATH = os.path.abspath(VSTI_LIST_PATH)
 
+def vsti_entry_name(vsti):
+    """Nom d'une entrée de la liste des VSTi (dict ou chaîne)"""
+    if isinstance(vsti, dict):
+        return vsti.get("name", "")
+    return vsti
+
 def load_vsti_list():
-    if not os.path.exists(VSTI_LIST_PATH):
-        return []
-    with open(VSTI_LIST_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return vsti_catalogue.snapshot()
 
 def save_vsti_list(vsti_list):
-    with open(VSTI_LIST_PATH, 'w', encoding='utf-8') as f:
-        json.dump(vsti_list, f, ensure_ascii=False, indent=2)
+    vsti_catalogue.replace(vsti_list)
+    vsti_catalogue.flush()
 
 def add_vsti(name):
-    vsti_list = load_vsti_list()
-    if name not in vsti_list:
-        vsti_list.append(name)
-        save_vsti_list(vsti_list)
+    vsti_catalogue.add(name)
 
 def remove_vsti(name):
-    vsti_list = load_vsti_list()
-    if name in vsti_list:
-        vsti_list.remove(name)
-        save_vsti_list(vsti_list)
+    vsti_catalogue.remove(name)
 
 
 def update_vsti(old_name, new_name):
-    vsti_list = load_vsti_list()
-    if old_name in vsti_list:
-        idx = vsti_list.index(old_name)
-        vsti_list[idx] = new_name
-        save_vsti_list(vsti_list)
+    vsti_catalogue.update(old_name, new_name)
+
+
+# Délai d'écriture de vsti_list.json après la dernière modification (secondes)
+SAVE_DELAY = 1.0
+
+
+class VstiCatalogue:
+    """
+    Liste des VSTi connus, partagée par tout le processus
+
+    La liste est lue une fois puis revalidée par la date de modification du
+    fichier : une modification extérieure est prise en compte au prochain
+    accès. Les index de get_vsti_editor et l'automate de trouve_vsti sont
+    construits une seule fois par version de la liste.
+
+    Les modifications (add, remove, update, replace) sont faites en mémoire et
+    notifiées aux abonnés ; le fichier est réécrit de façon atomique SAVE_DELAY
+    secondes après la dernière modification (ou par flush). Tant qu'une
+    écriture est en attente, les modifications en mémoire l'emportent sur le
+    fichier.
+
+    get_vsti_editor applique quatre règles, par ordre de priorité, et retient
+    pour chacune la première entrée de la liste qui convient :
+    1. nom identique (casse ignorée) ;
+    2. nom suivi d'espaces et/ou de chiffres ("Serum 01") ;
+    3. même comparaison sans les espaces ("Serum01") ;
+    4. nom contenu dans le nom cherché.
+    Chaque règle est servie par un index (dictionnaires et arbre de préfixes) :
+    une recherche coûte O(longueur du nom) au lieu de parcourir la liste.
+    """
+
+    def __init__(self, path=VSTI_LIST_PATH, save_delay=SAVE_DELAY):
+        """
+        Initialisation du catalogue (chargé à la première utilisation)
+
+        Args:
+            path (str): Chemin de vsti_list.json
+            save_delay (float): Délai d'écriture après une modification (secondes)
+        """
+        self.path = path
+        self.save_delay = save_delay
+        # Numéro de version, incrémenté à chaque changement de la liste
+        self.version = 0
+        self._entries = None
+        self._names = ()
+        self._indexed = False
+        self._matcher = None
+        self._hash = None
+        # État du fichier (date de modification, taille) lors de la dernière lecture/écriture
+        self._file_state = None
+        self._dirty = False
+        self._timer = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+        # Profondeur d'imbrication du verrou et changement à notifier à sa libération
+        self._lock_depth = 0
+        self._notify_pending = False
+
+    @contextmanager
+    def _locked(self):
+        """
+        Verrou du catalogue ; un changement constaté pendant qu'il est tenu est
+        notifié aux abonnés une fois le verrou le plus externe libéré
+        """
+        notify = False
+        try:
+            with self._lock:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    notify = self._lock_depth == 0 and self._notify_pending
+                    if notify:
+                        self._notify_pending = False
+        finally:
+            if notify:
+                self._notify()
+
+    @property
+    def entries(self):
+        """Entrées de la liste des VSTi (à ne pas modifier : voir snapshot)"""
+        with self._locked():
+            self._revalidate()
+            return self._entries
+
+    def snapshot(self):
+        """
+        Copie modifiable de la liste
+
+        Returns:
+            list: Entrées de la liste (chaînes ou dict copiés)
+        """
+        return [dict(vst) if isinstance(vst, dict) else vst for vst in self.entries]
+
+    def names(self):
+        """
+        Noms des VSTi, dans l'ordre de la liste
+
+        Returns:
+            tuple: Noms (une entrée sans nom donne '')
+        """
+        with self._locked():
+            self._revalidate()
+            return self._names
+
+    def matcher(self):
+        """
+        Automate de recherche des VSTi connus (voir lectureCPR.VstiMatcher)
+
+        Returns:
+            VstiMatcher: Automate de la version courante de la liste
+        """
+        from services.lectureCPR import VstiMatcher
+        with self._locked():
+            self._revalidate()
+            if self._matcher is None:
+                self._matcher = VstiMatcher(self._names)
+            return self._matcher
+
+    def content_hash(self):
+        """
+        Empreinte du contenu de la liste
+
+        Returns:
+            str: Empreinte hexadécimale
+        """
+        with self._locked():
+            self._revalidate()
+            if self._hash is None:
+                content = json.dumps(self._entries, ensure_ascii=False, sort_keys=True)
+                self._hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+            return self._hash
+
+    def subscribe(self, callback):
+        """
+        Abonnement aux changements de la liste
+
+        Le rappel est appelé sans argument, depuis le thread qui a constaté le
+        changement (un widget doit passer par un signal Qt).
+
+        Args:
+            callback (callable): Fonction appelée après chaque changement
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Désabonnement
+
+        Args:
+            callback (callable): Fonction passée à subscribe
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self):
+        """Appel des abonnés (hors verrou)"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Erreur lors de la notification d'un changement de la liste des VSTi: {e}")
+
+    def _read_file_state(self):
+        """Date de modification et taille du fichier (None s'il n'existe pas)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _revalidate(self):
+        """Relecture de la liste si le fichier a changé (sous _locked)"""
+        if self._entries is not None and (self._dirty or self._read_file_state() == self._file_state):
+            return
+        self.reload()
+
+    def reload(self):
+        """
+        Relecture de la liste depuis le fichier
+
+        Les modifications non encore écrites sont abandonnées.
+        """
+        with self._locked():
+            self._cancel_save()
+            self._dirty = False
+            self._file_state = self._read_file_state()
+            entries = []
+            if self._file_state is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                except Exception as e:
+                    print(f"Erreur lors du chargement de la liste des VSTi: {e}")
+                    entries = self._entries if self._entries is not None else []
+            first_load = self._entries is None
+            if not first_load and entries == self._entries:
+                return
+            self._set_entries(entries)
+            if not first_load:
+                self._notify_pending = True
+
+    def _set_entries(self, entries):
+        """Remplacement des entrées et invalidation des données dérivées (sous verrou)"""
+        self._entries = entries
+        self._names = tuple(vsti_entry_name(vst) for vst in entries)
+        self._matcher = None
+        self._hash = None
+        self.version += 1
+        self._build_index()
+
+    def _commit(self, entries):
+        """
+        Application d'une modification en mémoire et écriture différée (sous
+        verrou : les abonnés sont prévenus à la libération de _locked)
+        """
+        self._set_entries(entries)
+        self._dirty = True
+        self._notify_pending = True
+        self._cancel_save()
+        self._timer = threading.Timer(self.save_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_save(self):
+        """Annulation de l'écriture différée en attente (sous verrou)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _position(self, name):
+        """Position de la première entrée portant un nom (None si absente)"""
+        for position, vst in enumerate(self.entries):
+            if vsti_entry_name(vst) == name:
+                return position
+        return None
+
+    def add(self, vsti):
+        """
+        Ajout d'un VSTi
+
+        Args:
+            vsti (str | dict): Nom ou entrée complète ({'name', 'editor'})
+
+        Returns:
+            bool: True si ajouté, False si le nom est vide ou déjà présent
+        """
+        with self._locked():
+            name = vsti_entry_name(vsti)
+            if not name or self._position(name) is not None:
+                return False
+            entries = self.snapshot()
+            # Même forme que les entrées existantes
+            if isinstance(vsti, str) and entries and isinstance(entries[0], dict):
+                vsti = {"name": vsti}
+            entries.append(vsti)
+            self._commit(entries)
+            return True
+
+    def remove(self, name):
+        """
+        Suppression d'un VSTi
+
+        Args:
+            name (str): Nom du VSTi
+
+        Returns:
+            bool: True si supprimé
+        """
+        with self._locked():
+            position = self._position(name)
+            if position is None:
+                return False
+            entries = self.snapshot()
+            entries.pop(position)
+            self._commit(entries)
+            return True
+
+    def update(self, old_name, vsti):
+        """
+        Modification d'un VSTi
+
+        Args:
+            old_name (str): Nom actuel
+            vsti (str | dict): Nouveau nom (l'éditeur est conservé) ou nouvelle entrée
+
+        Returns:
+            bool: True si modifié, False si absent ou si le nouveau nom existe déjà
+        """
+        with self._locked():
+            position = self._position(old_name)
+            new_name = vsti_entry_name(vsti)
+            if position is None or not new_name:
+                return False
+            if new_name != old_name and self._position(new_name) is not None:
+                return False
+            entries = self.snapshot()
+            if isinstance(vsti, str) and isinstance(entries[position], dict):
+                entries[position]["name"] = vsti
+            else:
+                entries[position] = vsti
+            if entries == self._entries:
+                return True
+            self._commit(entries)
+            return True
+
+    def replace(self, vsti_list):
+        """
+        Remplacement de toute la liste
+
+        Args:
+            vsti_list (list): Nouvelles entrées
+        """
+        with self._locked():
+            entries = [dict(vst) if isinstance(vst, dict) else vst for vst in vsti_list]
+            if entries == self.entries:
+                return
+            self._commit(entries)
+
+    def merge(self, vsti_list):
+        """
+        Fusion d'entrées dans la liste, en une seule modification
+
+        Un nom absent (casse ignorée) est ajouté ; un nom présent sans éditeur
+        reçoit celui de l'entrée fusionnée. Les entrées existantes ne sont
+        jamais renommées ni supprimées.
+
+        Args:
+            vsti_list (list): Entrées {'name', 'editor'}
+
+        Returns:
+            int: Nombre d'entrées ajoutées ou complétées
+        """
+        with self._locked():
+            entries = self.snapshot()
+            positions = {}
+            for position, vst in enumerate(entries):
+                positions.setdefault(vsti_entry_name(vst).lower(), position)
+            changed = 0
+            for vst in vsti_list:
+                name = vsti_entry_name(vst)
+                if not name:
+                    continue
+                position = positions.get(name.lower())
+                editor = vst.get("editor") if isinstance(vst, dict) else None
+                if position is None:
+                    if entries and isinstance(entries[0], dict) and isinstance(vst, str):
+                        vst = {"name": vst}
+                    positions[name.lower()] = len(entries)
+                    entries.append(dict(vst) if isinstance(vst, dict) else vst)
+                    changed += 1
+                elif editor and isinstance(entries[position], dict) and not entries[position].get("editor"):
+                    entries[position]["editor"] = editor
+                    changed += 1
+            if changed:
+                self._commit(entries)
+            return changed
+
+    def flush(self):
+        """
+        Écriture immédiate des modifications en attente (remplacement atomique)
+
+        Returns:
+            bool: True si le fichier est à jour
+        """
+        with self._lock:
+            self._cancel_save()
+            if not self._dirty:
+                return True
+            try:
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde de la liste des VSTi: {e}")
+                return False
+            self._file_state = self._read_file_state()
+            self._dirty = False
+        # Les analyses en cache restent : elles sont indexées par l'empreinte de
+        # la liste (content_hash) et celles faites avec une autre liste sont ignorées
+        return True
+
+    def _build_index(self):
+        """Construction des index des quatre règles de get_vsti_editor"""
+        entries = self._entries
+        # Mêmes conditions que l'ancien parcours : liste enrichie (nom + éditeur)
+        self._indexed = bool(entries) and isinstance(entries[0], dict) \
+            and 'editor' in entries[0] and 'name' in entries[0]
+        self._exact = {}
+        self._numbered = {}
+        self._compact = {}
+        self._contained = {}
+        if not self._indexed:
+            return
+        for position, vst in enumerate(entries):
+            name = vst['name']
+            # setdefault : la première entrée de la liste l'emporte
+            self._exact.setdefault(name.lower(), position)
+            self._numbered.setdefault(name.strip().lower(), position)
+            self._compact.setdefault(name.lower().replace(' ', ''), position)
+            node = self._contained
+            for char in name.lower():
+                node = node.setdefault(char, {})
+            node.setdefault(None, position)
+
+    def editor_of(self, vsti_name):
+        """
+        Éditeur d'un VSTi (voir les règles dans la documentation de la classe)
+
+        Args:
+            vsti_name (str): Nom du VSTi, éventuellement numéroté
+
+        Returns:
+            str: Éditeur, ou 'Inconnu'
+        """
+        with self._locked():
+            entries = self.entries
+            if not self._indexed:
+                return 'Inconnu'
+            name = vsti_name.strip()
+            lowered = name.lower()
+
+            # 1. Correspondance exacte
+            position = self._exact.get(lowered)
+
+            # 2. Nom + (fin OU espaces + chiffres + fin)
+            if position is None:
+                position = self._first_match(self._numbered, _suffix_bases(lowered, spaces=True))
+
+            # 3. Version sans espaces
+            if position is None:
+                position = self._first_match(self._compact, _suffix_bases(lowered.replace(' ', ''), spaces=False))
+
+            # 4. Vérifier si le VSTi est contenu dans le nom (pour les variantes avec suffixes)
+            if position is None:
+                position = self._first_contained(lowered)
+
+            if position is None:
+                return 'Inconnu'
+            return entries[position].get('editor', 'Inconnu')
+
+    @staticmethod
+    def _first_match(index, keys):
+        """Première entrée de la liste (plus petite position) parmi plusieurs clés"""
+        positions = [index[key] for key in keys if key in index]
+        return min(positions) if positions else None
+
+    def _first_contained(self, lowered):
+        """Première entrée de la liste dont le nom est contenu dans le nom cherché"""
+        best = self._contained.get(None)
+        for start in range(len(lowered)):
+            node = self._contained
+            for char in lowered[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                position = node.get(None)
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+
+
+def _suffix_bases(name, spaces):
+    """
+    Noms de base possibles d'un nom numéroté
+
+    Pour "kick 2 01" : "kick 2 01", "kick 2 0", "kick 2 ", "kick 2" (chiffres
+    en fin de nom, précédés d'espaces si spaces est vrai).
+
+    Args:
+        name (str): Nom en minuscules
+        spaces (bool): Des espaces peuvent précéder les chiffres
+
+    Returns:
+        list: Noms de base candidats
+    """
+    bases = [name]
+    end = len(name)
+    while end > 0 and name[end - 1].isdecimal():
+        end -= 1
+        bases.append(name[:end])
+    if spaces:
+        while end > 0 and name[end - 1].isspace():
+            end -= 1
+            bases.append(name[:end])
+    return bases
+
+
+# Catalogue partagé par tout le processus
+vsti_catalogue = VstiCatalogue()
+
+# Les modifications en attente sont écrites à la sortie du programme
+atexit.register(vsti_catalogue.flush)
 
 
 def get_vsti_editor(vsti_name):
-    vsti_list = load_vsti_list()
-    vsti_name_stripped = vsti_name.strip()
-    if vsti_list and isinstance(vsti_list[0], dict) and 'editor' in vsti_list[0] and 'name' in vsti_list[0]:
-        # 1. Correspondance exacte
-        for vst in vsti_list:
-            if vsti_name_stripped.lower() == vst['name'].lower():
-                return vst.get('editor', 'Inconnu')
-        
-        # 2. Regex : nom + (fin OU espaces + chiffres + fin)
-        for vst in vsti_list:
-            vst_name = vst['name'].strip()
-            pattern = r'^' + re.escape(vst_name) + r'(?:\s*\d*)$'
-            if re.match(pattern, vsti_name_stripped, re.IGNORECASE):
-                return vst.get('editor', 'Inconnu')
-        
-        # 3. Version sans espaces
-        vsti_name_clean = vsti_name_stripped.lower().replace(' ', '')
-        for vst in vsti_list:
-            vst_name_clean = vst['name'].lower().replace(' ', '')
-            pattern = r'^' + re.escape(vst_name_clean) + r'(?:\d*)$'
-            if re.match(pattern, vsti_name_clean):
-                return vst.get('editor', 'Inconnu')
-            
-        # 4. Vérifier si le VSTi est contenu dans le nom (pour les variantes avec suffixes)
-        for vst in vsti_list:
-            if vst['name'].lower() in vsti_name_stripped.lower():
-                return vst.get('editor', 'Inconnu')
-            
-        return 'Inconnu'
-    else:
-        return 'Inconnu'
+    return vsti_catalogue.editor_of(vsti_name)
 
 def get_vsti_by_editor(vsti_names):
     print("Appel de get_vsti_by_editor avec :", vsti_names)
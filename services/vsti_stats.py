@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistiques d'utilisation des plugins sur l'ensemble des projets analysés
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from services.vsti_cache import vsti_cache, vsti_list_hash
+from services.vsti_inventory import plugin_key
+
+# Granularités de l'utilisation par éditeur
+PERIOD_YEAR = 'year'
+PERIOD_MONTH = 'month'
+
+# Période des projets sans date de CPR
+UNKNOWN_PERIOD = 'Inconnue'
+
+
+def _period(date, period):
+    """Période ('2024' ou '2024-03') d'une date de CPR"""
+    if not isinstance(date, datetime):
+        return UNKNOWN_PERIOD
+    return f"{date.year:04d}" if period == PERIOD_YEAR else f"{date.year:04d}-{date.month:02d}"
+
+
+class VstiStats:
+    """
+    Statistiques d'utilisation des plugins
+
+    Les résultats d'analyse (un ensemble d'instances VSTi par projet) sont
+    indexés une fois : index inversé plugin -> projets, compteurs par plugin
+    et compteurs éditeur -> période -> projets. Chaque requête lit ces index
+    sans reparcourir les projets ; un projet peut être ajouté, remplacé ou
+    retiré sans reconstruire l'ensemble.
+
+    Les plugins de la liste des VSTi sont indexés même si aucun projet ne les
+    utilise : ce sont les premiers candidats à la désinstallation.
+    """
+
+    def __init__(self, editor_of=None):
+        """
+        Initialisation de statistiques vides
+
+        Args:
+            editor_of (callable): Éditeur d'un plugin (get_vsti_editor par défaut)
+        """
+        if editor_of is None:
+            from services.vsti_manager import get_vsti_editor
+            editor_of = get_vsti_editor
+        self.editor_of = editor_of
+        self.clear()
+
+    def clear(self):
+        """Retrait de tous les projets"""
+        # Projet -> {'date': datetime, 'plugins': Counter(plugin -> instances)}
+        self.projects = {}
+        # Plugin -> projets qui l'utilisent (index inversé)
+        self.plugin_projects = {}
+        # Plugins connus (liste des VSTi), conservés dans l'index sans projet
+        self.known_plugins = set()
+        # Plugin -> éditeur (résolu une fois par plugin)
+        self.plugin_editors = {}
+        # Éditeur -> plugins connus
+        self.editor_plugins = {}
+        # Granularité -> éditeur -> Counter(période -> projets)
+        self.editor_usage = {PERIOD_YEAR: {}, PERIOD_MONTH: {}}
+        # Projets sans analyse en cache lors de build
+        self.unanalysed = []
+        # Instance -> plugin
+        self._keys = {}
+        self._ranking = None
+
+    def build(self, projects, cache=vsti_cache, known_plugins=None):
+        """
+        Construction depuis les analyses en cache (aucun CPR n'est relu)
+
+        Args:
+            projects (list): Lignes de synthèse des projets (CubaseScanner.df_projects)
+            cache (VstiCache): Cache des analyses VSTi
+            known_plugins (iterable): Plugins connus (noms de la liste des VSTi
+                par défaut)
+
+        Returns:
+            int: Nombre de projets indexés
+        """
+        self.clear()
+        if known_plugins is None:
+            from services.vsti_manager import vsti_catalogue
+            known_plugins = vsti_catalogue.names()
+        self.add_known_plugins(known_plugins)
+        list_hash = vsti_list_hash()
+        for project in projects:
+            cpr_path = project.get('latest_cpr')
+            found = cache.lookup(cpr_path, list_hash) if cpr_path else None
+            if found is None:
+                self.unanalysed.append(project['project_name'])
+                continue
+            self.add_project(project['project_name'], found, project.get('latest_cpr_date'))
+        return len(self.projects)
+
+    def add_known_plugins(self, names):
+        """
+        Ajout de plugins à l'index, même s'ils ne sont utilisés par aucun projet
+
+        Args:
+            names (iterable): Noms des plugins
+        """
+        for name in names:
+            if not name:
+                continue
+            plugin = self._plugin_key(name)
+            self.known_plugins.add(plugin)
+            self.plugin_projects.setdefault(plugin, set())
+            self._editor(plugin)
+        self._ranking = None
+
+    def add_project(self, project_name, vsti, date=None):
+        """
+        Ajout (ou remplacement) d'un projet
+
+        Args:
+            project_name (str): Nom du projet
+            vsti (iterable): Instances trouvées par trouve_vsti ("Serum 01", "Kontakt")
+            date (datetime): Date du dernier CPR (latest_cpr_date)
+        """
+        if project_name in self.projects:
+            self.remove_project(project_name)
+        plugins = Counter(map(self._plugin_key, vsti))
+        self.projects[project_name] = {'date': date, 'plugins': plugins}
+
+        plugin_projects = self.plugin_projects
+        for plugin in plugins:
+            users = plugin_projects.get(plugin)
+            if users is None:
+                users = plugin_projects[plugin] = set()
+            users.add(project_name)
+        editors = set(map(self._editor, plugins))
+        for period, usage in self.editor_usage.items():
+            key = _period(date, period)
+            for editor in editors:
+                counter = usage.get(editor)
+                if counter is None:
+                    counter = usage[editor] = Counter()
+                counter[key] += 1
+        self._ranking = None
+
+    def remove_project(self, project_name):
+        """
+        Retrait d'un projet
+
+        Args:
+            project_name (str): Nom du projet
+        """
+        data = self.projects.pop(project_name, None)
+        if data is None:
+            return
+        editors = set()
+        for plugin in data['plugins']:
+            users = self.plugin_projects.get(plugin)
+            if users is not None:
+                users.discard(project_name)
+                if not users and plugin not in self.known_plugins:
+                    del self.plugin_projects[plugin]
+            editors.add(self._editor(plugin))
+        for period, usage in self.editor_usage.items():
+            key = _period(data['date'], period)
+            for editor in editors:
+                counter = usage.get(editor)
+                if counter is None:
+                    continue
+                counter[key] -= 1
+                if counter[key] <= 0:
+                    del counter[key]
+                if not counter:
+                    del usage[editor]
+        self._ranking = None
+
+    def _plugin_key(self, vsti_name):
+        """Nom du plugin d'une instance, mémorisé (les mêmes instances reviennent d'un projet à l'autre)"""
+        key = self._keys.get(vsti_name)
+        if key is None:
+            key = self._keys[vsti_name] = plugin_key(vsti_name)
+        return key
+
+    def _editor(self, plugin):
+        """Éditeur d'un plugin, mémorisé"""
+        editor = self.plugin_editors.get(plugin)
+        if editor is None:
+            editor = self.editor_of(plugin)
+            self.plugin_editors[plugin] = editor
+            self.editor_plugins.setdefault(editor, set()).add(plugin)
+        return editor
+
+    def resolve_plugin(self, plugin):
+        """
+        Plugin indexé correspondant à un nom saisi
+
+        Args:
+            plugin (str): Nom saisi (numéro d'instance et casse indifférents)
+
+        Returns:
+            str: Nom du plugin dans l'index (le nom saisi s'il est inconnu)
+        """
+        key = plugin_key(plugin)
+        if key in self.plugin_projects:
+            return key
+        lowered = key.lower()
+        return next((name for name in self.plugin_projects if name.lower() == lowered), key)
+
+    def plugins(self):
+        """
+        Plugins utilisés par au moins un projet
+
+        Returns:
+            list: Noms triés (casse ignorée)
+        """
+        return sorted((plugin for plugin, users in self.plugin_projects.items() if users), key=str.lower)
+
+    def plugin_count(self, plugin):
+        """Nombre de projets utilisant un plugin"""
+        return len(self.plugin_projects.get(self.resolve_plugin(plugin), ()))
+
+    def projects_using(self, plugin):
+        """
+        Projets utilisant un plugin
+
+        Args:
+            plugin (str): Nom du plugin (avec ou sans numéro d'instance)
+
+        Returns:
+            list: Noms des projets, triés
+        """
+        return sorted(self.plugin_projects.get(self.resolve_plugin(plugin), ()), key=str.lower)
+
+    def _ranked(self):
+        """Plugins par nombre de projets croissant, puis par nom (calculé une fois par changement)"""
+        if self._ranking is None:
+            self._ranking = sorted(((len(users), plugin) for plugin, users in self.plugin_projects.items()),
+                                   key=lambda item: (item[0], item[1].lower()))
+        return self._ranking
+
+    def least_used(self, limit=20):
+        """
+        Plugins les moins utilisés (plugins connus sans projet compris)
+
+        Args:
+            limit (int): Nombre de plugins (None : tous)
+
+        Returns:
+            list: [(plugin, nombre de projets)], du moins utilisé au plus utilisé
+        """
+        ranking = self._ranked() if limit is None else self._ranked()[:limit]
+        return [(plugin, count) for count, plugin in ranking]
+
+    def most_used(self, limit=20):
+        """
+        Plugins les plus utilisés
+
+        Args:
+            limit (int): Nombre de plugins (None : tous)
+
+        Returns:
+            list: [(plugin, nombre de projets)], du plus utilisé au moins utilisé
+        """
+        ranking = sorted(self._ranked(), key=lambda item: -item[0])
+        if limit is not None:
+            ranking = ranking[:limit]
+        return [(plugin, count) for count, plugin in ranking]
+
+    def usage_by_editor(self, period=PERIOD_YEAR):
+        """
+        Nombre de projets utilisant chaque éditeur, par période du dernier CPR
+
+        Args:
+            period (str): PERIOD_YEAR ou PERIOD_MONTH
+
+        Returns:
+            dict: éditeur -> {période: nombre de projets}, périodes triées
+        """
+        return {editor: dict(sorted(counter.items()))
+                for editor, counter in sorted(self.editor_usage[period].items(), key=lambda item: item[0].lower())}
+
+    def periods(self, period=PERIOD_YEAR):
+        """
+        Périodes présentes dans les statistiques
+
+        Args:
+            period (str): PERIOD_YEAR ou PERIOD_MONTH
+
+        Returns:
+            list: Périodes triées (UNKNOWN_PERIOD en dernier)
+        """
+        keys = set()
+        for counter in self.editor_usage[period].values():
+            keys.update(counter)
+        known = sorted(key for key in keys if key != UNKNOWN_PERIOD)
+        return known + ([UNKNOWN_PERIOD] if UNKNOWN_PERIOD in keys else [])
+
+    def projects_broken_by(self, plugins=(), editor=None):
+        """
+        Projets qui ne s'ouvriraient plus complètement si des plugins étaient
+        désinstallés
+
+        Args:
+            plugins (iterable): Plugins retirés (avec ou sans numéro d'instance)
+            editor (str): Éditeur dont tous les plugins sont retirés (facultatif)
+
+        Returns:
+            dict: projet -> [(plugin manquant, nombre d'instances)], projets
+                triés par nombre d'instances manquantes décroissant
+        """
+        removed = {self.resolve_plugin(plugin) for plugin in plugins}
+        if editor is not None:
+            removed |= self.editor_plugins.get(editor, set())
+
+        broken = {}
+        totals = Counter()
+        for plugin in sorted(removed, key=str.lower):
+            for project_name in self.plugin_projects.get(plugin, ()):
+                instances = self.projects[project_name]['plugins'][plugin]
+                totals[project_name] += instances
+                missing = broken.get(project_name)
+                if missing is None:
+                    broken[project_name] = [(plugin, instances)]
+                else:
+                    missing.append((plugin, instances))
+
+        # Projets les plus touchés en premier
+        order = sorted(broken, key=lambda name: (-totals[name], name.lower()))
+        return {project_name: broken[project_name] for project_name in order}
+
+    def editors(self):
+        """
+        Éditeurs des plugins utilisés
+
+        Returns:
+            list: Éditeurs triés
+        """
+        return sorted((editor for editor, plugins in self.editor_plugins.items()
+                       if any(self.plugin_projects.get(plugin) for plugin in plugins)), key=str.lower)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Outils communs des tests : fichiers .cpr synthétiques et liste des VSTi temporaire
+"""
+
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def make_tree(root, files):
+    """
+    Création d'une arborescence de fichiers
+
+    Args:
+        root (Path): Dossier racine
+        files (dict): Chemin relatif -> contenu (bytes)
+    """
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def cpr_string(text):
+    """Chaîne de l'archive : longueur (uint32 big-endian, zéro final compris) puis octets"""
+    raw = text.encode('utf-8') + b'\x00'
+    return struct.pack('>I', len(raw)) + raw
+
+
+def plugin_record(name):
+    """Attribut "Plugin Name" suivi d'un marqueur de type et du nom"""
+    return cpr_string('Plugin Name') + b'\x00\x01' + cpr_string(name)
+
+
+def build_cpr(arch, extra_chunks=()):
+    """
+    Fichier .cpr minimal : conteneur RIFF/NUND avec un bloc ROOT et un bloc ARCH
+
+    Args:
+        arch (bytes): Contenu du bloc ARCH
+        extra_chunks (iterable): Blocs supplémentaires [(identifiant, contenu)]
+    """
+    chunks = [(b'ROOT', b'ROOTDATA'), (b'ARCH', arch)] + list(extra_chunks)
+    body = b'NUND'
+    for chunk_id, content in chunks:
+        body += chunk_id + struct.pack('>I', len(content)) + content
+        if len(content) % 2:
+            body += b'\x00'
+    return b'RIFF' + struct.pack('>I', len(body)) + body
+
+
+@pytest.fixture
+def vsti_list(tmp_path, monkeypatch):
+    """
+    Liste des VSTi temporaire, utilisée par l'analyse à la place de
+    config/vsti_list.json
+
+    Renvoie une fonction qui enregistre les entrées données et le catalogue.
+    """
+    from services import vsti_manager, lectureCPR, vsti_cache
+    from services.vsti_manager import VstiCatalogue
+
+    path = tmp_path / 'vsti_list.json'
+    path.write_text('[]', encoding='utf-8')
+    catalogue = VstiCatalogue(str(path), save_delay=0)
+    monkeypatch.setattr(vsti_manager, 'vsti_catalogue', catalogue)
+    monkeypatch.setattr(lectureCPR, 'vsti_catalogue', catalogue)
+    monkeypatch.setattr(vsti_cache, 'vsti_catalogue', catalogue, raising=False)
+
+    def write(entries):
+        path.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+        catalogue.reload()
+        return catalogue
+
+    return write
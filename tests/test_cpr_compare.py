@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la comparaison des versions d'un projet (services/cpr_compare.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.cpr_compare import project_version_paths
+from services.scanner import CubaseScanner
+
+
+def test_project_version_paths_on_scanned_project(tmp_path):
+    """Toutes les versions d'un projet scanné (repli du bouton Comparer les versions)"""
+    project_dir = tmp_path / 'Morceau'
+    (project_dir / 'Audio').mkdir(parents=True)
+    for name in ('Morceau.cpr', 'Morceau-02.cpr', 'Morceau.bak', 'Morceau-01.bak'):
+        (project_dir / name).write_bytes(b'RIFF')
+    (project_dir / 'Audio' / 'Kick.wav').write_bytes(b'RIFF')
+
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path))
+    details = scanner.get_project_details('Morceau')
+
+    paths = project_version_paths(details)
+
+    assert sorted(os.path.basename(path) for path in paths) == [
+        'Morceau-01.bak', 'Morceau-02.cpr', 'Morceau.bak', 'Morceau.cpr'
+    ]
+    assert all(os.path.isfile(path) for path in paths)
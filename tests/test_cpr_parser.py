@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la lecture structurelle des fichiers .cpr (services/cpr_parser.py)
+"""
+
+from conftest import build_cpr, cpr_string, plugin_record
+from services import cpr_parser
+from services.cpr_parser import parse_cpr, read_plugin_names, read_structure
+
+
+def test_parse_cpr_chunks_and_plugin_names():
+    """Blocs du conteneur et noms des plugins, sans doublon, dans l'ordre du fichier"""
+    arch = plugin_record('Serum') + b'notes: Plugin Name Serum' + plugin_record('Diva') + plugin_record('Serum')
+    structure = parse_cpr(build_cpr(arch, [(b'INFO', b'abc')]))
+
+    assert [chunk_id for chunk_id, _, _ in structure['chunks']] == ['ROOT', 'ARCH', 'INFO']
+    assert structure['plugin_names'] == ['Serum', 'Diva']
+
+
+def test_parse_cpr_unknown_format():
+    """Fichier inconnu : None, sans exception"""
+    assert parse_cpr(b'') is None
+    assert parse_cpr(b'RIFF\x00\x00\x00\x04WAVE') is None
+
+
+def test_records_across_window_boundaries(monkeypatch):
+    """Les attributs à cheval sur deux fenêtres sont lus une seule fois"""
+    monkeypatch.setattr(cpr_parser, 'RECORD_WINDOW', 7)
+    arch = b''.join(plugin_record(f'Synth {i}') + b'x' * i for i in range(12))
+    data = build_cpr(arch)
+    structure = parse_cpr(data, read_names=False)
+
+    names = read_plugin_names(data, structure['plugin_sections'], progress=lambda done: True)
+
+    assert names == [f'Synth {i}' for i in range(12)]
+
+
+def test_read_plugin_names_interrupted():
+    """Un retour False de la progression interrompt la lecture"""
+    data = build_cpr(plugin_record('Serum') + b'\x00' * (2 * cpr_parser.RECORD_WINDOW))
+    structure = parse_cpr(data, read_names=False)
+    seen = []
+
+    def progress(done):
+        seen.append(done)
+        return False if done else None
+
+    assert read_plugin_names(data, structure['plugin_sections'], progress) is None
+    assert seen == [0, cpr_parser.RECORD_WINDOW]
+
+
+def test_read_structure_counts_records_and_tracks():
+    """Nombre d'attributs par plugin et classes de pistes (préfixées par leur longueur)"""
+    arch = (cpr_string('MAudioTrackEvent') + cpr_string('MAudioTrackEvent') + cpr_string('MMidiTrackEvent')
+            + b'MAudioTrackEvent\x00' + plugin_record('Serum') + plugin_record('Serum'))
+    structure = read_structure(build_cpr(arch))
+
+    assert structure['plugin_records'] == {'Serum': 2}
+    assert structure['track_classes'] == {'MAudioTrackEvent': 2, 'MMidiTrackEvent': 1}
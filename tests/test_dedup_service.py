@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la détection des fichiers en double (services/dedup_service.py)
+"""
+
+import json
+import os
+
+import pytest
+
+from services import dedup_service as dedup_module
+from services.cancel_token import CancelToken
+from services.dedup_service import DedupService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Service avec un cache temporaire"""
+    return DedupService(tmp_path / 'dedup_cache.json')
+
+
+def write_files(tmp_path, contents):
+    """Création des fichiers {(source, nom): contenu} ; renvoie la liste attendue par find_duplicates"""
+    files = []
+    for (source, name), content in contents.items():
+        path = tmp_path / source / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        stat = os.stat(path)
+        files.append((str(path), stat.st_size, stat.st_mtime, str(tmp_path / source)))
+    return files
+
+
+def test_duplicates_across_sources(service, tmp_path):
+    """Un fichier identique à celui d'une autre source est un doublon du premier"""
+    files = write_files(tmp_path, {
+        ('A', 'kick.wav'): b'kick' * 100,
+        ('B', 'kick copy.wav'): b'kick' * 100,
+        ('B', 'snare.wav'): b'snar' * 100,
+    })
+    assert service.find_duplicates(files) == {files[1][0]: files[0][0]}
+
+
+def test_copies_inside_one_source_are_not_duplicates(service, tmp_path):
+    """Les copies à l'intérieur d'une source ne sont pas signalées"""
+    files = write_files(tmp_path, {
+        ('A', 'kick.wav'): b'kick' * 100,
+        ('A', 'Morceau/kick.wav'): b'kick' * 100,
+        ('B', 'kick.wav'): b'kick' * 100,
+    })
+    assert service.find_duplicates(files) == {files[2][0]: files[0][0]}
+
+
+def test_single_source_groups_are_not_read(service, tmp_path, monkeypatch):
+    """Des fichiers de même taille dans une seule source ne sont pas lus"""
+    files = write_files(tmp_path, {('A', 'a.wav'): b'a' * 100, ('A', 'b.wav'): b'b' * 100})
+    monkeypatch.setattr(DedupService, '_digest', lambda *args: pytest.fail("lecture inutile"))
+    assert service.find_duplicates(files) == {}
+
+
+def test_large_files_use_full_digest(service, tmp_path):
+    """Même début et même fin : l'empreinte complète départage les fichiers"""
+    size = 3 * dedup_module.PARTIAL_SIZE
+    same = b'x' * size
+    different = b'x' * dedup_module.PARTIAL_SIZE + b'y' * dedup_module.PARTIAL_SIZE + b'x' * dedup_module.PARTIAL_SIZE
+    files = write_files(tmp_path, {('A', 'a.wav'): same, ('B', 'b.wav'): same, ('C', 'c.wav'): different})
+    assert service.find_duplicates(files) == {files[1][0]: files[0][0]}
+
+
+def test_cancelled_search_returns_nothing(service, tmp_path):
+    """Une recherche annulée ne renvoie aucun doublon"""
+    files = write_files(tmp_path, {('A', 'a.wav'): b'a' * 100, ('B', 'a.wav'): b'a' * 100})
+    token = CancelToken()
+    token.cancel()
+    assert service.find_duplicates(files, cancel_token=token) == {}
+
+
+def test_cache_drops_missing_files(service, tmp_path):
+    """Les empreintes des fichiers disparus sont retirées à l'enregistrement"""
+    files = write_files(tmp_path, {('A', 'a.wav'): b'a' * 100, ('B', 'a.wav'): b'a' * 100})
+    service.find_duplicates(files)
+    os.remove(files[0][0])
+
+    others = write_files(tmp_path, {('A', 'b.wav'): b'b' * 100, ('B', 'b.wav'): b'b' * 100})
+    service.find_duplicates(others)
+
+    cached = json.loads(service.cache_file.read_text(encoding='utf-8'))['files']
+    assert sorted(cached) == sorted([files[1][0], others[0][0], others[1][0]])
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du stockage compact des fichiers scannés (services/file_records.py)
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from services.file_records import FileList, FileRecord
+
+
+def make_list(*files):
+    """FileList à partir de (dossier, nom, taille, mtime)"""
+    files_list = FileList()
+    for directory, name, size, mtime in files:
+        files_list.append(directory, name, size, mtime, mtime - 10, '/src')
+    return files_list
+
+
+def test_list_behaves_like_a_list_of_records():
+    """Longueur, index, tranches et itération donnent des FileRecord"""
+    files = make_list(('/src/A', 'a.cpr', 10, 100.0), ('/src/A', 'b.wav', 20, 200.0))
+    assert len(files) == 2 and files
+    assert not FileList()
+    assert files[-1] == FileRecord('/src/A', 'b.wav', 20, 200.0, 190.0, '/src')
+    assert [record.name for record in files[0:1]] == ['a.cpr']
+    assert [record.size for record in files] == [10, 20]
+
+
+def test_record_keeps_dict_access():
+    """Accès par clé des anciens dictionnaires de fichiers"""
+    record = make_list(('/src/A', 'a.cpr', 10, 100.0))[0]
+    assert record['path'] == os.path.join('/src/A', 'a.cpr')
+    assert record['size'] == 10
+    assert record['modified'] == datetime.fromtimestamp(100.0)
+    assert record['created'] == datetime.fromtimestamp(90.0)
+    assert record.get('source') == '/src'
+    assert record.get('rating', 0) == 0
+    with pytest.raises(KeyError):
+        record['name']
+
+
+def test_records_have_no_instance_dict():
+    """Les fichiers n'ont pas de dictionnaire d'attributs (__slots__)"""
+    record = make_list(('/src/A', 'a.cpr', 10, 100.0))[0]
+    assert not hasattr(record, '__dict__')
+    assert not hasattr(FileList(), '__dict__')
+
+
+def assert_aggregates(files):
+    """Agrégats tenus à jour identiques à un recalcul complet"""
+    records = list(files)
+    assert files.total_size() == sum(record.size for record in records)
+    expected = max(records, key=lambda record: record.mtime) if records else None
+    assert files.latest() == expected
+
+
+def test_aggregates_follow_changes():
+    """Taille cumulée et fichier le plus récent après ajout, fusion et retrait d'un dossier"""
+    files = make_list(('/src/A', 'a.cpr', 10, 100.0), ('/src/B', 'b.cpr', 20, 300.0))
+    assert_aggregates(files)
+    # Égalité : le premier fichier rencontré l'emporte
+    files.append('/src/C', 'c.cpr', 5, 300.0, 0.0, '/src')
+    assert files.latest().name == 'b.cpr'
+    assert_aggregates(files)
+
+    other = make_list(('/src/D', 'd.cpr', 7, 400.0))
+    files.extend(other)
+    assert files.latest().name == 'd.cpr'
+    assert_aggregates(files)
+
+    assert files.remove_directory('/src/D') == 1
+    assert files.remove_directory('/absent') == 0
+    assert_aggregates(files)
+    files.remove_directory('/src/A')
+    files.remove_directory('/src/B')
+    files.remove_directory('/src/C')
+    assert_aggregates(files)
+    assert files.total_size() == 0
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des fichiers JSON versionnés (services/json_store.py) et des caches qui en héritent
+"""
+
+import json
+
+import pytest
+
+from services.cpr_compare import CprCompareCache
+from services.dedup_service import DedupService
+from services.json_store import JsonStore
+from services.plugin_discovery import PluginDiscovery
+from services.scan_index import ScanIndex
+from services.vsti_cache import VstiCache
+
+
+class SampleStore(JsonStore):
+    """Fichier d'essai"""
+    VERSION = 3
+    PAYLOAD_KEY = 'items'
+    DEFAULT_FILE = 'sample.json'
+    LABEL = "du fichier d'essai"
+
+
+def test_save_then_load(tmp_path):
+    """Les entrées modifiées sont écrites avec la version, puis relues"""
+    path = tmp_path / 'prefs' / 'sample.json'
+    store = SampleStore(path)
+    store.load()
+    store.entries['a'] = {'size': 1}
+    store._dirty = True
+    store.save()
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'version': 3, 'items': {'a': {'size': 1}}}
+    assert not path.with_suffix('.tmp').exists()
+    reloaded = SampleStore(path)
+    reloaded.load()
+    assert reloaded.entries == {'a': {'size': 1}}
+
+
+def test_save_only_when_modified(tmp_path):
+    """Un fichier non modifié n'est pas réécrit"""
+    path = tmp_path / 'sample.json'
+    store = SampleStore(path)
+    store.load()
+    store.save()
+    assert not path.exists()
+
+
+@pytest.mark.parametrize('content', [
+    json.dumps({'version': 2, 'items': {'a': 1}}),
+    '{"version": 3, "items": ',
+])
+def test_other_version_or_unreadable_file_ignored(tmp_path, content):
+    """Un fichier d'une autre version ou illisible donne un cache vide"""
+    path = tmp_path / 'sample.json'
+    path.write_text(content, encoding='utf-8')
+    store = SampleStore(path)
+    store.load()
+    assert store.entries == {}
+
+
+def test_clear(tmp_path):
+    """Le vidage est écrit immédiatement"""
+    path = tmp_path / 'sample.json'
+    path.write_text(json.dumps({'version': 3, 'items': {'a': 1}}), encoding='utf-8')
+    store = SampleStore(path)
+    store.clear()
+    assert json.loads(path.read_text(encoding='utf-8')) == {'version': 3, 'items': {}}
+
+
+@pytest.mark.parametrize('store_class, payload_key', [
+    (DedupService, 'files'),
+    (VstiCache, 'files'),
+    (PluginDiscovery, 'plugins'),
+    (ScanIndex, 'directories'),
+    (CprCompareCache, 'files'),
+])
+def test_services_keep_their_file_format(tmp_path, store_class, payload_key):
+    """Les fichiers écrits avant la mise en commun restent lisibles"""
+    path = tmp_path / 'cache.json'
+    path.write_text(json.dumps({'version': 1, payload_key: {'/chemin': {'mtime': 1}}}), encoding='utf-8')
+    store = store_class(path)
+    store.load()
+    assert store.entries == {'/chemin': {'mtime': 1}}
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la détection des VSTi dans un CPR (services/lectureCPR.py)
+"""
+
+import mmap
+import random
+import re
+
+import pytest
+
+from conftest import build_cpr, cpr_string, plugin_record
+from services import lectureCPR
+from services.lectureCPR import ProgressThrottle, trouve_vsti, trouve_vsti_donnees
+
+# Noms qui se chevauchent, se contiennent ou ne diffèrent que par la casse
+OVERLAPPING_NAMES = ['Pro', 'Pro-Q', 'FabFilter Pro-Q', 'Kick', 'Kick 2', 'Serum', 'serum',
+                     'Diva', 'DIVA', 'Omni', 'Omnisphere', 'Keys']
+
+# Fragments assemblés au hasard autour des noms
+FRAGMENTS = [' ', '  ', '\t', '\n', '_', 'x', '0', '01', ' 01', ' 1', ' 12', '  07', '-', '.',
+             'Plugin Name ', 'Plugin  Name', '\x00', 'é']
+
+
+def test_parsed_plugin_names_limited_to_vsti_list(vsti_list):
+    """Les attributs "Plugin Name" d'effets ou de plugins absents de la liste ne sont pas des VSTi"""
+    vsti_list(['Serum', 'Diva'])
+    arch = (cpr_string('MAudioTrackEvent') + plugin_record('Serum') + plugin_record('Pro-Q 3')
+            + plugin_record('Serum FX') + plugin_record('Unknown Synth'))
+
+    found = trouve_vsti_donnees(build_cpr(arch))
+
+    assert found == {'Serum'}
+
+
+def test_parsed_and_raw_scan_agree(vsti_list):
+    """Même résultat avec la lecture de la structure et avec la recherche brute"""
+    vsti_list(['Serum', 'Kontakt'])
+    arch = plugin_record('Serum') + plugin_record('Pro-C 2') + b'..Kontakt 01..'
+
+    structured = trouve_vsti_donnees(build_cpr(arch))
+    raw = trouve_vsti_donnees(b'XXXX' + arch)
+
+    assert structured == raw == {'Serum', 'Kontakt 01'}
+
+
+def test_progress_covers_structure_pass_and_can_cancel_it(vsti_list):
+    """La lecture des attributs est suivie par la progression et peut être interrompue"""
+    vsti_list(['Serum'])
+    data = build_cpr(plugin_record('Serum') + b'\x00' * (3 * 1024 * 1024))
+
+    calls = []
+    found = trouve_vsti_donnees(data, lambda done, total: calls.append((done, total)))
+    assert found == {'Serum'}
+    assert calls[0][0] == 0
+    assert calls[-1][0] == calls[-1][1]
+
+    # Interruption au premier rappel : pendant la lecture de la structure
+    calls = []
+
+    def cancel(done, total):
+        calls.append((done, total))
+        return False
+
+    assert trouve_vsti_donnees(data, cancel) == set()
+    assert len(calls) == 1
+
+
+def per_name_regex_scan(data, vsti_names):
+    """
+    Recherche d'origine, une expression régulière par VSTi : instances
+    numérotées, puis noms isolés, puis entrées "Plugin Nam..."
+    """
+    trouvés = set()
+    for vsti_name in vsti_names:
+        for match in re.findall(vsti_name.encode('utf-8') + rb'\s+\d{2}', data):
+            trouvés.add(match.decode('utf-8', errors='ignore'))
+    for vsti_name in vsti_names:
+        pattern = re.compile(rb'(?<!\w)' + vsti_name.encode('utf-8') + rb'(?!\w)')
+        if pattern.findall(data):
+            if not any(vsti_name in déjà_trouvé for déjà_trouvé in trouvés):
+                trouvés.add(vsti_name)
+    for match in re.findall(rb'Plugin\s+Nam[^\n\r]{2,40}', data):
+        texte = match.decode('utf-8', errors='ignore')
+        for vsti_name in vsti_names:
+            if vsti_name in texte and vsti_name not in trouvés and not any(vsti_name in déjà_trouvé for déjà_trouvé in trouvés):
+                trouvés.add(vsti_name)
+    return trouvés
+
+
+def random_data(rng):
+    """Contenu brut (format inconnu) mêlant noms, variantes de casse et suffixes"""
+    parts = []
+    for _ in range(rng.randint(1, 40)):
+        if rng.random() < 0.5:
+            name = rng.choice(OVERLAPPING_NAMES)
+            variant = rng.random()
+            if variant < 0.15:
+                name = name.upper()
+            elif variant < 0.3:
+                name = name.lower()
+            parts.append(name)
+        else:
+            parts.append(rng.choice(FRAGMENTS))
+    return b'XXXX' + ''.join(parts).encode('utf-8')
+
+
+@pytest.mark.parametrize('window', [lectureCPR.SCAN_WINDOW, 7])
+def test_single_sweep_matches_per_name_regexes(vsti_list, monkeypatch, window):
+    """Le balayage unique donne le même résultat que la recherche d'origine par VSTi"""
+    monkeypatch.setattr(lectureCPR, 'SCAN_WINDOW', window)
+    rng = random.Random(16)
+    for _ in range(50):
+        names = rng.sample(OVERLAPPING_NAMES, rng.randint(1, len(OVERLAPPING_NAMES)))
+        vsti_list(names)
+        for _ in range(10):
+            data = random_data(rng)
+            assert trouve_vsti_donnees(data) == per_name_regex_scan(data, names), data
+
+
+def test_file_scanned_through_mmap(vsti_list, tmp_path, monkeypatch):
+    """L'analyse d'un fichier passe par une projection mémoire et donne le résultat de l'analyse en mémoire"""
+    vsti_list(['Serum', 'Diva'])
+    data = build_cpr(plugin_record('Serum') + b'..Diva 01..')
+    cpr_path = tmp_path / 'Morceau.cpr'
+    cpr_path.write_bytes(data)
+
+    received = []
+    real_scan = lectureCPR.trouve_vsti_donnees
+
+    def spy(content, progress_callback=None):
+        received.append(type(content))
+        return real_scan(content, progress_callback)
+
+    monkeypatch.setattr(lectureCPR, 'trouve_vsti_donnees', spy)
+    assert trouve_vsti(str(cpr_path)) == real_scan(data) == {'Serum', 'Diva 01'}
+    assert received == [mmap.mmap]
+
+
+def test_empty_file(vsti_list, tmp_path):
+    """Un fichier vide (que mmap ne peut pas projeter) ne contient aucun VSTi"""
+    vsti_list(['Serum'])
+    cpr_path = tmp_path / 'Vide.cpr'
+    cpr_path.write_bytes(b'')
+    assert trouve_vsti(str(cpr_path)) == set()
+
+
+def test_progress_throttled(monkeypatch):
+    """Un appel au plus par intervalle, sauf le premier et les appels forcés"""
+    now = [100.0]
+    monkeypatch.setattr(lectureCPR.time, 'monotonic', lambda: now[0])
+    calls = []
+    progress = ProgressThrottle(lambda done, total: calls.append((done, total)), 1000, interval=0.05)
+
+    assert progress.update(0)
+    now[0] += 0.01
+    assert progress.update(10)
+    assert progress.update(20, force=True)
+    now[0] += 0.06
+    assert progress.update(30)
+    assert calls == [(0, 1000), (20, 1000), (30, 1000)]
+
+    assert ProgressThrottle(None, 1000).update(0)
+    assert not ProgressThrottle(lambda done, total: False, 1000).update(0)
+
+
+def test_raw_scan_progress_in_bytes(vsti_list, monkeypatch):
+    """Recherche brute : progression croissante, en octets, terminée à (total, total)"""
+    vsti_list(['Serum'])
+    # Horloge avançant d'une seconde à chaque lecture : aucun appel n'est filtré
+    ticks = iter(range(10 ** 6))
+    monkeypatch.setattr(lectureCPR.time, 'monotonic', lambda: float(next(ticks)))
+    monkeypatch.setattr(lectureCPR, 'SCAN_WINDOW', 1024)
+    data = b'XXXX' + b'..Serum 01..' * 1000
+
+    calls = []
+    assert trouve_vsti_donnees(data, lambda done, total: calls.append((done, total))) == {'Serum 01'}
+    assert {total for _, total in calls} == {2 * len(data)}
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+    assert calls[-1] == (2 * len(data), 2 * len(data))
+    assert len(calls) > 2
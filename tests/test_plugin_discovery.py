@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la découverte des plugins (services/plugin_discovery.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.plugin_discovery import catalogue_entries
+
+PLUGINS = [
+    {'name': 'Serum', 'vendor': 'Xfer Records', 'instrument': True},
+    {'name': 'Serum FX', 'vendor': 'Xfer Records', 'instrument': False},
+    {'name': 'Pro-C 2', 'vendor': 'FabFilter', 'instrument': False},
+    {'name': 'TAL-U-NO-LX', 'vendor': 'TAL Software GmbH', 'instrument': None},
+]
+
+
+def test_catalogue_entries_keeps_only_instruments():
+    """Les effets et les plugins de type inconnu ne sont pas ajoutés à la liste des VSTi"""
+    assert catalogue_entries(PLUGINS) == [{'name': 'Serum', 'editor': 'Xfer Records'}]
+
+
+def test_catalogue_entries_unknown_on_request():
+    """Les plugins de type inconnu sont ajoutés sur demande, jamais les effets"""
+    names = [entry['name'] for entry in catalogue_entries(PLUGINS, include_unknown=True)]
+    assert names == ['Serum', 'TAL-U-NO-LX']
+
+
+def _catalogue(tmp_path):
+    from services.vsti_manager import VstiCatalogue
+    path = tmp_path / 'vsti_list.json'
+    path.write_text('[]', encoding='utf-8')
+    return VstiCatalogue(str(path), save_delay=60)
+
+
+def test_unknown_plugins_added_when_requested_later(tmp_path):
+    """Plugins de type inconnu écartés lors d'une découverte : ajoutés dès qu'ils sont demandés"""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
+    from discover_plugins import build_fixtures
+    from services.plugin_discovery import PluginDiscovery, discover_into_catalogue
+
+    folder = tmp_path / 'plugins'
+    build_fixtures(folder)
+    discovery = PluginDiscovery(tmp_path / 'plugin_discovery.json')
+    catalogue = _catalogue(tmp_path)
+
+    assert discover_into_catalogue([str(folder)], discovery, catalogue) == (6, 1)
+    assert catalogue.names() == ('Serum',)
+
+    total, changed = discover_into_catalogue([str(folder)], discovery, catalogue, include_unknown=True)
+    assert (total, changed) == (6, 4)
+    assert sorted(catalogue.names()) == ['Diva', 'Kontakt 7', 'Serum', 'TAL-U-NO-LX', 'Vital']
+
+    # Un plugin retiré par l'utilisateur ne revient pas, même avec un cache relu
+    catalogue.remove('Diva')
+    discovery = PluginDiscovery(tmp_path / 'plugin_discovery.json')
+    assert discover_into_catalogue([str(folder)], discovery, catalogue, include_unknown=True) == (6, 0)
+    assert 'Diva' not in catalogue.names()
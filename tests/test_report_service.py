@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des rapports de scan sans interface (services/report_service.py, main.py --headless)
+"""
+
+import csv
+import io
+import json
+import sys
+
+import pytest
+
+from conftest import make_tree
+from services import vsti_cache as vsti_cache_module
+from services.report_service import iter_project_reports, write_reports
+from services.vsti_cache import VstiCache
+
+PROJECTS = {
+    'Beta/Beta.cpr': b'XXXX..Serum 01..Diva..',
+    'Beta/Audio/k.wav': b'kick',
+    'alpha/alpha.cpr': b'XXXX..',
+}
+
+
+def test_reports_sorted_and_empty_folders_skipped(tmp_path):
+    """Un rapport par projet contenant des fichiers, par nom (casse ignorée)"""
+    make_tree(tmp_path, PROJECTS)
+    (tmp_path / 'Vide').mkdir()
+    reports = list(iter_project_reports([str(tmp_path)]))
+
+    assert [report['project_name'] for report in reports] == ['alpha', 'Beta']
+    beta = reports[1]
+    assert (beta['cpr_count'], beta['wav_count'], beta['total_size']) == (1, 1, len(b'XXXX..Serum 01..Diva..kick'))
+    assert 'vsti' not in beta
+    json.dumps(reports)
+
+
+def test_reports_with_vsti(vsti_list, tmp_path, monkeypatch):
+    """Analyse VSTi du dernier CPR, regroupée par éditeur"""
+    vsti_list([{'name': 'Serum', 'editor': 'Xfer Records'}, {'name': 'Diva', 'editor': 'u-he'}])
+    monkeypatch.setattr(vsti_cache_module, 'vsti_cache', VstiCache(tmp_path / 'vsti_cache.json'))
+    make_tree(tmp_path / 'src', PROJECTS)
+
+    beta = next(report for report in iter_project_reports([str(tmp_path / 'src')], with_vsti=True)
+                if report['project_name'] == 'Beta')
+    assert beta['vsti'] == ['Diva', 'Serum 01']
+    assert beta['editors'] == {'Xfer Records': ['Serum 01'], 'u-he': ['Diva']}
+
+
+def test_write_jsonl_with_summary():
+    """JSON Lines : une ligne par projet puis une ligne de synthèse"""
+    reports = [{'project_name': 'A', 'total_size': 10, 'tags': ['rock'], 'vsti': ['Serum 01']},
+               {'project_name': 'B', 'total_size': 5, 'tags': ['rock', 'pop']}]
+    stream = io.StringIO()
+    summary = write_reports(iter(reports), stream)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line['type'] for line in lines] == ['project', 'project', 'summary']
+    assert lines[-1] == summary
+    assert summary['project_count'] == 2 and summary['total_size'] == 15
+    assert summary['tags'] == {'rock': 2, 'pop': 1}
+
+
+def test_write_csv_flattens_lists():
+    """CSV : colonnes fixes, listes jointes par "; " """
+    reports = [{'project_name': 'A', 'total_size': 10, 'vsti': ['Diva', 'Serum 01'],
+                'editors': {'u-he': ['Diva'], 'Xfer Records': ['Serum 01']}, 'extra': 'ignoré'}]
+    stream = io.StringIO()
+    write_reports(reports, stream, 'csv')
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0]['vsti'] == 'Diva; Serum 01'
+    assert rows[0]['editors'] == 'u-he: Diva; Xfer Records: Serum 01'
+    assert 'extra' not in rows[0]
+
+
+@pytest.mark.parametrize('argv', [['--headless', 'scan'], ['/un/dossier']])
+def test_directories_require_headless(monkeypatch, argv):
+    """Des dossiers sans --headless, ou --headless sans dossier, sont refusés"""
+    import main
+    monkeypatch.setattr(sys, 'argv', ['main.py'] + argv)
+    with pytest.raises(SystemExit):
+        main.parse_arguments()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de l'index persistant des dossiers scannés (services/scan_index.py)
+"""
+
+import os
+import time
+
+from conftest import make_tree
+from services import scanner as scanner_module
+from services.scan_index import ScanIndex, RECENT_DELAY
+from services.scanner import CubaseScanner
+
+OLD = time.time() - 3600
+
+
+def age_tree(root):
+    """Dates de modification des dossiers reculées d'une heure (hors fenêtre RECENT_DELAY)"""
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (OLD, OLD))
+
+
+def old_mtime_ns():
+    """Date de modification ancienne, en nanosecondes"""
+    return int(OLD * 1e9)
+
+
+def test_lookup_by_mtime_and_rules(tmp_path):
+    """Une entrée n'est servie que pour la même date de dossier et les mêmes règles"""
+    index = ScanIndex(tmp_path / 'scan_index.json')
+    index.store('/a', old_mtime_ns(), [('Audio', False)], [('a.cpr', 3, 1.0, 1.0)], rules_key='r')
+
+    assert index.lookup('/a', old_mtime_ns(), 'r') == ([('Audio', False)], [('a.cpr', 3, 1.0, 1.0)])
+    assert index.lookup('/a', old_mtime_ns() + 1, 'r') is None
+    assert index.lookup('/a', old_mtime_ns()) is None
+
+
+def test_recent_directory_not_stored(tmp_path):
+    """Un dossier modifié il y a moins de RECENT_DELAY secondes sera relu"""
+    index = ScanIndex(tmp_path / 'scan_index.json')
+    recent = int((time.time() - RECENT_DELAY / 2) * 1e9)
+    index.store('/a', recent, [], [])
+    assert index.lookup('/a', recent) is None
+
+
+def test_prune_only_under_root(tmp_path):
+    """Seuls les dossiers disparus de la racine scannée sont retirés"""
+    index = ScanIndex(tmp_path / 'scan_index.json')
+    for path in ['/src', '/src/a', '/src/b', '/src2/c']:
+        index.store(path, old_mtime_ns(), [], [])
+    index.prune('/src', {'/src', '/src/a'})
+    assert sorted(index.entries) == ['/src', '/src/a', '/src2/c']
+
+
+def test_rescan_reads_only_changed_directories(tmp_path, monkeypatch):
+    """Au second scan, seuls les dossiers modifiés sont relus, et le résultat est identique"""
+    root = tmp_path / 'src'
+    make_tree(root, {'A/A.cpr': b'a', 'A/Audio/k.wav': b'k', 'B/B.cpr': b'b'})
+    age_tree(root)
+    index_file = tmp_path / 'scan_index.json'
+    first = CubaseScanner(index=ScanIndex(index_file))
+    first.scan_directory(str(root))
+    assert index_file.exists()
+
+    (root / 'B' / 'B-02.cpr').write_bytes(b'b2')
+    calls = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(scanner_module.os, 'scandir', lambda path: calls.append(path) or real_scandir(path))
+
+    second = CubaseScanner(index=ScanIndex(index_file))
+    second.scan_directory(str(root))
+
+    assert calls == [str(root / 'B')]
+    assert len(second.projects['B']['cpr_files']) == 2
+    assert [record.path for record in second.projects['A']['wav_files']] == \
+        [record.path for record in first.projects['A']['wav_files']]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des règles d'exclusion et des limites du scan (services/scan_rules.py)
+"""
+
+import os
+
+import pytest
+
+from conftest import make_tree
+from services.scan_index import ScanIndex
+from services.scan_rules import ScanRules, rules_from_settings, DEFAULT_RULES_KEY
+from services.scanner import CubaseScanner
+
+
+@pytest.mark.parametrize('patterns, rel_path, is_dir, excluded', [
+    (['Freeze'], 'Freeze', True, True),
+    (['Freeze'], 'Morceau/Freeze', True, True),
+    (['/Edits'], 'Edits', True, True),
+    (['/Edits'], 'Morceau/Edits', True, False),
+    (['Audio/Fades'], 'Audio/Fades', True, True),
+    (['Audio/Fades'], 'Morceau/Audio/Fades', True, False),
+    (['cache/'], 'cache', False, False),
+    (['cache/'], 'a/cache', True, True),
+    (['*.tmp'], 'a/b/x.tmp', False, True),
+    (['**/Backup/*.bak'], 'a/b/Backup/x.bak', False, True),
+    (['Sample?'], 'Sample1', True, True),
+    (['[ab].wav'], 'c.wav', False, False),
+    (['*.wav', '!Keep.wav'], 'Keep.wav', False, False),
+    (['*.wav', '!Keep.wav'], 'Drop.wav', False, True),
+    (['# commentaire', ''], 'commentaire', False, False),
+])
+def test_excludes_gitignore_syntax(patterns, rel_path, is_dir, excluded):
+    """Motifs au sens de .gitignore : nom à tout niveau, ancrage, dossiers seuls, négation"""
+    assert ScanRules(patterns).excludes(rel_path.replace('/', os.sep), is_dir) is excluded
+
+
+def test_depth_key_and_settings():
+    """Limite de profondeur, signature des règles et lecture des paramètres"""
+    rules = ScanRules(['Freeze'], max_depth=1, max_entries=100)
+    assert rules.allows_depth(1) and not rules.allows_depth(2)
+    assert ScanRules().key() == '' and ScanRules(max_depth=3).key() == ''
+    assert rules.key() != ScanRules(['Freeze']).key()
+    assert ScanRules.from_dict(rules.to_dict()).to_dict() == rules.to_dict()
+
+    parsed = rules_from_settings({'*': {'exclude': ['Freeze']}, '/src/': {'max_depth': 2}, '/bad': 'x'})
+    assert sorted(parsed) == sorted([DEFAULT_RULES_KEY, os.path.normpath('/src')])
+
+
+def test_scanner_applies_rules(tmp_path):
+    """Dossiers exclus, trop profonds ou trop volumineux ne sont pas parcourus"""
+    make_tree(tmp_path, {
+        'Morceau/Morceau.cpr': b'cpr',
+        'Morceau/Freeze/f.wav': b'freeze',
+        'Morceau/Audio/Sub/deep.wav': b'deep',
+        'Banque/1.wav': b'1', 'Banque/2.wav': b'2', 'Banque/3.wav': b'3', 'Banque/4.wav': b'4',
+    })
+    rules = {DEFAULT_RULES_KEY: ScanRules(['Freeze'], max_depth=2, max_entries=3)}
+    scanner = CubaseScanner(rules=rules)
+    scanner.scan_directory(str(tmp_path))
+
+    names = {record.name for project in scanner.projects.values()
+             for key in ['cpr_files', 'wav_files'] for record in project[key]}
+    assert names == {'Morceau.cpr'}
+
+
+def test_index_entries_depend_on_rules(tmp_path):
+    """Un dossier indexé avec d'autres règles est relu"""
+    make_tree(tmp_path / 'src', {'A/a.wav': b'a', 'A/b.tmp': b'b'})
+    for dirpath, _, _ in os.walk(tmp_path / 'src'):
+        os.utime(dirpath, (1_000_000_000, 1_000_000_000))
+    index = ScanIndex(tmp_path / 'scan_index.json')
+    CubaseScanner(index=index).scan_directory(str(tmp_path / 'src'))
+
+    scanner = CubaseScanner(index=index, rules={DEFAULT_RULES_KEY: ScanRules(['*.tmp'])})
+    scanner.scan_directory(str(tmp_path / 'src'))
+    assert [record.name for record in scanner.projects['A']['other_files']] == []
+    assert [record.name for record in scanner.projects['A']['wav_files']] == ['a.wav']
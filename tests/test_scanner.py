@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du scanner de projets Cubase (services/scanner.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import make_tree
+from services import scanner as scanner_module
+from services.scanner import CubaseScanner
+
+# Espace de travail : deux projets Cubase et un dossier de fichiers isolés
+WORKSPACE = {
+    'Morceau/Morceau.cpr': b'cpr v1',
+    'Morceau/Morceau-02.cpr': b'cpr v2!',
+    'Morceau/Morceau.bak': b'bak',
+    'Morceau/Audio/Kick.wav': b'kick',
+    'Morceau/Audio/Snare.wav': b'snare',
+    'Autre/Autre.cpr': b'autre',
+    'Autre/Mixdown/Autre.wav': b'mix',
+    'Divers/notes.txt': b'notes',
+}
+
+
+def count_scandir(monkeypatch):
+    """Compteur des dossiers lus par os.scandir pendant un scan"""
+    calls = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        calls.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(scanner_module.os, 'scandir', scandir)
+    return calls
+
+
+def test_copy_project_keeps_project_subfolders(tmp_path):
+    """Les fichiers des sous-dossiers du projet sont copiés dans le même sous-dossier"""
+    project_dir = tmp_path / 'sources' / 'Morceau'
+    files = {
+        'Morceau.cpr': b'cpr',
+        'Audio/Kick.wav': b'audio',
+        'Edits/Kick.wav': b'edit',
+        'Fades/Fade.wav': b'fade',
+        'Freeze/Synth.wav': b'freeze',
+        'Images/Kick.wav': b'image',
+    }
+    for relative, content in files.items():
+        path = project_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path / 'sources'))
+    destination = tmp_path / 'copie'
+    assert scanner.copy_project('Morceau', str(destination))
+
+    for relative, content in files.items():
+        assert (destination / 'Morceau' / relative).read_bytes() == content
+    assert not (destination / 'Morceau' / 'Kick.wav').exists()
+
+
+def test_copy_project_from_several_roots(tmp_path):
+    """Projet présent dans deux sources : chaque fichier garde son sous-dossier"""
+    files = {
+        'd1/Song/Song.cpr': b'cpr',
+        'd1/Song/Audio/k.wav': b'audio',
+        'd2/Song/Song-02.cpr': b'cpr 2',
+        'd2/Song/Edits/k.wav': b'edit',
+    }
+    for relative, content in files.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    scanner = CubaseScanner()
+    scanner.scan_multiple_directories([str(tmp_path / 'd1'), str(tmp_path / 'd2')])
+    assert scanner.project_relative_path(str(tmp_path / 'd2/Song/Edits/k.wav')).as_posix() == 'Edits/k.wav'
+
+    destination = tmp_path / 'copie'
+    assert scanner.copy_project('Song', str(destination))
+    assert (destination / 'Song' / 'Audio' / 'k.wav').read_bytes() == b'audio'
+    assert (destination / 'Song' / 'Edits' / 'k.wav').read_bytes() == b'edit'
+
+
+def test_workspace_scan_reads_each_directory_once(tmp_path, monkeypatch):
+    """Un seul passage sur l'arborescence donne la synthèse de tous les projets"""
+    make_tree(tmp_path, WORKSPACE)
+    os.utime(tmp_path / 'Morceau/Morceau-02.cpr', (2_000_000_000, 2_000_000_000))
+    calls = count_scandir(monkeypatch)
+
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path))
+
+    assert sorted(calls) == sorted(set(calls))
+    assert len(calls) == 6
+    summaries = {summary['project_name']: summary for summary in scanner.df_projects}
+    morceau = summaries['Morceau']
+    assert morceau['project_dir'] == str(tmp_path / 'Morceau')
+    assert morceau['latest_cpr'] == str(tmp_path / 'Morceau/Morceau-02.cpr')
+    assert (morceau['cpr_count'], morceau['bak_count'], morceau['wav_count'], morceau['other_count']) == (2, 1, 2, 0)
+    assert morceau['total_size'] == sum(len(WORKSPACE[name]) for name in WORKSPACE if name.startswith('Morceau/'))
+    assert summaries['Autre']['wav_count'] == 0 and summaries['Mixdown']['wav_count'] == 1
+    assert summaries['Divers']['other_count'] == 1
+
+
+def test_scandir_engine_records_and_links(tmp_path):
+    """Taille et dates viennent du stat de chaque fichier ; liens vers des dossiers non suivis, liens cassés ignorés"""
+    make_tree(tmp_path / 'src', {'Morceau/Morceau.cpr': b'cpr', 'Morceau/Audio/Kick.wav': b'kick'})
+    make_tree(tmp_path / 'ailleurs', {'Externe/Externe.cpr': b'externe'})
+    os.symlink(tmp_path / 'ailleurs' / 'Externe', tmp_path / 'src' / 'Lien')
+    os.symlink(tmp_path / 'absent.wav', tmp_path / 'src' / 'Morceau' / 'Cassé.wav')
+
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path / 'src'))
+
+    assert 'Externe' not in scanner.projects and 'Lien' not in scanner.projects
+    assert str(tmp_path / 'src' / 'Lien') in scanner.get_directories(str(tmp_path / 'src'))
+    project = scanner.projects['Morceau']
+    assert [record.name for record in project['wav_files']] == ['Kick.wav']
+    record = project['cpr_files'][0]
+    stat = os.stat(record.path)
+    assert (record.size, record.mtime, record.ctime) == (stat.st_size, stat.st_mtime, stat.st_ctime)
+    assert record.source == str(tmp_path / 'src')
+
+
+def test_parallel_roots_merged_in_order(tmp_path):
+    """Racines scannées en parallèle : fusion dans l'ordre des racines, même résultat qu'un seul thread"""
+    for root in ['r1', 'r2', 'r3']:
+        make_tree(tmp_path / root, {f'Song/Song-{root}.cpr': root.encode(), f'{root}/Seul.cpr': b'x'})
+    roots = [str(tmp_path / root) for root in ['r3', 'r1', 'absent', 'r2']]
+
+    progress = []
+    scanner = CubaseScanner()
+    scanner.scan_multiple_directories(roots, progress_callback=progress.append, workers_per_device=2)
+
+    song = scanner.projects['Song']
+    assert [record.name for record in song['cpr_files']] == ['Song-r3.cpr', 'Song-r1.cpr', 'Song-r2.cpr']
+    assert song['source'] == "Plusieurs sources"
+    assert scanner.projects['r1']['source'] == str(tmp_path / 'r1')
+    assert progress[-1] == 100 and progress == sorted(progress)
+
+    sequential = CubaseScanner()
+    sequential.scan_multiple_directories(roots, workers_per_device=1)
+    assert sequential.df_projects == scanner.df_projects
+
+
+def test_projects_streamed_during_scan(tmp_path, monkeypatch):
+    """Les lots transmis pendant le scan couvrent tous les projets, le dernier état de chacun est final"""
+    make_tree(tmp_path, WORKSPACE)
+    monkeypatch.setattr(scanner_module, 'BATCH_INTERVAL', 0)
+    batches = []
+
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path), projects_callback=batches.append)
+
+    assert len(batches) > 1
+    latest = {}
+    for batch in batches:
+        for summary in batch:
+            latest[summary['project_name']] = summary
+    final = {summary['project_name']: summary for summary in scanner.df_projects
+             if summary['cpr_count'] + summary['bak_count'] + summary['wav_count'] + summary['other_count']}
+    assert latest == final
+
+
+def test_cancelled_scan_stops_and_keeps_index(tmp_path, monkeypatch):
+    """Un scan annulé s'arrête au dossier suivant, sans élaguer l'index"""
+    from services.cancel_token import CancelToken
+    from services.scan_index import ScanIndex
+
+    make_tree(tmp_path / 'src', WORKSPACE)
+    index = ScanIndex(tmp_path / 'scan_index.json')
+    index.entries[str(tmp_path / 'src' / 'Disparu')] = {'mtime': 0, 'dirs': [], 'files': []}
+    token = CancelToken()
+    calls = count_scandir(monkeypatch)
+    real_scandir = scanner_module.os.scandir
+
+    def cancel_on_second(path):
+        entries = real_scandir(path)
+        if len(calls) == 2:
+            token.cancel()
+        return entries
+
+    monkeypatch.setattr(scanner_module.os, 'scandir', cancel_on_second)
+    scanner = CubaseScanner(index=index)
+    scanner.scan_directory(str(tmp_path / 'src'), cancel_token=token)
+
+    assert len(calls) == 2
+    # Seule la racine, sans fichier, a été lue jusqu'au bout
+    assert not any(summary['cpr_count'] or summary['wav_count'] for summary in scanner.df_projects)
+    assert str(tmp_path / 'src' / 'Disparu') in index.entries
+
+    untouched = CubaseScanner()
+    untouched.scan_multiple_directories([str(tmp_path / 'src')], cancel_token=token)
+    assert not untouched.projects
+
+
+def test_refresh_directories_matches_full_rescan(tmp_path):
+    """La mise à jour des dossiers signalés par le surveillant donne le même résultat qu'un nouveau scan"""
+    import shutil
+
+    make_tree(tmp_path, WORKSPACE)
+    scanner = CubaseScanner()
+    scanner.scan_directory(str(tmp_path))
+
+    (tmp_path / 'Morceau' / 'Audio' / 'Hat.wav').write_bytes(b'hat')
+    (tmp_path / 'Autre' / 'Mixdown' / 'Autre.wav').unlink()
+    shutil.rmtree(tmp_path / 'Divers')
+    updated, removed = scanner.refresh_directories(
+        str(tmp_path), [str(tmp_path / 'Morceau' / 'Audio'), str(tmp_path / 'Autre' / 'Mixdown'),
+                        str(tmp_path / 'Divers')])
+
+    # Dossiers vidés : leurs projets disparaissent
+    assert updated == {'Morceau'}
+    assert removed == {'Mixdown', 'Divers'}
+    assert scanner.projects['Morceau']['wav_files'].total_size() == len(b'kick' + b'snare' + b'hat')
+    rescan = CubaseScanner()
+    rescan.scan_directory(str(tmp_path))
+    key = lambda summary: summary['project_name']
+    assert sorted(scanner.df_projects, key=key) == sorted(rescan.df_projects, key=key)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du cache persistant des analyses VSTi (services/vsti_cache.py)
+"""
+
+import os
+
+from conftest import build_cpr, plugin_record
+from services import lectureCPR
+from services.vsti_cache import VstiCache, vsti_list_hash
+
+
+def write_old_cpr(path, content):
+    """CPR dont la date de modification est reculée hors de la fenêtre RECENT_DELAY"""
+    path.write_bytes(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 10))
+    return str(path)
+
+
+def test_lookup_invalidated_by_file_or_list_change(vsti_list, tmp_path):
+    """Une entrée n'est servie que pour les mêmes taille, date et liste des VSTi"""
+    vsti_list(['Serum'])
+    cpr_path = write_old_cpr(tmp_path / 'Alpha.cpr', b'XXXX..Serum 01..')
+    cache = VstiCache(tmp_path / 'vsti_cache.json')
+    cache.store(cpr_path, {'Serum 01'})
+    assert cache.lookup(cpr_path) == {'Serum 01'}
+    assert VstiCache(tmp_path / 'vsti_cache.json').lookup(cpr_path) is None
+
+    cache.save()
+    assert VstiCache(tmp_path / 'vsti_cache.json').lookup(cpr_path) == {'Serum 01'}
+
+    # Liste des VSTi modifiée (VstiManagerDialog)
+    vsti_list(['Serum', 'Diva'])
+    assert cache.lookup(cpr_path) is None
+
+    # Même taille, autre date
+    cache.store(cpr_path, {'Serum 01'})
+    stat = os.stat(cpr_path)
+    os.utime(cpr_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+    assert cache.lookup(cpr_path) is None
+
+    # Autre taille
+
+    cache.store(cpr_path, {'Serum 02'})
+    write_old_cpr(tmp_path / 'Alpha.cpr', b'XXXX..Serum 02....')
+    assert cache.lookup(cpr_path) is None
+
+
+def test_recent_file_not_stored(vsti_list, tmp_path):
+    """Un CPR en cours d'enregistrement par Cubase sera réanalysé"""
+    vsti_list(['Serum'])
+    cpr_path = tmp_path / 'Alpha.cpr'
+    cpr_path.write_bytes(b'XXXX..Serum 01..')
+    cache = VstiCache(tmp_path / 'vsti_cache.json')
+    cache.store(str(cpr_path), {'Serum 01'}, list_hash=vsti_list_hash())
+    assert cache.lookup(str(cpr_path)) is None
+
+
+def test_analyse_uses_cache(vsti_list, tmp_path, monkeypatch):
+    """Une seconde analyse du même fichier ne relit pas le CPR"""
+    vsti_list(['Serum'])
+    cpr_path = write_old_cpr(tmp_path / 'Alpha.cpr', build_cpr(plugin_record('Serum')))
+    cache = VstiCache(tmp_path / 'vsti_cache.json')
+    calls = []
+    real_trouve_vsti = lectureCPR.trouve_vsti
+    monkeypatch.setattr(lectureCPR, 'trouve_vsti',
+                        lambda *args, **kwargs: calls.append(args) or real_trouve_vsti(*args, **kwargs))
+
+    assert cache.analyse(cpr_path) == ({'Serum'}, False)
+    assert cache.analyse(cpr_path) == ({'Serum'}, False)
+    assert len(calls) == 1
+    assert (tmp_path / 'vsti_cache.json').exists()
+
+
+def test_interrupted_analyse_not_stored(vsti_list, tmp_path):
+    """Le résultat partiel d'une analyse interrompue n'est pas enregistré"""
+    vsti_list(['Serum'])
+    cpr_path = write_old_cpr(tmp_path / 'Alpha.cpr', build_cpr(plugin_record('Serum')))
+    cache = VstiCache(tmp_path / 'vsti_cache.json')
+
+    found, interrupted = cache.analyse(cpr_path, lambda done, total: False)
+    assert interrupted and found == set()
+    assert cache.lookup(cpr_path) is None
+    assert cache.analyse(cpr_path) == ({'Serum'}, False)
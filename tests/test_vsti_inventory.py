@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de l'inventaire des VSTi d'un workspace (services/vsti_inventory.py)
+"""
+
+import multiprocessing
+
+from services import vsti_inventory
+from services.cancel_token import CancelToken
+from services.vsti_cache import VstiCache
+from services.vsti_inventory import VstiInventory, plugin_key
+
+
+def make_projects(tmp_path, contents):
+    """Projets d'un seul CPR (contenu brut) au format de CubaseScanner.df_projects"""
+    projects = []
+    for name, data in contents.items():
+        cpr_path = tmp_path / f'{name}.cpr'
+        cpr_path.write_bytes(b'XXXX' + data)
+        projects.append({'project_name': name, 'project_dir': str(tmp_path), 'latest_cpr': str(cpr_path)})
+    return projects
+
+
+def test_plugin_key_removes_instance_number():
+    """Le numéro d'instance ajouté par Cubase est retiré, pas les chiffres du nom"""
+    assert plugin_key('Serum 01') == 'Serum'
+    assert plugin_key('Kick 2 01') == 'Kick 2'
+    assert plugin_key(' Kontakt ') == 'Kontakt'
+
+
+def test_build_indexes_plugins_and_uses_cache(vsti_list, tmp_path):
+    """Index inversé plugin -> projets, puis second inventaire servi par le cache"""
+    vsti_list(['Serum', 'Diva'])
+    projects = make_projects(tmp_path, {'Alpha': b'..Serum 01..Diva..', 'Beta': b'..Serum 02..'})
+    cache = VstiCache(tmp_path / 'cache.json')
+
+    inventory = VstiInventory()
+    assert inventory.build(projects, max_workers=2, cache=cache)
+    assert inventory.plugins == {'Diva': ['Alpha'], 'Serum': ['Alpha', 'Beta']}
+    assert inventory.projects_using('Serum 03') == ['Alpha', 'Beta']
+
+    again = VstiInventory()
+    assert again.build(projects, max_workers=2, cache=cache)
+    assert again.plugins == inventory.plugins
+
+
+def test_cancelled_build_leaves_no_worker(vsti_list, tmp_path):
+    """Un inventaire annulé s'arrête sans laisser de processus d'analyse actif"""
+    vsti_list(['Serum'])
+    projects = make_projects(tmp_path, {f'P{index}': b'Serum 01' + b'\x00' * 1024 * 1024 for index in range(8)})
+    token = CancelToken()
+    token.cancel()
+
+    inventory = VstiInventory()
+    assert not inventory.build(projects, max_workers=2, cancel_token=token,
+                               cache=VstiCache(tmp_path / 'cache.json'))
+    assert not inventory.complete
+    assert multiprocessing.active_children() == []
+
+
+def test_running_analysis_stops_on_cancel_event(vsti_list, tmp_path, monkeypatch):
+    """Une analyse en cours dans le pool s'interrompt quand l'inventaire est annulé"""
+    vsti_list(['Serum'])
+    cpr_path = make_projects(tmp_path, {'Alpha': b'Serum 01'})[0]['latest_cpr']
+    event = multiprocessing.Event()
+    monkeypatch.setattr(vsti_inventory, '_cancel_event', event)
+
+    _, found, _, error = vsti_inventory._analyse_cpr(cpr_path)
+    assert (found, error) == (['Serum 01'], None)
+    event.set()
+    assert vsti_inventory._analyse_cpr(cpr_path) == (cpr_path, [], None, "Analyse interrompue")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du catalogue des VSTi (services/vsti_manager.py)
+"""
+
+import json
+import os
+import random
+import re
+import threading
+
+import pytest
+
+from services.vsti_manager import VstiCatalogue
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    """Catalogue sur une liste temporaire, sans écriture différée"""
+    path = tmp_path / 'vsti_list.json'
+    path.write_text(json.dumps([{'name': 'Serum', 'editor': 'Xfer Records'}]), encoding='utf-8')
+    catalogue = VstiCatalogue(str(path), save_delay=60)
+    catalogue.entries
+    return catalogue
+
+
+def lock_free(catalogue):
+    """Le verrou du catalogue peut-il être pris depuis un autre thread ?"""
+    result = []
+
+    def try_lock():
+        acquired = catalogue._lock.acquire(timeout=1)
+        if acquired:
+            catalogue._lock.release()
+        result.append(acquired)
+
+    thread = threading.Thread(target=try_lock)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def subscribe_checker(catalogue):
+    """Abonné qui note, à chaque appel, si le verrou était libre"""
+    calls = []
+    catalogue.subscribe(lambda: calls.append(lock_free(catalogue)))
+    return calls
+
+
+def test_subscribers_called_outside_the_lock(catalogue):
+    """Chaque modification prévient les abonnés une fois, verrou libéré"""
+    calls = subscribe_checker(catalogue)
+    assert catalogue.add({'name': 'Diva', 'editor': 'u-he'})
+    assert catalogue.update('Diva', 'Diva 2')
+    assert catalogue.merge([{'name': 'Pigments', 'editor': 'Arturia'}]) == 1
+    assert catalogue.remove('Pigments')
+    catalogue.replace([{'name': 'Serum', 'editor': 'Xfer Records'}])
+    assert calls == [True] * 5
+
+
+def test_no_notification_without_change(catalogue):
+    """Une modification sans effet ne prévient pas les abonnés"""
+    calls = subscribe_checker(catalogue)
+    assert not catalogue.add('Serum')
+    assert not catalogue.remove('Absent')
+    assert catalogue.merge([{'name': 'serum', 'editor': 'Autre'}]) == 0
+    catalogue.replace(catalogue.snapshot())
+    assert calls == []
+
+
+def test_external_change_notified_outside_the_lock(catalogue):
+    """Une relecture du fichier déclenchée par une lecture prévient les abonnés verrou libéré"""
+    calls = subscribe_checker(catalogue)
+    path = catalogue.path
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{'name': 'Serum', 'editor': 'Xfer Records'}, {'name': 'Diva', 'editor': 'u-he'}], f)
+    # Date de modification différente même sur un système de fichiers peu précis
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert catalogue.editor_of('Diva 01') == 'u-he'
+    assert calls == [True]
+
+
+def test_subscriber_may_use_the_catalogue(catalogue):
+    """Un abonné peut relire et modifier le catalogue depuis son rappel"""
+    seen = []
+
+    def callback():
+        seen.append(catalogue.names())
+        if 'Diva' not in catalogue.names():
+            catalogue.add('Diva')
+
+    catalogue.subscribe(callback)
+    catalogue.remove('Serum')
+    assert seen == [(), ('Diva',)]
+
+
+def linear_editor_lookup(vsti_list, vsti_name):
+    """Recherche d'origine de l'éditeur : quatre parcours de la liste, une expression par entrée"""
+    vsti_name_stripped = vsti_name.strip()
+    if not (vsti_list and isinstance(vsti_list[0], dict) and 'editor' in vsti_list[0] and 'name' in vsti_list[0]):
+        return 'Inconnu'
+    for vst in vsti_list:
+        if vsti_name_stripped.lower() == vst['name'].lower():
+            return vst.get('editor', 'Inconnu')
+    for vst in vsti_list:
+        pattern = r'^' + re.escape(vst['name'].strip()) + r'(?:\s*\d*)$'
+        if re.match(pattern, vsti_name_stripped, re.IGNORECASE):
+            return vst.get('editor', 'Inconnu')
+    vsti_name_clean = vsti_name_stripped.lower().replace(' ', '')
+    for vst in vsti_list:
+        pattern = r'^' + re.escape(vst['name'].lower().replace(' ', '')) + r'(?:\d*)$'
+        if re.match(pattern, vsti_name_clean):
+            return vst.get('editor', 'Inconnu')
+    for vst in vsti_list:
+        if vst['name'].lower() in vsti_name_stripped.lower():
+            return vst.get('editor', 'Inconnu')
+    return 'Inconnu'
+
+
+@pytest.mark.parametrize('vsti_name, editor', [
+    ('Kick 2', 'B'),            # nom exact
+    ('kick 2 01', 'B'),         # instance numérotée : "Kick 2" plutôt que "Kick"
+    ('Kick 01', 'A'),
+    ('Kick2 3', 'A'),           # sans les espaces : "kick" + "23"
+    ('Big Kick 2 Layer', 'A'),  # nom contenu : première entrée de la liste
+    ('Snare', 'Inconnu'),
+])
+def test_editor_of_rules(tmp_path, vsti_name, editor):
+    """Règles de recherche de l'éditeur sur quelques cas connus"""
+    path = tmp_path / 'vsti_list.json'
+    path.write_text(json.dumps([{'name': 'Kick', 'editor': 'A'}, {'name': 'Kick 2', 'editor': 'B'}]),
+                    encoding='utf-8')
+    assert VstiCatalogue(str(path)).editor_of(vsti_name) == editor
+
+
+def test_editor_of_matches_linear_lookup(tmp_path):
+    """Les index donnent le même éditeur que le parcours d'origine de la liste"""
+    rng = random.Random(20)
+    words = ['Kick', 'kick', 'Kick 2', 'Pro', 'Pro-Q', 'Pro-Q 3', 'Serum', 'SERUM', 'Omni sphere', 'Keys 1', '']
+    fragments = ['', ' ', '  ', '1', '01', ' 01', ' 2 01', '2', 'x', ' Layer', '-Q']
+    path = tmp_path / 'vsti_list.json'
+    for _ in range(100):
+        entries = [{'name': name, 'editor': f'Éditeur {position}'}
+                   for position, name in enumerate(rng.sample(words, rng.randint(1, len(words))))]
+        path.write_text(json.dumps(entries), encoding='utf-8')
+        catalogue = VstiCatalogue(str(path))
+        for _ in range(30):
+            vsti_name = rng.choice(fragments) + rng.choice(words) + rng.choice(fragments) + rng.choice(fragments)
+            if rng.random() < 0.3:
+                vsti_name = vsti_name.upper()
+            assert catalogue.editor_of(vsti_name) == linear_editor_lookup(entries, vsti_name), (entries, vsti_name)
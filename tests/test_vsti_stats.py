@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des statistiques d'utilisation des plugins (services/vsti_stats.py)
+"""
+
+import os
+from datetime import datetime
+
+from services.vsti_cache import VstiCache, vsti_list_hash
+from services.vsti_stats import VstiStats, PERIOD_YEAR
+
+EDITORS = {'Serum': 'Xfer Records', 'Diva': 'u-he', 'Zebra': 'u-he', 'Kontakt': 'Native Instruments'}
+
+
+def make_stats():
+    """Statistiques de trois projets, avec un plugin connu jamais utilisé (Zebra)"""
+    stats = VstiStats(editor_of=lambda plugin: EDITORS.get(plugin, 'Inconnu'))
+    stats.add_known_plugins(['Serum', 'Diva', 'Zebra', 'Kontakt'])
+    stats.add_project('Alpha', ['Serum 01', 'Serum 02', 'Diva'], datetime(2023, 5, 1))
+    stats.add_project('Beta', ['Serum 01', 'Kontakt'], datetime(2024, 2, 1))
+    stats.add_project('Gamma', ['Serum 01'], datetime(2024, 7, 1))
+    return stats
+
+
+def test_least_used_reports_unused_known_plugins():
+    """Un plugin de la liste utilisé par aucun projet est le moins utilisé"""
+    stats = make_stats()
+    assert stats.least_used(limit=3) == [('Zebra', 0), ('Diva', 1), ('Kontakt', 1)]
+    assert stats.most_used(limit=1) == [('Serum', 3)]
+
+
+def test_unused_plugins_kept_after_removing_projects():
+    """Un plugin connu reste dans l'index quand son dernier projet est retiré"""
+    stats = make_stats()
+    stats.remove_project('Alpha')
+    assert stats.plugin_count('Diva') == 0
+    assert ('Diva', 0) in stats.least_used(limit=None)
+    assert stats.plugins() == ['Kontakt', 'Serum']
+
+
+def test_editors_and_breakage():
+    """Éditeurs utilisés et projets touchés par la désinstallation d'un éditeur"""
+    stats = make_stats()
+    assert stats.editors() == ['Native Instruments', 'u-he', 'Xfer Records']
+    assert stats.projects_broken_by(editor='u-he') == {'Alpha': [('Diva', 1)]}
+    assert stats.projects_broken_by(['serum 05']) == {'Alpha': [('Serum', 2)], 'Beta': [('Serum', 1)],
+                                                       'Gamma': [('Serum', 1)]}
+    assert stats.usage_by_editor(PERIOD_YEAR)['Xfer Records'] == {'2023': 1, '2024': 2}
+
+
+def test_build_from_cache_seeds_vsti_list(vsti_list, tmp_path):
+    """La construction lit les analyses en cache et indexe les VSTi de la liste"""
+    vsti_list([{'name': 'Serum', 'editor': 'Xfer Records'}, {'name': 'Diva', 'editor': 'u-he'}])
+    cpr_path = tmp_path / 'Alpha.cpr'
+    cpr_path.write_bytes(b'XXXX')
+    stat = os.stat(cpr_path)
+    os.utime(cpr_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 10))
+    cache = VstiCache(tmp_path / 'vsti_cache.json')
+    cache.store(str(cpr_path), {'Serum 01'}, list_hash=vsti_list_hash())
+
+    stats = VstiStats()
+    projects = [{'project_name': 'Alpha', 'latest_cpr': str(cpr_path)},
+                {'project_name': 'Beta', 'latest_cpr': str(tmp_path / 'Beta.cpr')}]
+    assert stats.build(projects, cache=cache) == 1
+    assert stats.unanalysed == ['Beta']
+    assert stats.least_used() == [('Diva', 0), ('Serum', 1)]
+    assert stats.plugin_editors['Diva'] == 'u-he'
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du chargement différé des fenêtres de chaque mode (gui/window_factory.py)
+"""
+
+import os
+import subprocess
+import sys
+
+from config.constants import MODE_TRI, MODE_GESTION
+from gui import window_factory
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules qui ne doivent pas être chargés avant l'affichage d'une fenêtre
+HEAVY_PREFIXES = ('PyQt5', 'numpy', 'scipy', 'lxml', 'gui.sort_mode', 'gui.workspace_mode', 'gui.gestion_mode')
+
+
+def test_startup_imports_no_mode_module():
+    """main et la fabrique des fenêtres n'importent ni les modes ni leurs dépendances lourdes"""
+    code = ("import sys, main, gui.window_factory\n"
+            "print('\\n'.join(sorted(sys.modules)))\n")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = [name for name in result.stdout.splitlines() if name.startswith(HEAVY_PREFIXES)]
+    assert loaded == []
+
+
+class FakeWindow:
+    """Fenêtre factice : compte les créations et les fermetures"""
+
+    created = []
+
+    def __init__(self):
+        self.closed = False
+        FakeWindow.created.append(self)
+
+    def close(self):
+        self.closed = True
+
+
+def test_windows_reused_until_closed(monkeypatch):
+    """Une fenêtre par mode, réutilisée lors d'un changement de mode, fermée à la sortie"""
+    monkeypatch.setattr(window_factory, '_windows', {})
+    monkeypatch.setattr(window_factory, 'window_class', lambda mode: FakeWindow)
+    FakeWindow.created = []
+
+    sort_window = window_factory.get_window(MODE_TRI)
+    gestion_window = window_factory.get_window(MODE_GESTION)
+    assert window_factory.get_window(MODE_TRI) is sort_window
+    assert window_factory.get_window('inconnu') is sort_window
+    assert len(FakeWindow.created) == 2
+
+    window_factory.close_windows()
+    assert sort_window.closed and gestion_window.closed
+    assert window_factory.get_window(MODE_TRI) is not sort_window
@@ -0,0 +1,139 @@
+"""
+Benchmark du moteur de scan : ancien parcours rglob + Path.stat contre
+le parcours os.scandir de CubaseScanner.
+
+Génère une arborescence synthétique (100 000 fichiers par défaut), puis
+mesure pour chaque moteur la durée du scan et le nombre d'appels stat.
+
+Usage : python tools/bench_scanner.py [--files N] [--keep DOSSIER]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.scanner import CubaseScanner
+
+EXTENSIONS = ['.wav', '.wav', '.wav', '.wav', '.cpr', '.bak', '.txt', '.png']
+
+
+def build_tree(root, file_count, files_per_project=50):
+    """Création d'une arborescence de projets Cubase factices"""
+    for i in range(file_count):
+        project = Path(root) / f"Projet {i // files_per_project:05d}"
+        folder = project / "Audio" if i % 2 else project
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"fichier_{i}{EXTENSIONS[i % len(EXTENSIONS)]}").write_bytes(b"x" * (i % 64))
+
+
+def legacy_scan(root_dir):
+    """Reproduction de l'ancien parcours (rglob, is_file puis un stat par attribut)"""
+    root_path = Path(root_dir)
+    projects = defaultdict(lambda: defaultdict(list))
+    for path in root_path.rglob('*'):
+        if path.is_file():
+            projects[path.parent.name][path.suffix.lower()].append({
+                'path': str(path),
+                'size': path.stat().st_size,
+                'modified': datetime.fromtimestamp(path.stat().st_mtime),
+                'created': datetime.fromtimestamp(path.stat().st_ctime),
+                'source': str(root_path)
+            })
+        elif path.is_dir():
+            projects[path.parent.name]['directories'].append(str(path))
+    return projects
+
+
+def scandir_scan(root_dir):
+    """Parcours os.scandir du scanner"""
+    CubaseScanner().scan_directory(root_dir)
+
+
+class _CountingEntry:
+    """DirEntry instrumenté pour compter les appels stat réels"""
+    __slots__ = ('_entry',)
+    counter = None
+
+    def __init__(self, entry):
+        self._entry = entry
+
+    def stat(self, *args, **kwargs):
+        _CountingEntry.counter['stat'] += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+
+def count_stats(func, root_dir):
+    """Exécution d'un moteur en comptant os.stat et DirEntry.stat"""
+    counter = {'stat': 0}
+    _CountingEntry.counter = counter
+    real_stat = os.stat
+    real_scandir = os.scandir
+
+    def counting_stat(*args, **kwargs):
+        counter['stat'] += 1
+        return real_stat(*args, **kwargs)
+
+    class counting_scandir:
+        def __init__(self, path):
+            self._it = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._it.close()
+
+        def __iter__(self):
+            return (_CountingEntry(entry) for entry in self._it)
+
+    os.stat = counting_stat
+    os.scandir = counting_scandir
+    try:
+        func(root_dir)
+    finally:
+        os.stat = real_stat
+        os.scandir = real_scandir
+    return counter['stat']
+
+
+def timed(func, root_dir):
+    start = time.perf_counter()
+    func(root_dir)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scanner de projets")
+    parser.add_argument("--files", type=int, default=100000, help="Nombre de fichiers à générer")
+    parser.add_argument("--keep", help="Dossier à utiliser (conservé après le benchmark)")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="bench_scanner_")
+    Path(root).mkdir(parents=True, exist_ok=True)
+    try:
+        if not any(Path(root).iterdir()):
+            print(f"Génération de {args.files} fichiers dans {root}...")
+            build_tree(root, args.files)
+
+        for label, func in [("rglob + Path.stat", legacy_scan), ("os.scandir", scandir_scan)]:
+            stats = count_stats(func, root)
+            duration = timed(func, root)
+            print(f"{label:<20} {duration:8.2f} s  {stats:>9} appels stat")
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark mémoire du scanner : anciens enregistrements de fichiers (un
+dictionnaire et deux datetime par fichier) contre le stockage par colonnes
+des FileList.
+
+Génère une arborescence synthétique (200 000 fichiers par défaut), puis
+mesure avec tracemalloc le pic mémoire de chaque scan et la mémoire encore
+occupée par les projets trouvés.
+
+Usage : python tools/bench_scanner_memory.py [--files N] [--keep DOSSIER]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.scanner import CubaseScanner
+from tools.bench_scanner import build_tree
+
+
+class LegacyRecordScanner(CubaseScanner):
+    """Scanner produisant les anciens dictionnaires de fichiers"""
+
+    def __init__(self, index=None):
+        super().__init__(index)
+        self.projects = defaultdict(lambda: {
+            'cpr_files': [],
+            'bak_files': [],
+            'wav_files': [],
+            'other_files': [],
+            'directories': [],
+            'source': '',
+            'project_dir': ''
+        })
+
+    def _add_file(self, project_name, project_dir, source, name, size, mtime, ctime, directory=None):
+        project = self.projects[project_name]
+        if not project.get('project_dir'):
+            project['project_dir'] = project_dir
+        if not project.get('source'):
+            project['source'] = source
+        elif project['source'] != source:
+            project['source'] = "Plusieurs sources"
+
+        file_info = {
+            'path': os.path.join(directory or project_dir, name),
+            'size': size,
+            'modified': datetime.fromtimestamp(mtime),
+            'created': datetime.fromtimestamp(ctime),
+            # Copie de la chaîne, comme lorsque chaque fichier recalculait sa source
+            'source': ''.join(source)
+        }
+
+        ext = os.path.splitext(name)[1].lower()
+        if ext == '.cpr':
+            project['cpr_files'].append(file_info)
+        elif ext == '.bak':
+            project['bak_files'].append(file_info)
+        elif ext == '.wav':
+            project['wav_files'].append(file_info)
+        else:
+            project['other_files'].append(file_info)
+
+
+def measure(scanner_class, root_dir):
+    """Scan de root_dir, renvoie (pic, mémoire retenue) en octets"""
+    gc.collect()
+    tracemalloc.start()
+    scanner = scanner_class()
+    # Parcours seul : la synthèse des projets est identique pour les deux formats
+    scanner._scan_root(root_dir)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scanner
+    return peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mémoire du scanner de projets")
+    parser.add_argument("--files", type=int, default=200000, help="Nombre de fichiers à générer")
+    parser.add_argument("--keep", help="Dossier à utiliser (conservé après le benchmark)")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="bench_scanner_memory_")
+    Path(root).mkdir(parents=True, exist_ok=True)
+    try:
+        if not any(Path(root).iterdir()):
+            print(f"Génération de {args.files} fichiers dans {root}...")
+            build_tree(root, args.files)
+
+        results = {}
+        for label, scanner_class in [("dictionnaires", LegacyRecordScanner),
+                                     ("FileList", CubaseScanner)]:
+            peak, retained = measure(scanner_class, root)
+            results[label] = peak
+            print(f"{label:<15} pic {peak / 2**20:8.1f} Mo  retenu {retained / 2**20:8.1f} Mo")
+
+        print(f"Gain sur le pic : x{results['dictionnaires'] / results['FileList']:.1f}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
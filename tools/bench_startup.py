@@ -0,0 +1,111 @@
+"""
+Benchmark du démarrage : temps d'import de chaque mode (python -X importtime).
+
+Pour chaque mode, un interpréteur neuf importe ce que main.py charge avant
+d'afficher la fenêtre (PyQt5.QtWidgets puis le module du mode). Le rapport
+donne la durée totale, le temps cumulé des imports et les modules les plus
+coûteux. Avec --max-ms, le script échoue si un mode dépasse le seuil : il peut
+servir de garde-fou contre les régressions.
+
+Usage : python tools/bench_startup.py [--mode tri|workspace|gestion] [--top N]
+        [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from gui.window_factory import WINDOW_CLASSES
+
+# Modules lourds dont la présence au démarrage est signalée
+HEAVY_MODULES = ['numpy', 'scipy', 'lxml', 'PyQt5.QtMultimedia']
+
+# Code exécuté dans l'interpréteur mesuré
+STARTUP_CODE = (
+    "import main\n"
+    "from PyQt5.QtWidgets import QApplication\n"
+    "from gui.window_factory import window_class\n"
+    "window_class({mode!r})\n"
+)
+
+
+def parse_importtime(stderr):
+    """
+    Lecture de la sortie de -X importtime
+
+    Args:
+        stderr (str): Sortie d'erreur de l'interpréteur
+
+    Returns:
+        list: [(module, temps propre en µs, temps cumulé en µs, niveau)]
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip())) // 2
+            imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return imports
+
+
+def measure(mode):
+    """
+    Mesure du démarrage d'un mode dans un interpréteur neuf
+
+    Returns:
+        tuple: (durée totale en s, imports, code de retour, sortie d'erreur)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE.format(mode=mode)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    duration = time.perf_counter() - start
+    return duration, parse_importtime(result.stderr), result.returncode, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de l'application")
+    parser.add_argument("--mode", choices=list(WINDOW_CLASSES), help="Mode à mesurer (tous par défaut)")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de modules les plus lents affichés")
+    parser.add_argument("--runs", type=int, default=3, help="Nombre de mesures (la meilleure est retenue)")
+    parser.add_argument("--max-ms", type=float, help="Durée maximale tolérée par mode (ms)")
+    args = parser.parse_args()
+
+    failed = False
+    for mode in [args.mode] if args.mode else list(WINDOW_CLASSES):
+        runs = [measure(mode) for _ in range(max(1, args.runs))]
+        duration, imports, returncode, stderr = min(runs, key=lambda run: run[0])
+        if returncode != 0:
+            print(f"{mode:<10} échec de l'import :")
+            print('\n'.join(line for line in stderr.splitlines() if not line.startswith('import time:')))
+            failed = True
+            continue
+
+        total_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+        names = {name for name, _, _, _ in imports}
+        heavy = [module for module in HEAVY_MODULES if module in names]
+        print(f"{mode:<10} {duration * 1000:8.0f} ms au total, {total_ms:8.0f} ms d'imports, "
+              f"{len(imports)} modules")
+        print(f"{'':<10} modules lourds chargés : {', '.join(heavy) if heavy else 'aucun'}")
+        for name, _, cumulative, _ in sorted(imports, key=lambda i: i[2], reverse=True)[:args.top]:
+            print(f"{'':<10} {cumulative / 1000:8.1f} ms  {name}")
+
+        if args.max_ms is not None and duration * 1000 > args.max_ms:
+            print(f"{mode:<10} au-delà du seuil de {args.max_ms:.0f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
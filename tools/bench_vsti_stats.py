@@ -0,0 +1,79 @@
+"""
+Benchmark des statistiques d'utilisation des plugins (services/vsti_stats.py)
+
+Indexe des projets synthétiques (10 000 par défaut, une trentaine de plugins
+chacun) puis mesure chaque requête du panneau des statistiques.
+
+Usage : python tools/bench_vsti_stats.py [--projects N] [--plugins N] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.vsti_stats import VstiStats, PERIOD_YEAR, PERIOD_MONTH
+
+
+def synthetic_projects(project_count, plugin_count, seed=1):
+    """Projets factices : (nom, instances, date du dernier CPR)"""
+    rng = random.Random(seed)
+    plugins = [f"Plugin {i:04d}" for i in range(plugin_count)]
+    # Quelques plugins très utilisés, beaucoup de plugins rares
+    weights = [1 / (rank + 1) for rank in range(plugin_count)]
+    start = datetime(2012, 1, 1)
+    projects = []
+    for i in range(project_count):
+        chosen = set(rng.choices(plugins, weights, k=rng.randint(5, 60)))
+        instances = [f"{plugin} {n:02d}" for plugin in chosen for n in range(1, rng.randint(1, 3) + 1)]
+        projects.append((f"Projet {i:05d}", instances, start + timedelta(days=rng.randint(0, 4700))))
+    return projects
+
+
+def measure(label, function, runs):
+    """Durée médiane d'une requête"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    print(f"{label:45} {durations[len(durations) // 2] * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des statistiques d'utilisation des plugins")
+    parser.add_argument('--projects', type=int, default=10000, help="Nombre de projets")
+    parser.add_argument('--plugins', type=int, default=1500, help="Nombre de plugins distincts")
+    parser.add_argument('--runs', type=int, default=20, help="Mesures par requête")
+    args = parser.parse_args()
+
+    projects = synthetic_projects(args.projects, args.plugins)
+    vendors = [f"Éditeur {i:02d}" for i in range(40)]
+    stats = VstiStats(editor_of=lambda plugin: vendors[hash(plugin) % len(vendors)])
+
+    start = time.perf_counter()
+    for name, instances, date in projects:
+        stats.add_project(name, instances, date)
+    print(f"{'Indexation de ' + str(args.projects) + ' projets':45} {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    popular, rare = stats.most_used(1)[0][0], stats.least_used(1)[0][0]
+    measure("Projets utilisant le plugin le plus utilisé", lambda: stats.projects_using(popular), args.runs)
+    measure("Projets utilisant un plugin rare", lambda: stats.projects_using(rare), args.runs)
+    measure("Plugins les moins utilisés (20)", lambda: stats.least_used(20), args.runs)
+    measure("Utilisation par éditeur et par année", lambda: stats.usage_by_editor(PERIOD_YEAR), args.runs)
+    measure("Utilisation par éditeur et par mois", lambda: stats.usage_by_editor(PERIOD_MONTH), args.runs)
+    measure("Projets impactés (plugin le plus utilisé)", lambda: stats.projects_broken_by([popular]), args.runs)
+    measure("Projets impactés (un éditeur)", lambda: stats.projects_broken_by(editor=vendors[0]), args.runs)
+
+    name, instances, date = projects[0]
+    measure("Remplacement d'un projet", lambda: stats.add_project(name, instances, date), args.runs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
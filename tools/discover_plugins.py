@@ -0,0 +1,214 @@
+"""
+Découverte des plugins VST3/VST2 installés (voir services/plugin_discovery.py)
+
+Affiche les plugins trouvés dans les dossiers donnés (dossiers standards de la
+plateforme par défaut) et, avec --merge, ajoute les nouveaux instruments au
+catalogue des VSTi (config/vsti_list.json) ; --include-unknown y ajoute aussi
+les plugins de type inconnu (VST2, bundles sans moduleinfo.json).
+
+--fixtures DOSSIER crée d'abord un jeu de plugins factices (bundles VST3 avec
+moduleinfo.json ou Info.plist, bundle VST3 Windows, DLL VST2 avec ressource de
+version, DLL de support, .so) puis l'explore : la découverte se vérifie ainsi
+sous Linux, sans plugin installé.
+
+Usage : python tools/discover_plugins.py [DOSSIER...] [--fixtures DOSSIER]
+        [--cache FICHIER] [--merge [--include-unknown]] [--json]
+"""
+
+import argparse
+import json
+import os
+import plistlib
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.plugin_discovery import PluginDiscovery, plugin_folders, discover_into_catalogue
+
+
+def _utf16z(text):
+    """Chaîne UTF-16 terminée par un zéro"""
+    return text.encode('utf-16-le') + b'\x00\x00'
+
+
+def _pad4(data):
+    """Alignement sur 32 bits"""
+    return data + b'\x00' * (-len(data) % 4)
+
+
+def _version_node(key, value=b'', children=(), text=False):
+    """Structure de ressource de version (wLength, wValueLength, wType, clé, valeur, enfants)"""
+    value_length = len(value) // 2 if text else len(value)
+    body = _pad4(_pad4(b'\x00' * 6 + _utf16z(key)) + value)
+    for child in children:
+        body = _pad4(body + child)
+    return struct.pack('<3H', len(body), value_length, 1 if text else 0) + body[6:]
+
+
+def version_resource(strings):
+    """Ressource VS_VERSIONINFO contenant des chaînes (langue 0409, Unicode)"""
+    fixed = struct.pack('<13I', 0xFEEF04BD, 0x10000, 0x10000, 0, 0x10000, 0, 0x3F, 0, 0x40004, 2, 0, 0, 0)
+    table = _version_node('040904B0', children=[_version_node(key, _utf16z(value), text=True)
+                                                for key, value in strings.items()])
+    return _version_node('VS_VERSION_INFO', fixed, [_version_node('StringFileInfo', children=[table])])
+
+
+def build_pe(exports, strings):
+    """
+    Binaire PE32+ minimal : une section contenant les exports et la ressource
+    de version (suffisant pour services.plugin_discovery, pas pour Windows)
+    """
+    section_rva, section_offset = 0x1000, 0x400
+
+    # Répertoire d'exports : en-tête, table des noms, chaînes
+    names_rva = section_rva + 40
+    strings_rva = names_rva + 4 * len(exports)
+    name_table, name_blob = b'', b''
+    for name in exports:
+        name_table += struct.pack('<I', strings_rva + len(name_blob))
+        name_blob += name + b'\x00'
+    export = struct.pack('<IIHHIIIIIII', 0, 0, 0, 0, 0, 1, len(exports), len(exports), 0, names_rva, 0)
+    export_data = _pad4(export + name_table + name_blob)
+
+    # Ressources : type RT_VERSION -> nom 1 -> langue 0409 -> données
+    resource_start = len(export_data)
+    resource = version_resource(strings)
+
+    def directory(entry_id, target):
+        return struct.pack('<IIHHHH', 0, 0, 0, 0, 0, 1) + struct.pack('<II', entry_id, target)
+
+    data_entry_offset = 3 * 24
+    blob_rva = section_rva + resource_start + data_entry_offset + 16
+    tree = (directory(16, 0x80000000 | 24) + directory(1, 0x80000000 | 48) + directory(0x409, data_entry_offset)
+            + struct.pack('<4I', blob_rva, len(resource), 0, 0))
+    section = export_data + tree + resource
+
+    coff = struct.pack('<HHIIIHH', 0x8664, 1, 0, 0, 0, 240, 0x2022)
+    optional = bytearray(240)
+    struct.pack_into('<H', optional, 0, 0x20b)
+    struct.pack_into('<I', optional, 108, 16)
+    struct.pack_into('<II', optional, 112, section_rva, len(export_data))
+    struct.pack_into('<II', optional, 112 + 16, section_rva + resource_start, len(tree) + len(resource))
+    section_header = struct.pack('<8sIIIIIIHHI', b'.rsrc', len(section), section_rva, len(section),
+                                 section_offset, 0, 0, 0, 0, 0x40000040)
+
+    dos = bytearray(64)
+    dos[0:2] = b'MZ'
+    struct.pack_into('<I', dos, 0x3C, 64)
+    headers = bytes(dos) + b'PE\x00\x00' + coff + bytes(optional) + section_header
+    return headers.ljust(section_offset, b'\x00') + section
+
+
+def build_fixtures(root):
+    """Création d'un dossier de plugins factices, renvoie la liste des plugins attendus"""
+    root = Path(root)
+    vst3 = root / 'VST3'
+    vst2 = root / 'VST2'
+
+    # VST3 avec moduleinfo.json (JSON5 : commentaire et virgule finale)
+    resources = vst3 / 'Serum.vst3' / 'Contents' / 'Resources'
+    resources.mkdir(parents=True, exist_ok=True)
+    (resources / 'moduleinfo.json').write_text('''{
+  // Généré par le SDK VST3
+  "Name": "Serum",
+  "Factory Info": {"Vendor": "Xfer Records", "URL": "", "E-Mail": ""},
+  "Classes": [
+    {"CID": "01", "Category": "Audio Module Class", "Name": "Serum", "Sub Categories": ["Instrument", "Synth"]},
+    {"CID": "02", "Category": "Audio Module Class", "Name": "Serum FX", "Sub Categories": ["Fx"]},
+    {"CID": "03", "Category": "Component Controller Class", "Name": "Serum Controller"},
+  ],
+}''', encoding='utf-8')
+
+    # VST3 macOS (Info.plist binaire) rangé dans un sous-dossier d'éditeur
+    contents = vst3 / 'u-he' / 'Diva.vst3' / 'Contents'
+    contents.mkdir(parents=True, exist_ok=True)
+    with open(contents / 'Info.plist', 'wb') as f:
+        plistlib.dump({'CFBundleName': 'Diva', 'CFBundleIdentifier': 'com.u-he.Diva.vst3'}, f,
+                      fmt=plistlib.FMT_BINARY)
+
+    # VST3 Windows sans moduleinfo.json : ressource de version du binaire
+    binary_dir = vst3 / 'Kontakt 7.vst3' / 'Contents' / 'x86_64-win'
+    binary_dir.mkdir(parents=True, exist_ok=True)
+    (binary_dir / 'Kontakt 7.vst3').write_bytes(build_pe(
+        [b'GetPluginFactory'], {'CompanyName': 'Native Instruments', 'ProductName': 'Kontakt 7'}))
+
+    # VST2 Windows, bibliothèque de support et VST2 Linux
+    vst2.mkdir(parents=True, exist_ok=True)
+    (vst2 / 'tal-u-no-lx.dll').write_bytes(build_pe(
+        [b'VSTPluginMain', b'main'], {'CompanyName': 'TAL Software GmbH', 'ProductName': 'TAL-U-NO-LX'}))
+    (vst2 / 'msvcp140.dll').write_bytes(build_pe(
+        [b'_Query_perf_counter'], {'CompanyName': 'Microsoft Corporation', 'ProductName': 'Microsoft Visual C++'}))
+    (vst2 / 'Vital.so').write_bytes(b'\x7fELF')
+
+    return [
+        ('Serum', 'Xfer Records'), ('Serum FX', 'Xfer Records'), ('Diva', 'u-he'),
+        ('Kontakt 7', 'Native Instruments'), ('TAL-U-NO-LX', 'TAL Software GmbH'), ('Vital', '')
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Découverte des plugins VST3/VST2 installés")
+    parser.add_argument('folders', nargs='*', help="Dossiers de plugins (dossiers standards par défaut)")
+    parser.add_argument('--fixtures', metavar='DOSSIER',
+                        help="Crée des plugins factices dans DOSSIER et les explore")
+    parser.add_argument('--cache', metavar='FICHIER',
+                        help="Fichier de cache (temporaire par défaut, ~/.trie_morceaux avec --merge)")
+    parser.add_argument('--merge', action='store_true',
+                        help="Ajoute les nouveaux instruments à config/vsti_list.json")
+    parser.add_argument('--include-unknown', action='store_true',
+                        help="Avec --merge, ajoute aussi les plugins de type inconnu")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    args = parser.parse_args()
+
+    expected = None
+    folders = list(args.folders)
+    if args.fixtures:
+        expected = build_fixtures(args.fixtures)
+        folders.append(args.fixtures)
+    folders = plugin_folders(folders)
+    if not folders:
+        print("Aucun dossier de plugins trouvé", file=sys.stderr)
+        return 1
+
+    cache_file = args.cache
+    if cache_file is None and not args.merge:
+        cache_file = os.path.join(tempfile.mkdtemp(), 'plugin_discovery.json')
+    discovery = PluginDiscovery(cache_file)
+
+    start = time.perf_counter()
+    if args.merge:
+        total, changed = discover_into_catalogue(folders, discovery, include_unknown=args.include_unknown)
+        print(f"{total} plugins trouvés, {changed} entrées ajoutées ou complétées dans la liste des VSTi",
+              file=sys.stderr)
+        return 0
+    plugins, new_plugins = discovery.discover(folders)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    _, cached_again = discovery.discover(folders)
+    second = time.perf_counter() - start
+
+    if args.json:
+        json.dump(plugins, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for plugin in plugins:
+            kind = 'instrument' if plugin.get('instrument') else ''
+            print(f"{plugin['format']:5} {plugin['name']:30} {plugin['vendor']:25} {kind}")
+    print(f"{len(plugins)} plugins ({len(new_plugins)} lus) en {first * 1000:.1f} ms, "
+          f"redécouverte en {second * 1000:.1f} ms ({len(cached_again)} relus)", file=sys.stderr)
+
+    if expected is not None:
+        found = sorted((plugin['name'], plugin['vendor']) for plugin in plugins)
+        if found != sorted(expected):
+            print(f"Plugins factices attendus : {sorted(expected)}", file=sys.stderr)
+            return 1
+        print("Plugins factices : résultat conforme", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())